@@ -0,0 +1,15 @@
+#!/usr/bin/env python3
+
+import sys
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent / "src"))
+
+from codius.infrastructure.services.code_generator.template_environment import (  # noqa: E402
+    PRECOMPILED_PATH, compile_templates
+)
+
+
+if __name__ == "__main__":
+    count = compile_templates()
+    print(f"✅ Precompiled {count} templates into {PRECOMPILED_PATH}")
@@ -14,12 +14,14 @@ from codius.infrastructure.repository.session_repository import SessionRepositor
 from codius.infrastructure.services.code_generator.code_generator_service import \
     CodeGeneratorService
 from codius.infrastructure.services.code_scanner.code_scanner_service import CodeScannerService
+from codius.infrastructure.services.file_watcher_service import FileWatcherService
 from codius.infrastructure.services.graph_service import GraphService
 from codius.infrastructure.services.llm_service import LlmService
 from codius.infrastructure.services.logging_service import LoggingService
 from codius.infrastructure.services.openddd_convention_service import OpenDddConventionService
 from codius.infrastructure.services.project_metadata_service import ProjectMetadataService
 from codius.infrastructure.services.project_scanner_service import ProjectScannerService
+from codius.infrastructure.services.source_file_cache import SourceFileCache
 from codius.infrastructure.services.tree_sitter_service import TreeSitterService
 
 
@@ -50,6 +52,8 @@ def register_services(config: Config, args: argparse.Namespace):
     container.register_scoped(GraphService)
     container.register_scoped(ProjectScannerService)
     container.register_scoped(CodeScannerService)
+    container.register_singleton(FileWatcherService)
+    container.register_singleton(SourceFileCache)
     container.register_scoped(CodeGeneratorService)
     container.register_scoped(OpenDddConventionService)
     container.register_scoped(TreeSitterService)
@@ -22,7 +22,11 @@ DEFAULT_CONFIG = {
     "approval_mode": ApprovalMode.SUGGEST.value,
     "debug": False,
     "debug_llm": False,
-    "log_level": "warning"
+    "log_level": "warning",
+    "scan_workers": 1,
+    "watch_files": False,
+    "source_cache_mb": 64,
+    "parse_cache_size": 64
 }
 
 
@@ -33,3 +37,7 @@ class Config:
     debug: bool = False
     debug_llm: bool = False
     log_level: str = "info"
+    scan_workers: int = 1
+    watch_files: bool = False
+    source_cache_mb: int = 64
+    parse_cache_size: int = 64
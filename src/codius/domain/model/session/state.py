@@ -1,7 +1,8 @@
 from dataclasses import dataclass, field
 from typing import Optional, List
 
-from codius.infrastructure.services.code_scanner.model.building_block import BuildingBlock
+from codius.infrastructure.services.code_scanner.model.building_block import BuildingBlock, \
+    BuildingBlockViews
 
 
 @dataclass
@@ -36,9 +37,11 @@ class State:
         if "project_metadata" in result:
             self.project_metadata = result.get("project_metadata")
         if "building_blocks" in result:
-            self.building_blocks = [
-                BuildingBlock.from_dict(bb) for bb in result["building_blocks"]
-            ]
+            building_blocks = result["building_blocks"]
+            if isinstance(building_blocks, BuildingBlockViews):
+                self.building_blocks = list(building_blocks.blocks)
+            else:
+                self.building_blocks = [BuildingBlock.from_dict(bb) for bb in building_blocks]
 
     def summarize(self, summary: str):
         self.summary = summary
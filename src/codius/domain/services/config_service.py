@@ -45,6 +45,10 @@ class ConfigService:
         self.config.debug = updated_config.debug
         self.config.debug_llm = updated_config.debug_llm
         self.config.log_level = updated_config.log_level
+        self.config.scan_workers = updated_config.scan_workers
+        self.config.watch_files = updated_config.watch_files
+        self.config.source_cache_mb = updated_config.source_cache_mb
+        self.config.parse_cache_size = updated_config.parse_cache_size
 
     @classmethod
     def parse_structured(cls, raw: dict) -> Config:
@@ -86,10 +90,34 @@ class ConfigService:
 
         approval_mode = ApprovalMode(raw.get("approval_mode", "suggest"))
 
+        scan_workers = raw.get("scan_workers", 1)
+        if not isinstance(scan_workers, int) or scan_workers < 1:
+            print(f"⚠️ Invalid scan_workers '{scan_workers}', falling back to 1")
+            scan_workers = 1
+
+        watch_files = raw.get("watch_files", False)
+        if not isinstance(watch_files, bool):
+            print(f"⚠️ Invalid watch_files '{watch_files}', falling back to false")
+            watch_files = False
+
+        source_cache_mb = raw.get("source_cache_mb", 64)
+        if not isinstance(source_cache_mb, int) or isinstance(source_cache_mb, bool) or source_cache_mb < 0:
+            print(f"⚠️ Invalid source_cache_mb '{source_cache_mb}', falling back to 64")
+            source_cache_mb = 64
+
+        parse_cache_size = raw.get("parse_cache_size", 64)
+        if not isinstance(parse_cache_size, int) or isinstance(parse_cache_size, bool) or parse_cache_size < 0:
+            print(f"⚠️ Invalid parse_cache_size '{parse_cache_size}', falling back to 64")
+            parse_cache_size = 64
+
         return Config(
             llm=llm_config,
             approval_mode=approval_mode,
             debug=raw.get("debug", False),
             debug_llm=raw.get("debug_llm", False),
             log_level=log_level,
+            scan_workers=scan_workers,
+            watch_files=watch_files,
+            source_cache_mb=source_cache_mb,
+            parse_cache_size=parse_cache_size,
         )
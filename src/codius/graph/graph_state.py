@@ -1,4 +1,4 @@
-from typing import Any, Dict, List, TypedDict
+from typing import Any, Dict, List, Mapping, Optional, Sequence, TypedDict
 
 
 class GraphState(TypedDict, total=False):
@@ -17,4 +17,5 @@ class GraphState(TypedDict, total=False):
     history: List[Dict[str, Any]]
     summary: str
     project_metadata: Dict[str, Any]
-    building_blocks: List[Dict[str, Any]]
+    context_metadata: Optional[Dict[str, Any]]
+    building_blocks: Sequence[Mapping[str, Any]]
@@ -1,6 +1,10 @@
 import logging
+from typing import List, Optional
 
 from codius.infrastructure.services.code_scanner.code_scanner_service import CodeScannerService
+from codius.infrastructure.services.code_scanner.model.building_block import BuildingBlock, \
+    BuildingBlockViews
+from codius.infrastructure.services.file_watcher_service import FileWatcherService
 
 logger = logging.getLogger(__name__)
 
@@ -10,15 +14,49 @@ def extract_building_blocks(state: dict) -> dict:
 
     logger.debug("Running extract_domain_model...")
 
-    logger.debug("Scanning building blocks in project..")
+    blocks = container.resolve(FileWatcherService).get_building_blocks(state['project_metadata'])
 
-    code_scanner_service = container.resolve(CodeScannerService)
+    if blocks is None:
+        logger.debug("Scanning building blocks in project..")
 
-    blocks = code_scanner_service.scan_building_blocks(state['project_metadata'])
+        code_scanner_service = container.resolve(CodeScannerService)
+
+        blocks = code_scanner_service.scan_building_blocks(state['project_metadata'])
+
+    # In a multi-context solution, only pull the bounded context being changed into the prompts.
+    # The narrowed metadata goes into its own key, so project_metadata still covers the solution.
+    context = _changed_context(state.get("intent", []), state['project_metadata'], blocks)
+    if context is not None:
+        logger.debug("Narrowing building blocks to bounded context %s", context["name"])
+        blocks = [bb for bb in blocks if bb.project == context["name"]]
+        state["context_metadata"] = _context_metadata(state['project_metadata'], context)
 
     logger.info("Extracted %d domain building blocks", len(blocks))
 
-    # Store in state
-    state["building_blocks"] = [b.to_dict() for b in blocks]
+    # Store in state, as dict views over the blocks instead of converted copies
+    state["building_blocks"] = BuildingBlockViews(blocks)
 
     return state
+
+
+def _changed_context(intents: list, project_metadata: dict, blocks: List[BuildingBlock]) -> Optional[dict]:
+    """The one bounded context the intents target existing blocks in, if there is exactly one."""
+    contexts = {context["name"]: context for context in project_metadata.get("contexts", [])}
+    if len(contexts) <= 1 or not isinstance(intents, list):
+        return None
+
+    targets = {(intent.get("building_block_type"), intent.get("target")) for intent in intents}
+    names = {bb.project for bb in blocks if (bb.type.value, bb.name) in targets and bb.project in contexts}
+
+    return contexts[names.pop()] if len(names) == 1 else None
+
+
+def _context_metadata(project_metadata: dict, context: dict) -> dict:
+    return {
+        **project_metadata,
+        "context": context["name"],
+        "root_namespace": context["name"],
+        "domain_path": context["domain_path"],
+        "application_path": context["application_path"],
+        "infrastructure_path": context["infrastructure_path"],
+    }
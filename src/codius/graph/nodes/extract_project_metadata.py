@@ -1,5 +1,6 @@
 import logging
 
+from codius.infrastructure.services.file_watcher_service import FileWatcherService
 from codius.infrastructure.services.project_scanner_service import ProjectScannerService
 
 logger = logging.getLogger(__name__)
@@ -10,9 +11,12 @@ def extract_project_metadata(state: dict) -> dict:
 
     logger.debug("Running extract_project_metadata...")
 
-    scanner = container.resolve(ProjectScannerService)
+    # The file watcher keeps the metadata live, so only extract it when it isn't running
+    metadata = container.resolve(FileWatcherService).get_project_metadata()
+    if metadata is None:
+        scanner = container.resolve(ProjectScannerService)
+        metadata = scanner.extract_project_metadata()
 
-    metadata = scanner.extract_project_metadata()
     state["project_metadata"] = metadata
 
     logger.info("Extracted project metadata: %s", metadata)
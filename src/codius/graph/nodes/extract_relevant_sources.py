@@ -3,6 +3,8 @@ import logging
 from pathlib import Path
 from typing import Dict
 
+from codius.infrastructure.services.source_file_cache import SourceFileCache
+
 logger = logging.getLogger(__name__)
 
 
@@ -10,6 +12,7 @@ def extract_relevant_sources(state: dict) -> dict:
     intents = state.get("intent", [])
     building_blocks = state.get("building_blocks", [])
     sources: Dict[str, str] = {}
+    file_cache = _resolve_file_cache()
 
     # Index building blocks by (type, name)
     blocks_by_key = {
@@ -27,9 +30,8 @@ def extract_relevant_sources(state: dict) -> dict:
             path = Path(block["file_path"])
             if path not in seen_paths:
                 try:
-                    with open(path, "r", encoding="utf-8") as f:
-                        sources[str(path)] = f.read()
-                        seen_paths.add(path)
+                    sources[str(path)] = file_cache.read_text(path)
+                    seen_paths.add(path)
                 except FileNotFoundError:
                     logger.warning(f"⚠️ Source file not found: {path}")
                 except Exception as e:
@@ -38,3 +40,13 @@ def extract_relevant_sources(state: dict) -> dict:
     logger.info(f"✅ Extracted {len(sources)} source file(s).")
     state["sources"] = sources
     return state
+
+
+def _resolve_file_cache() -> SourceFileCache:
+    from codius.di import container
+
+    try:
+        return container.resolve(SourceFileCache)
+    except KeyError:
+        # Outside the assistant (e.g. in tests) no container is configured
+        return SourceFileCache()
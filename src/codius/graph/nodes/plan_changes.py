@@ -15,7 +15,7 @@ def plan_changes(state: dict) -> dict:
         prompt = PlanChangesPrompt(
             intents=state["intent"],
             sources=state["sources"],
-            project_metadata=state["project_metadata"]
+            project_metadata=state.get("context_metadata") or state["project_metadata"]
         ).as_prompt()
 
         logger.debug("Constructed plan_all_with_llm prompt (%d chars)", len(prompt))
@@ -10,6 +10,7 @@ from codius.domain.model.config.approval_mode import ApprovalMode
 from codius.domain.model.config.config import Config
 from codius.domain.model.plan.steps.plan_step_type import PlanStepType
 from codius.infrastructure.services.project_metadata_service import ProjectMetadataService
+from codius.infrastructure.services.source_file_cache import SourceFileCache
 
 from codius.ui.apps.approval_app import show_approval_app
 
@@ -19,6 +20,7 @@ def preview(state: dict) -> dict:
 
     config = container.resolve(Config)
     metadata_service = container.resolve(ProjectMetadataService)
+    file_cache = container.resolve(SourceFileCache)
 
     session_id = state.get('session_id')
     generated_dir = metadata_service.get_generated_path(session_id)
@@ -34,7 +36,7 @@ def preview(state: dict) -> dict:
 
     # Show added/updated files
     for path in files_on_disk:
-        content = path.read_text()
+        content = file_cache.read_text(path)
         rel_path = path.relative_to(generated_dir)
         syntax = Syntax(content, "csharp", theme="monokai", line_numbers=True)
         panel = Panel(syntax, title=f"[green]{rel_path}[/green]", border_style="green")
@@ -45,7 +47,7 @@ def preview(state: dict) -> dict:
         file_path = project_root / item["path"]
         if file_path.exists():
             try:
-                content = file_path.read_text()
+                content = file_cache.read_text(file_path)
                 syntax = Syntax(content, "csharp", theme="monokai", line_numbers=True)
             except Exception:
                 syntax = Text("(Unable to preview content)", style="dim")
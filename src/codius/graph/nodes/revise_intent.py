@@ -56,5 +56,8 @@ def revise_intent(state: dict) -> dict:
         logger.error("Unexpected format from LLM: %s", type(parsed))
         state["intent"] = [{"intent": "unsure"}]
 
+    # Narrowed to the bounded context of the previous intents, which the revised ones may not share
+    state["context_metadata"] = None
+
     state["revise_mode"] = True
     return state
@@ -1,25 +1,36 @@
 import logging
 
 from pathlib import Path
-from typing import Optional
-from jinja2 import Environment, FileSystemLoader, select_autoescape
-
-from codius.infrastructure.services.openddd_convention_service import OpenDddConventionService
+from typing import Dict, List, NamedTuple, Optional, Tuple
+
+from codius.infrastructure.services.code_generator.source_buffer import SourceBuffer
+from codius.infrastructure.services.code_generator.template_environment import get_environment
+from codius.infrastructure.services.openddd_convention_service import BOM, OpenDddConventionService
+from codius.infrastructure.services.project_metadata_service import ProjectMetadataService
+from codius.infrastructure.services.source_file_cache import SourceFileCache
+from codius.infrastructure.services import csharp_queries
 from codius.infrastructure.services.tree_sitter_service import TreeSitterService
 
 logger = logging.getLogger(__name__)
 
+# What str.strip() removes from ASCII source
+WHITESPACE = frozenset(b" \t\n\r\x0b\x0c")
+
 
 class CodeGeneratorService:
-    def __init__(self, convention_service: OpenDddConventionService, tree_sitter_service: TreeSitterService):
+    def __init__(
+        self,
+        convention_service: OpenDddConventionService,
+        tree_sitter_service: TreeSitterService,
+        file_cache: Optional[SourceFileCache] = None,
+        project_metadata_service: Optional[ProjectMetadataService] = None
+    ):
         self.convention_service = convention_service
         self.tree_sitter_service = tree_sitter_service
-        self.jinja_env = Environment(
-            loader=FileSystemLoader(str(Path(__file__).parent / "templates")),
-            autoescape=select_autoescape(disabled_extensions=("cs",)),
-            trim_blocks=True,
-            lstrip_blocks=True
-        )
+        self.file_cache = file_cache or SourceFileCache()
+        # Shared by all instances; compiled templates are kept in .codius/cache/templates
+        cache_path = project_metadata_service.get_cache_path() / "templates" if project_metadata_service else None
+        self.jinja_env = get_environment(cache_path)
 
     def create_file(self, file_plan: dict, output_dir: Path, project_root: Path) -> Optional[dict]:
         template_name = file_plan.get("template")
@@ -58,36 +69,69 @@ class CodeGeneratorService:
         relative_path_str = str(relative_path)
 
         if relative_path_str in created_files_map:
-            current_code = created_files_map[relative_path_str]
+            current_code = created_files_map[relative_path_str].encode("utf-8")
         else:
             try:
-                current_code = (project_root / relative_path).read_text(encoding="utf-8")
+                current_code = self.file_cache.read_bytes(project_root / relative_path)
             except FileNotFoundError:
                 logger.warning("Target file for modification not found: %s", path)
                 raise
 
+        # Every step's insertion point is resolved against this one parse, then
+        # all insertions are spliced in at once; the result is decoded once,
+        # after formatting
+        style = _FileStyle.of(current_code)
+        buffer = SourceBuffer(self.tree_sitter_service, self.convention_service.normalize_source(current_code))
+        target = self._find_insertion_target(buffer)
+        insertions = _Insertions(buffer.data)
+
         for step in steps:
             context = step["context"]
             modification = step["modification"]
 
             if modification == "add_method":
                 code = self._render_method_template(context)
-                current_code = self._inject_method_ast_based(current_code, code,
-                                                             context.get("placement"))
+                name = context["method"].get("name")
+                reference = (context.get("placement") or {}).get("reference")
+                if target is None:
+                    logger.warning("Could not locate class or reference method. Appending at end of file.")
+                    insertions.add(len(buffer.data), code.strip(), name)
+                elif insertions.has(reference):
+                    # Placed after a method added by an earlier step
+                    insertions.add_after(reference, self._indent_block(code.strip(), target.member_indent), name)
+                else:
+                    position = target.methods.get(reference, target.after_methods)
+                    insertions.add(position, self._indent_block(code.strip(), target.member_indent), name)
             elif modification == "add_property":
                 code = self._render_property_template(context)
-                current_code = self._inject_property_ast_based(current_code, code)
+                if target is None:
+                    logger.warning("Class declaration not found. Appending at end.")
+                    insertions.add(len(buffer.data), code.strip(), is_property=True)
+                else:
+                    insertions.add(
+                        target.body_start, self._indent_block(code.strip(), target.member_indent), is_property=True
+                    )
             else:
                 raise Exception(f"Unsupported modification type: {modification}")
 
+        buffer.splice_all(insertions.edits())
+
         file_path = output_dir / relative_path
         file_path.parent.mkdir(parents=True, exist_ok=True)
-        formatted_code = self.convention_service.format_class_code(current_code)
-        file_path.write_text(formatted_code.strip(), encoding="utf-8")
+        # Only what the steps changed is formatted, the rest of the file stays as it is
+        formatted = self.convention_service.format_class_source(
+            buffer.data, tree=buffer.tree, ranges=buffer.changed_ranges
+        )
+        formatted = formatted.strip()
+        # The file keeps its BOM and line endings, so only the lines the steps changed differ
+        file_path.write_bytes(style.restore(formatted))
+        formatted_code = formatted.decode("utf-8")
+
+        self.tree_sitter_service.log_cache_info()
 
         return {
             "path": str(relative_path),
-            "content": formatted_code.strip()
+            "content": formatted_code
         }
 
     def _render_method_template(self, context: dict) -> str:
@@ -114,86 +158,144 @@ class CodeGeneratorService:
         else:
             return f"public {type_} {name} {{ get; set; }}"
 
-    def _inject_method_ast_based(self, source_code: str, method_code: str, placement: Optional[dict]) -> str:
-        tree = self.tree_sitter_service.parse_code(source_code)
-        reference = placement.get("reference") if placement else None
-        insert_pos = None
-
-        def find_insertion_point(node):
-            nonlocal insert_pos
-            if node.type == "class_declaration":
-                body_node = next((child for child in node.children if child.type == "declaration_list"), None)
-                if not body_node:
-                    return False
-
-                reference_found = False
-                last_method = None
-
-                for child in body_node.children:
-                    if child.type == "method_declaration":
-                        name = self._extract_method_name(source_code, child)
-                        if name == reference:
-                            insert_pos = child.end_byte
-                            reference_found = True
-                            break
-                        last_method = child
-
-                if not reference_found:
-                    insert_pos = last_method.end_byte if last_method else body_node.start_byte + 1
-                return True
-
-            for child in node.children:
-                if find_insertion_point(child):
-                    return True
-            return False
-
-        found = find_insertion_point(tree.root_node)
-        if not found or insert_pos is None:
-            logger.warning("Could not locate class or reference method. Appending at end of file.")
-            return source_code + "\n\n" + method_code
-
-        before = source_code[:insert_pos].rstrip()
-        after = source_code[insert_pos:].lstrip()
-        return before + "\n\n" + self._indent_block(method_code.strip()) + "\n    " + after
-
-    def _inject_property_ast_based(self, source_code: str, property_code: str) -> str:
-        tree = self.tree_sitter_service.parse_code(source_code)
-        insert_pos = None
-        class_indent = "    "
-
-        def find_class_body(node):
-            nonlocal insert_pos, class_indent
-            if node.type == "class_declaration":
-                line_start = source_code.rfind("\n", 0, node.start_byte) + 1
-                class_indent = " " * (node.start_byte - line_start)
-
-                body_node = next((c for c in node.children if c.type == "declaration_list"), None)
-                if not body_node:
-                    return False
-
-                insert_pos = body_node.start_byte + 1
-                return True
-
-            for child in node.children:
-                if find_class_body(child):
-                    return True
-            return False
-
-        found = find_class_body(tree.root_node)
-        if not found or insert_pos is None:
-            logger.warning("Class declaration not found. Appending at end.")
-            return source_code + "\n\n" + property_code
-
-        before = source_code[:insert_pos].rstrip()
-        after = source_code[insert_pos:].lstrip()
-        indented = self._indent_block(property_code.strip(), spaces=len(class_indent.expandtabs()))
-        return before + "\n" + class_indent + indented + "\n\n    " + after
-
-    def _extract_method_name(self, source: str, node) -> str:
-        for child in node.children:
-            if child.type == "identifier":
-                return source[child.start_byte:child.end_byte]
-        return ""
+    def _find_insertion_target(self, buffer: SourceBuffer) -> Optional["_InsertionTarget"]:
+        """Where members can be inserted into the first class of the buffer, read from its tree once."""
+        source_code = buffer.data
+        match = self.tree_sitter_service.find_first(csharp_queries.CLASS_DECLARATIONS, buffer.tree.root_node)
+        if match is None:
+            return None
+
+        class_node, body_node = match["class"], match["body"]
+        methods = {}
+        after_methods = body_node.start_byte + 1
+        for method_match in self.tree_sitter_service.matches(csharp_queries.METHOD_NAMES, body_node):
+            method, name = method_match["method"], method_match["name"]
+            # Only the class's own methods, not those of nested types
+            if method.parent != body_node:
+                continue
+            methods.setdefault(self._node_text(source_code, name), method.end_byte)
+            after_methods = method.end_byte
+
+        line_start = source_code.rfind(b"\n", 0, class_node.start_byte) + 1
+        return _InsertionTarget(
+            body_start=body_node.start_byte + 1,
+            methods=methods,
+            after_methods=after_methods,
+            member_indent=class_node.start_byte - line_start + 4
+        )
+
+    def _node_text(self, source: bytes, node) -> str:
+        return source[node.start_byte:node.end_byte].decode("utf-8")
 
     def _indent_block(self, code: str, spaces: int = 8) -> str:
         return "\n".join(" " * spaces + line if line.strip() else "" for line in code.splitlines())
+
+
+class _FileStyle(NamedTuple):
+    """What normalizing a file's source removes, to be restored when it is written back."""
+    bom: bool
+    newline: bytes
+    final_newline: bool
+
+    @staticmethod
+    def of(source: bytes) -> "_FileStyle":
+        line_end = source.find(b"\n")
+        if line_end > 0 and source[line_end - 1:line_end] == b"\r":
+            newline = b"\r\n"
+        elif line_end == -1 and b"\r" in source:
+            newline = b"\r"
+        else:
+            newline = b"\n"
+        return _FileStyle(source.startswith(BOM), newline, source.endswith((b"\n", b"\r")))
+
+    def restore(self, normalized: bytes) -> bytes:
+        if self.final_newline:
+            normalized += b"\n"
+        if self.newline != b"\n":
+            normalized = normalized.replace(b"\n", self.newline)
+        return BOM + normalized if self.bom else normalized
+
+
+class _InsertionTarget(NamedTuple):
+    # Right after the opening brace of the class body
+    body_start: int
+    # End of each method of the class, by name
+    methods: Dict[str, int]
+    # End of the last method, or the body start without methods
+    after_methods: int
+    member_indent: int
+
+
+class _Insertion(NamedTuple):
+    code: str
+    # Name of the added method
+    name: Optional[str]
+    # Name of the added method this one was placed after
+    placed_after: Optional[str]
+    is_property: bool
+
+
+class _Insertions:
+    """
+    Code to insert into source, collected per position in the order of the
+    steps, with properties ahead of methods. All positions are offsets in the
+    source as it was parsed, so the insertions of all steps can be applied
+    together.
+    """
+
+    def __init__(self, source: bytes):
+        self.source = source
+        # Insertions by the whitespace around their position, which they replace
+        self._groups: Dict[Tuple[int, int], List[_Insertion]] = {}
+        self._group_of: Dict[str, Tuple[int, int]] = {}
+
+    def has(self, name: Optional[str]) -> bool:
+        return name in self._group_of
+
+    def add(self, position: int, code: str, name: Optional[str] = None, is_property: bool = False) -> None:
+        self._add(self._whitespace_around(position), _Insertion(code, name, None, is_property))
+
+    def add_after(self, reference: str, code: str, name: Optional[str] = None) -> None:
+        """Inserts code after the code added earlier under the reference name, and after what followed it."""
+        self._add(self._group_of[reference], _Insertion(code, name, reference, False))
+
+    def edits(self) -> List[Tuple[int, int, bytes]]:
+        """
+        One edit per position, replacing the whitespace around it with the code
+        added there, a blank line apart, ordered by position.
+        """
+        edits = []
+        for (start, end), group in sorted(self._groups.items()):
+            leading = b"\n" if self.source[start - 1:start] == b"{" else b"\n\n"
+            following = bytes(self.source[end:end + 1])
+            next_indent = end - (self.source.rfind(b"\n", 0, end) + 1) if following else 0
+            trailing = (b"\n" if following in (b"}", b"") else b"\n\n") + b" " * next_indent
+            code = "\n\n".join(insertion.code for insertion in group).encode("utf-8")
+            edits.append((start, end, leading + code + trailing))
+        return edits
+
+    def _add(self, key: Tuple[int, int], insertion: _Insertion) -> None:
+        # Code for the same place keeps the order of the steps
+        group = self._groups.setdefault(key, [])
+        index = len(group)
+        if insertion.is_property:
+            # In a class without methods, properties and methods share a place
+            index = next((i for i, added in enumerate(group) if not added.is_property), index)
+        elif insertion.placed_after is not None:
+            index = next(i for i, added in enumerate(group) if added.name == insertion.placed_after) + 1
+            placed_after = {insertion.placed_after}
+            while index < len(group) and group[index].placed_after in placed_after:
+                placed_after.add(group[index].name)
+                index += 1
+        group.insert(index, insertion)
+        if insertion.name:
+            self._group_of[insertion.name] = key
+
+    def _whitespace_around(self, position: int) -> Tuple[int, int]:
+        start = position
+        while start > 0 and self.source[start - 1] in WHITESPACE:
+            start -= 1
+        end = position
+        while end < len(self.source) and self.source[end] in WHITESPACE:
+            end += 1
+        return start, end
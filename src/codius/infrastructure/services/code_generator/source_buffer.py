@@ -0,0 +1,95 @@
+from typing import List, Tuple
+
+from tree_sitter import Point, Tree
+
+from codius.infrastructure.services.tree_sitter_service import TreeSitterService
+
+
+class SourceBuffer:
+    """
+    UTF-8 source together with its syntax tree. Spliced edits are recorded as
+    tree edits and re-parsed incrementally, so splicing costs re-parsing the
+    edited regions instead of the whole file. Offsets are byte offsets, like
+    the tree's. The ranges changed by splices are tracked, so that only those
+    have to be formatted afterwards.
+    """
+
+    def __init__(self, tree_sitter_service: TreeSitterService, data: bytes):
+        self.tree_sitter_service = tree_sitter_service
+        self.data = bytearray(data)
+        # Not from the parse cache: cached trees are shared and must not be edited
+        self.tree: Tree = tree_sitter_service.parse_bytes(self.data, cache=False)
+        self.changed_ranges: List[Tuple[int, int]] = []
+
+    @property
+    def text(self) -> str:
+        return self.data.decode("utf-8")
+
+    def splice_all(self, edits: List[Tuple[int, int, bytes]]) -> None:
+        """
+        Applies ordered, non-overlapping (start, end, replacement) edits at once:
+        the data is rebuilt in one pass and re-parsed once, so the cost does not
+        grow with the number of edits times the size of the file.
+        """
+        if not edits:
+            return
+
+        # Points of the edits in the current data, counting lines only once
+        points = []
+        row, row_start, last = 0, 0, 0
+        for start, end, _ in edits:
+            for offset in (start, end):
+                row += self.data.count(b"\n", last, offset)
+                row_start = max(row_start, self.data.rfind(b"\n", last, offset) + 1)
+                points.append(Point(row, offset - row_start))
+                last = offset
+
+        # Back to front, so the offsets of the edits still to come stay valid
+        for (start, end, replacement), start_point, old_end_point in reversed(
+            list(zip(edits, points[::2], points[1::2]))
+        ):
+            self.tree.edit(
+                start_byte=start,
+                old_end_byte=end,
+                new_end_byte=start + len(replacement),
+                start_point=start_point,
+                old_end_point=old_end_point,
+                new_end_point=_advance(start_point, replacement),
+            )
+
+        view = memoryview(self.data)
+        chunks = []
+        last_end = delta = 0
+        for start, end, replacement in edits:
+            chunks += [view[last_end:start], replacement]
+            last_end = end
+            self._track_change(start + delta, end + delta, start + delta + len(replacement))
+            delta += len(replacement) - (end - start)
+        chunks.append(view[last_end:])
+
+        self.data = bytearray(b"".join(chunks))
+        self.tree = self.tree_sitter_service.reparse(self.tree, self.data)
+
+    def _track_change(self, start: int, old_end: int, new_end: int) -> None:
+        # Shift the ranges after the splice, merge those it touches into it
+        delta = new_end - old_end
+        merged_start, merged_end = start, new_end
+        ranges = []
+        for range_start, range_end in self.changed_ranges:
+            if range_end < start:
+                ranges.append((range_start, range_end))
+            elif range_start > old_end:
+                ranges.append((range_start + delta, range_end + delta))
+            else:
+                merged_start = min(merged_start, range_start)
+                merged_end = max(merged_end, range_end + delta)
+        ranges.append((merged_start, merged_end))
+        self.changed_ranges = sorted(ranges)
+
+
+def _advance(point: Point, text: bytes) -> Point:
+    # The point just after text inserted at point
+    newlines = text.count(b"\n")
+    if not newlines:
+        return Point(point.row, point.column + len(text))
+    return Point(point.row + newlines, len(text) - text.rfind(b"\n") - 1)
@@ -0,0 +1,101 @@
+import json
+import logging
+import shutil
+import threading
+from pathlib import Path
+from typing import Dict, Optional
+
+import jinja2
+from jinja2 import (BaseLoader, ChoiceLoader, Environment, FileSystemBytecodeCache, FileSystemLoader,
+                    ModuleLoader, select_autoescape)
+
+from codius.version import __version__
+
+logger = logging.getLogger(__name__)
+
+TEMPLATES_PATH = Path(__file__).parent / "templates"
+# Written by scripts/compile_templates.py when the package is built
+PRECOMPILED_PATH = Path(__file__).parent / "compiled_templates"
+STAMP_NAME = "stamp.json"
+
+_environments: Dict[Optional[Path], Environment] = {}
+_lock = threading.Lock()
+
+
+def get_environment(cache_path: Optional[Path] = None) -> Environment:
+    """
+    Returns the process-wide environment for the code generator templates, so
+    templates are compiled once per process instead of once per service. With
+    a cache path, compiled templates are also kept on disk and reused by later
+    processes. Templates precompiled into the package need no compiling at all.
+    """
+    with _lock:
+        if cache_path not in _environments:
+            _environments[cache_path] = _create_environment(cache_path)
+        return _environments[cache_path]
+
+
+def compile_templates(target: Path = PRECOMPILED_PATH) -> int:
+    """
+    Precompiles all templates into Python modules in target, stamped with the
+    versions they were compiled by. Returns the number of templates compiled.
+    """
+    if target.exists():
+        shutil.rmtree(target)
+    target.mkdir(parents=True)
+
+    environment = _new_environment(FileSystemLoader(str(TEMPLATES_PATH)))
+    environment.compile_templates(str(target), zip=None, ignore_errors=False)
+
+    (target / STAMP_NAME).write_text(json.dumps(_stamp(), indent=2, sort_keys=True), encoding="utf-8")
+    return len(environment.list_templates())
+
+
+def _create_environment(cache_path: Optional[Path]) -> Environment:
+    loader: BaseLoader = FileSystemLoader(str(TEMPLATES_PATH))
+    if _precompiled_templates_are_current():
+        loader = ChoiceLoader([ModuleLoader(str(PRECOMPILED_PATH)), loader])
+        logger.debug("Using precompiled templates from %s", PRECOMPILED_PATH)
+
+    bytecode_cache = None
+    if cache_path is not None:
+        try:
+            cache_path.mkdir(parents=True, exist_ok=True)
+            bytecode_cache = FileSystemBytecodeCache(str(cache_path))
+        except OSError as e:
+            logger.warning("Template cache disabled, cannot create %s: %s", cache_path, e)
+
+    return _new_environment(loader, bytecode_cache)
+
+
+def _new_environment(loader: BaseLoader, bytecode_cache: Optional[FileSystemBytecodeCache] = None) -> Environment:
+    # Precompiled templates depend on these options, so both share them
+    return Environment(
+        loader=loader,
+        bytecode_cache=bytecode_cache,
+        autoescape=select_autoescape(disabled_extensions=("cs",)),
+        trim_blocks=True,
+        lstrip_blocks=True
+    )
+
+
+def _precompiled_templates_are_current() -> bool:
+    # Templates are compiled at build time, so the stamp is only compared to
+    # the installed versions; the templates themselves are not read
+    stamp_path = PRECOMPILED_PATH / STAMP_NAME
+    if not stamp_path.exists():
+        return False
+    try:
+        stamp = json.loads(stamp_path.read_text(encoding="utf-8"))
+    except (OSError, ValueError):
+        return False
+
+    if stamp != _stamp():
+        logger.debug("Precompiled templates are from another version, compiling templates from source")
+        return False
+    return True
+
+
+def _stamp() -> Dict[str, str]:
+    # Compiled modules depend on the Jinja runtime as well as on the templates
+    return {"codius": __version__, "jinja2": jinja2.__version__}
@@ -1,14 +1,231 @@
-from typing import List, Dict
+import logging
+import threading
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from dataclasses import fields
+from itertools import repeat
+from pathlib import Path
+from typing import Iterable, Iterator, List, Dict, Optional, Tuple
+
+from codius.domain.model.config.config import Config
+from codius.infrastructure.services.code_scanner.index.building_block_index import \
+    BuildingBlockIndex
+from codius.infrastructure.services.code_scanner.index.git_change_detector import \
+    GitChangeDetector
 from codius.infrastructure.services.code_scanner.model.building_block import BuildingBlock
-from codius.infrastructure.services.code_scanner.scanners.bb_scanner import BuildingBlockScanner
+from codius.infrastructure.services.code_scanner.scanners.bb_classifier import \
+    BuildingBlockClassifier
+from codius.infrastructure.services.code_scanner.scanners.bb_scanner import BuildingBlockScanner, \
+    ScanStats
 from codius.infrastructure.services.code_scanner.scanners.flow_scanner import FlowScanner
+from codius.infrastructure.services.source_file_cache import SourceFileCache
+from codius.infrastructure.services.tree_sitter_service import TreeSitterService
+
+logger = logging.getLogger(__name__)
+
+# (metadata of one bounded context, its index directory or None)
+ContextScan = Tuple[Dict, Optional[Path]]
 
 
 class CodeScannerService:
-    def scan_building_blocks(self, project_metadata: Dict) -> List[BuildingBlock]:
-        scanner = BuildingBlockScanner()
-        return scanner.scan(project_metadata)
+    """
+    Scans the building blocks of every bounded context in the solution. Each
+    context has its own index, so with more than one context and more than one
+    worker, the contexts are scanned concurrently in separate processes.
+    """
+
+    def __init__(
+        self,
+        config: Optional[Config] = None,
+        file_cache: Optional[SourceFileCache] = None,
+        tree_sitter_service: Optional[TreeSitterService] = None
+    ):
+        self.workers = config.scan_workers if config else 1
+        self.file_cache = file_cache
+        # Shared by every scanner in this process; worker processes build their own
+        self.classifier = BuildingBlockClassifier(tree_sitter_service or TreeSitterService())
+        self._indexes: Dict[Path, BuildingBlockIndex] = {}
+        self.last_scan_stats: Optional[ScanStats] = None
+        # The file watcher refreshes the index from its own thread
+        self._lock = threading.Lock()
+
+    def scan_building_blocks(
+        self, project_metadata: Dict, contexts: Optional[Iterable[str]] = None
+    ) -> List[BuildingBlock]:
+        """Scans all bounded contexts, or only the named ones, in the order of the solution."""
+        scans = self._context_scans(project_metadata, contexts)
+        git_hashes = _clean_blob_hashes(project_metadata, scans)
+        with self._lock:
+            workers = min(self.workers, len(scans))
+            if workers <= 1:
+                results = [self._scan_context(context, index_dir, git_hashes) for context, index_dir in scans]
+            else:
+                logger.debug("Scanning %d bounded context(s) using %d worker(s)", len(scans), workers)
+                with ProcessPoolExecutor(max_workers=workers) as executor:
+                    results = list(executor.map(_scan_context, *zip(*scans), repeat(git_hashes)))
+                self._forget_indexes(scans)
+
+            self.last_scan_stats = _merge_stats(stats for _, stats in results)
+            return [block for blocks, _ in results for block in blocks]
+
+    def scan_iter(self, project_metadata: Dict, contexts: Optional[Iterable[str]] = None) -> Iterator[BuildingBlock]:
+        """
+        Streams building blocks as they are found, for callers that render
+        progressively. Contexts scanned in worker processes arrive one whole
+        context at a time, as soon as each is done.
+        """
+        scans = self._context_scans(project_metadata, contexts)
+        git_hashes = _clean_blob_hashes(project_metadata, scans)
+        stats: List[ScanStats] = []
+        yield from self._locked(self._scan_contexts_iter(scans, git_hashes, stats))
+        with self._lock:
+            self.last_scan_stats = _merge_stats(stats)
+
+    def refresh_building_blocks(self, project_metadata: Dict, changed_paths: Iterable[Path]) -> List[BuildingBlock]:
+        """Re-classifies only the changed paths, falling back to a full scan without an index."""
+        scans = self._context_scans(project_metadata)
+        if any(index_dir is None for _, index_dir in scans):
+            return self.scan_building_blocks(project_metadata)
+
+        changed_paths = list(changed_paths)
+        with self._lock:
+            blocks, stats = [], []
+            for context, index_dir in scans:
+                scanner = self._create_scanner(context, index_dir)
+                blocks += scanner.refresh(context, changed_paths)
+                stats.append(scanner.stats)
+            self.last_scan_stats = _merge_stats(stats)
+            return blocks
+
+    def _scan_contexts_iter(
+        self, scans: List[ContextScan], git_hashes: Optional[Dict[str, str]], stats: List[ScanStats]
+    ) -> Iterator[BuildingBlock]:
+        workers = min(self.workers, len(scans))
+        if workers <= 1:
+            for context, index_dir in scans:
+                scanner = self._create_scanner(context, index_dir, git_hashes)
+                yield from scanner.scan_iter(context)
+                stats.append(scanner.stats)
+        else:
+            with ProcessPoolExecutor(max_workers=workers) as executor:
+                futures = [executor.submit(_scan_context, context, index_dir, git_hashes) for context, index_dir in scans]
+                for future in as_completed(futures):
+                    blocks, context_stats = future.result()
+                    stats.append(context_stats)
+                    yield from blocks
+            self._forget_indexes(scans)
+
+    def _locked(self, blocks: Iterator[BuildingBlock]) -> Iterator[BuildingBlock]:
+        """
+        Advances blocks one at a time under the lock, but yields without it, so
+        a slow or abandoned consumer does not keep the file watcher waiting.
+        """
+        try:
+            while True:
+                with self._lock:
+                    block = next(blocks, None)
+                if block is None:
+                    return
+                yield block
+        finally:
+            with self._lock:
+                blocks.close()
 
     def scan_flows(self, building_blocks: List[BuildingBlock]) -> List[FlowScanner.Flow]:
-        scanner = FlowScanner()
+        scanner = FlowScanner(file_cache=self.file_cache)
         return scanner.scan(building_blocks)
+
+    def _scan_context(
+        self, context: Dict, index_dir: Optional[Path], git_hashes: Optional[Dict[str, str]]
+    ) -> Tuple[List[BuildingBlock], ScanStats]:
+        scanner = self._create_scanner(context, index_dir, git_hashes)
+        return scanner.scan(context), scanner.stats
+
+    def _create_scanner(
+        self, context: Dict, index_dir: Optional[Path], git_hashes: Optional[Dict[str, str]] = None
+    ) -> BuildingBlockScanner:
+        return BuildingBlockScanner(
+            index=self._get_index(index_dir),
+            workers=self.workers,
+            classifier=self.classifier,
+            git_hashes=git_hashes,
+            file_cache=self.file_cache,
+            project=context.get("context")
+        )
+
+    def _context_scans(self, project_metadata: Dict, names: Optional[Iterable[str]] = None) -> List[ContextScan]:
+        """
+        Splits the metadata into one scan per bounded context. The context whose
+        layers are the top-level ones keeps the .codius/index of a single-context
+        project; the others are indexed in .codius/index/contexts/<name>.
+        """
+        project_root = project_metadata.get("project_root")
+        contexts = project_metadata.get("contexts") or [{
+            "name": project_metadata.get("project_name"),
+            "domain_path": project_metadata.get("domain_path"),
+            "application_path": project_metadata.get("application_path"),
+            "infrastructure_path": project_metadata.get("infrastructure_path"),
+        }]
+        if names is not None:
+            names = set(names)
+            contexts = [context for context in contexts if context["name"] in names]
+
+        scans = []
+        for context in contexts:
+            index_dir = None
+            if project_root:
+                index_dir = Path(project_root) / ".codius" / "index"
+                if context["domain_path"] != project_metadata.get("domain_path"):
+                    index_dir = index_dir / "contexts" / context["name"]
+
+            scans.append(({
+                "project_root": project_root,
+                "context": context["name"],
+                "domain_path": context["domain_path"],
+                "application_path": context["application_path"],
+                "infrastructure_path": context["infrastructure_path"],
+            }, index_dir))
+        return scans
+
+    def _get_index(self, index_dir: Optional[Path]) -> Optional[BuildingBlockIndex]:
+        if index_dir is None:
+            return None
+        if index_dir not in self._indexes:
+            self._indexes[index_dir] = BuildingBlockIndex(index_dir)
+        return self._indexes[index_dir]
+
+    def _forget_indexes(self, scans: List[ContextScan]) -> None:
+        # Worker processes saved their own copies, so reload from disk next time
+        for _, index_dir in scans:
+            self._indexes.pop(index_dir, None)
+
+
+def _clean_blob_hashes(project_metadata: Dict, scans: List[ContextScan]) -> Optional[Dict[str, str]]:
+    # Contexts share the checkout, so git is asked once per scan instead of once per context
+    project_root = project_metadata.get("project_root")
+    if not project_root or all(index_dir is None for _, index_dir in scans):
+        return None
+
+    hashes = GitChangeDetector(Path(project_root)).clean_blob_hashes()
+    if hashes is None:
+        logger.debug("No git checkout found, detecting changes on the filesystem")
+    return hashes
+
+
+def _merge_stats(all_stats: Iterable[ScanStats]) -> ScanStats:
+    merged = ScanStats()
+    for stats in all_stats:
+        for field in fields(ScanStats):
+            setattr(merged, field.name, getattr(merged, field.name) + getattr(stats, field.name))
+    return merged
+
+
+def _scan_context(
+    context: Dict, index_dir: Optional[Path], git_hashes: Optional[Dict[str, str]]
+) -> Tuple[List[BuildingBlock], ScanStats]:
+    # Runs in a worker process: one context per process, each with its own index
+    scanner = BuildingBlockScanner(
+        index=BuildingBlockIndex(index_dir) if index_dir else None,
+        git_hashes=git_hashes,
+        project=context.get("context")
+    )
+    return scanner.scan(context), scanner.stats
@@ -0,0 +1,182 @@
+import hashlib
+import json
+import logging
+import os
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Dict, Iterable, List, Optional
+
+from codius.infrastructure.services.code_scanner.model.building_block import BuildingBlock
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass
+class IndexEntry:
+    mtime_ns: int
+    size: int
+    content_hash: str
+    layer: str
+    block: Optional[BuildingBlock] = None
+
+    def to_dict(self) -> dict:
+        return {
+            "mtime_ns": self.mtime_ns,
+            "size": self.size,
+            "content_hash": self.content_hash,
+            "layer": self.layer,
+            "block": self.block.to_dict() if self.block else None
+        }
+
+    @staticmethod
+    def from_dict(data: dict) -> "IndexEntry":
+        block = data.get("block")
+        return IndexEntry(
+            mtime_ns=data["mtime_ns"],
+            size=data["size"],
+            content_hash=data["content_hash"],
+            layer=data["layer"],
+            block=BuildingBlock.from_dict(block) if block else None
+        )
+
+
+class BuildingBlockIndex:
+    """
+    Persistent per-file classification cache stored in .codius/index.
+
+    Entries are keyed by file path and validated against the file's mtime and
+    size first, then against its content hash, so only files that actually
+    changed have to be classified again. Content hashes are git blob hashes.
+    """
+
+    VERSION = 4
+    FILE_NAME = "building_blocks.json"
+
+    def __init__(self, index_dir: Path):
+        self.index_path = index_dir / self.FILE_NAME
+        self.entries: Dict[str, IndexEntry] = {}
+        # Bumped on every store, so a scan can tell which entries were stored while it ran
+        self.generation = 0
+        self._stored_at: Dict[str, int] = {}
+        self._dirty = False
+        self._load()
+
+    @staticmethod
+    def hash_content(data: bytes) -> str:
+        """Hashes like `git hash-object`, so hashes from the git index compare directly."""
+        digest = hashlib.sha1(b"blob %d\0" % len(data))
+        digest.update(data)
+        return digest.hexdigest()
+
+    def lookup(self, file_path: Path, stat: os.stat_result, layer: str) -> Optional[IndexEntry]:
+        """Returns the entry for the file if its mtime and size are unchanged."""
+        entry = self.entries.get(str(file_path))
+        if entry and entry.layer == layer and entry.mtime_ns == stat.st_mtime_ns and entry.size == stat.st_size:
+            return entry
+        return None
+
+    def get(self, file_path: Path, layer: str) -> Optional[IndexEntry]:
+        """Returns the entry for the file regardless of whether it is still fresh."""
+        entry = self.entries.get(str(file_path))
+        if entry and entry.layer == layer:
+            return entry
+        return None
+
+    def store(
+        self,
+        file_path: Path,
+        stat: os.stat_result,
+        content_hash: str,
+        layer: str,
+        block: Optional[BuildingBlock]
+    ) -> None:
+        self.entries[str(file_path)] = IndexEntry(
+            mtime_ns=stat.st_mtime_ns,
+            size=stat.st_size,
+            content_hash=content_hash,
+            layer=layer,
+            block=block
+        )
+        self.generation += 1
+        self._stored_at[str(file_path)] = self.generation
+        self._dirty = True
+
+    def prune(self, seen_paths: Iterable[str], since: Optional[int] = None) -> int:
+        """
+        Drops entries for files that no longer exist in the scanned layers. With
+        the generation a scan started at, entries stored since then are kept:
+        another writer may have added files the scan did not walk.
+        """
+        seen = set(seen_paths)
+        stale = [
+            path for path in self.entries
+            if path not in seen and (since is None or self._stored_at.get(path, 0) <= since)
+        ]
+        for path in stale:
+            del self.entries[path]
+        if stale:
+            self._dirty = True
+        return len(stale)
+
+    def remove_tree(self, path: Path) -> int:
+        """Drops the entry for a file, or for every file below a directory."""
+        prefix = str(path).rstrip(os.sep) + os.sep
+        stale = [p for p in self.entries if p == str(path) or p.startswith(prefix)]
+        for p in stale:
+            del self.entries[p]
+        if stale:
+            self._dirty = True
+        return len(stale)
+
+    def blocks(self, layers: Iterable[str]) -> List[BuildingBlock]:
+        """Returns the indexed building blocks grouped by layer, in scan order."""
+        by_layer: Dict[str, List[BuildingBlock]] = {layer: [] for layer in layers}
+        for entry in self.entries.values():
+            if entry.block and entry.layer in by_layer:
+                by_layer[entry.layer].append(entry.block)
+
+        result = []
+        for layer_blocks in by_layer.values():
+            result += sorted(layer_blocks, key=lambda bb: (bb.type.value, bb.name))
+        return result
+
+    def save(self) -> None:
+        if not self._dirty:
+            return
+
+        data = {
+            "version": self.VERSION,
+            "files": {path: entry.to_dict() for path, entry in self.entries.items()}
+        }
+
+        try:
+            self.index_path.parent.mkdir(parents=True, exist_ok=True)
+            tmp_path = self.index_path.with_suffix(".tmp")
+            tmp_path.write_text(json.dumps(data), encoding="utf-8")
+            os.replace(tmp_path, self.index_path)
+            self._dirty = False
+        except OSError as e:
+            logger.warning("Failed to write building block index %s: %s", self.index_path, e)
+
+    def _load(self) -> None:
+        if not self.index_path.exists():
+            return
+
+        try:
+            data = json.loads(self.index_path.read_text(encoding="utf-8"))
+        except (OSError, ValueError) as e:
+            logger.warning("Ignoring unreadable building block index %s: %s", self.index_path, e)
+            return
+
+        if data.get("version") != self.VERSION:
+            logger.debug("Building block index version changed, rebuilding.")
+            return
+
+        try:
+            self.entries = {
+                path: IndexEntry.from_dict(entry)
+                for path, entry in data.get("files", {}).items()
+            }
+        except (KeyError, ValueError) as e:
+            logger.warning("Ignoring malformed building block index %s: %s", self.index_path, e)
+            self.entries = {}
@@ -0,0 +1,80 @@
+import logging
+import subprocess
+from pathlib import Path
+from typing import Dict, List, Optional, Set
+
+logger = logging.getLogger(__name__)
+
+# Regular and executable files; symlinks and submodules have no content to classify
+BLOB_MODES = {"100644", "100755"}
+
+
+class GitChangeDetector:
+    """
+    Reads the blob hashes git already tracks for a checkout, so unchanged files
+    can be recognized without stat-ing or hashing them. Only files whose work
+    tree copy matches the git index are reported; modified, staged, conflicted
+    and untracked files are left to the filesystem scan.
+    """
+
+    TIMEOUT = 30
+
+    def __init__(self, project_root: Path):
+        self.project_root = Path(project_root)
+
+    def clean_blob_hashes(self) -> Optional[Dict[str, str]]:
+        """Maps absolute file paths to their blob hash, or returns None without a usable repo."""
+        toplevel = self._git("rev-parse", "--show-toplevel")
+        if toplevel is None:
+            return None
+        repo_root = Path(toplevel.strip())
+
+        listing = self._git("ls-files", "-s", "-z", "--full-name")
+        status = self._git("status", "--porcelain", "-z", "--untracked-files=no", "--", ".")
+        if listing is None or status is None:
+            return None
+
+        dirty = _dirty_paths(status)
+        hashes = {}
+        for record in listing.split("\0"):
+            if not record:
+                continue
+            info, _, path = record.partition("\t")
+            mode, blob_hash, stage = info.split(" ")
+            if stage != "0" or mode not in BLOB_MODES or path in dirty:
+                continue
+            hashes[str(repo_root / path)] = blob_hash
+
+        return hashes
+
+    def _git(self, *args: str) -> Optional[str]:
+        try:
+            result = subprocess.run(
+                ["git", "-C", str(self.project_root), *args],
+                capture_output=True,
+                check=True,
+                timeout=self.TIMEOUT,
+            )
+        except (OSError, subprocess.SubprocessError) as e:
+            logger.debug("git %s unavailable for %s: %s", args[0], self.project_root, e)
+            return None
+        return result.stdout.decode("utf-8", errors="surrogateescape")
+
+
+def _dirty_paths(status: str) -> Set[str]:
+    """Parses `git status --porcelain -z`, whose paths are relative to the repository root."""
+    dirty = set()
+    records: List[str] = status.split("\0")
+    i = 0
+    while i < len(records):
+        record = records[i]
+        i += 1
+        if len(record) < 4:
+            continue
+        code, path = record[:2], record[3:]
+        dirty.add(path)
+        if "R" in code or "C" in code:
+            # Renames and copies are followed by their original path
+            dirty.add(records[i])
+            i += 1
+    return dirty
@@ -1,37 +1,168 @@
-from dataclasses import dataclass, field
+import sys
+from collections.abc import Mapping, Sequence
 from pathlib import Path
-from typing import List, Optional
+from typing import Iterable, Iterator, Optional, Tuple, Union
 
 from codius.infrastructure.services.code_scanner.model.building_block_type import \
     BuildingBlockType
 
+FIELDS = ("type", "name", "file_path", "namespace", "properties", "methods", "project")
+
+
+def _intern(value: Optional[str]) -> Optional[str]:
+    return sys.intern(value) if value is not None else None
+
+
+def _intern_all(values: Optional[Iterable[str]]) -> Tuple[str, ...]:
+    return tuple(sys.intern(value) for value in values) if values else ()
+
 
-@dataclass
 class BuildingBlock:
+    """
+    Immutable, slotted building block. Names and namespaces are interned and
+    members are stored as tuples, since large projects hold many thousands of
+    blocks that share the same namespaces and member names.
+
+    Blocks are tagged with the solution project (bounded context) they were
+    found in, so a multi-project solution can be queried one context at a time.
+    """
+
+    __slots__ = ("type", "name", "_file_path", "namespace", "properties", "methods", "project")
+
     type: BuildingBlockType
     name: str
-    file_path: Path
-    namespace: Optional[str] = None
-    properties: List[str] = field(default_factory=list)
-    methods: List[str] = field(default_factory=list)
+    namespace: Optional[str]
+    properties: Tuple[str, ...]
+    methods: Tuple[str, ...]
+    project: Optional[str]
+
+    def __init__(
+        self,
+        type: BuildingBlockType,
+        name: str,
+        file_path: Union[Path, str],
+        namespace: Optional[str] = None,
+        properties: Optional[Iterable[str]] = None,
+        methods: Optional[Iterable[str]] = None,
+        project: Optional[str] = None
+    ):
+        set_field = object.__setattr__
+        set_field(self, "type", type)
+        set_field(self, "name", sys.intern(name))
+        set_field(self, "_file_path", str(file_path))
+        set_field(self, "namespace", _intern(namespace))
+        set_field(self, "properties", _intern_all(properties))
+        set_field(self, "methods", _intern_all(methods))
+        set_field(self, "project", _intern(project))
+
+    @property
+    def file_path(self) -> Path:
+        return Path(self._file_path)
+
+    def __setattr__(self, name, value):
+        raise AttributeError(f"BuildingBlock is immutable, cannot set '{name}'")
+
+    def __delattr__(self, name):
+        raise AttributeError(f"BuildingBlock is immutable, cannot delete '{name}'")
+
+    def __reduce__(self):
+        return BuildingBlock, (
+            self.type, self.name, self._file_path, self.namespace, self.properties, self.methods, self.project
+        )
+
+    def _key(self) -> tuple:
+        return self.type, self.name, self._file_path, self.namespace, self.properties, self.methods, self.project
+
+    def __eq__(self, other) -> bool:
+        if not isinstance(other, BuildingBlock):
+            return NotImplemented
+        return self._key() == other._key()
+
+    def __hash__(self) -> int:
+        return hash(self._key())
+
+    def __repr__(self) -> str:
+        return (
+            f"BuildingBlock(type={self.type!r}, name={self.name!r}, file_path={self.file_path!r}, "
+            f"namespace={self.namespace!r}, properties={self.properties!r}, methods={self.methods!r}, "
+            f"project={self.project!r})"
+        )
+
+    def as_dict_view(self) -> "BuildingBlockView":
+        """Read-only dict-like view with the same keys and values as to_dict(), without copying."""
+        return BuildingBlockView(self)
 
     def to_dict(self) -> dict:
         return {
             "type": self.type.value,
             "name": self.name,
-            "file_path": str(self.file_path),
+            "file_path": self._file_path,
             "namespace": self.namespace,
-            "properties": self.properties or [],
-            "methods": self.methods or []
+            "properties": list(self.properties),
+            "methods": list(self.methods),
+            "project": self.project
         }
 
     @staticmethod
-    def from_dict(data: dict) -> "BuildingBlock":
+    def from_dict(data: Mapping) -> "BuildingBlock":
+        if isinstance(data, BuildingBlockView):
+            return data.block
         return BuildingBlock(
             type=BuildingBlockType(data["type"]),  # Deserialize back to enum
             name=data["name"],
-            file_path=Path(data["file_path"]),
+            file_path=data["file_path"],
             namespace=data.get("namespace"),
-            properties=data.get("properties", []),
-            methods=data.get("methods", [])
+            properties=data.get("properties"),
+            methods=data.get("methods"),
+            project=data.get("project")
         )
+
+
+class BuildingBlockView(Mapping):
+    """Mapping over a BuildingBlock that serves the to_dict() keys, with tuples for members."""
+
+    __slots__ = ("block",)
+
+    def __init__(self, block: BuildingBlock):
+        self.block = block
+
+    def __getitem__(self, key: str):
+        if key == "type":
+            return self.block.type.value
+        if key == "file_path":
+            return self.block._file_path
+        if key in FIELDS:
+            return getattr(self.block, key)
+        raise KeyError(key)
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(FIELDS)
+
+    def __len__(self) -> int:
+        return len(FIELDS)
+
+    def __repr__(self) -> str:
+        return f"BuildingBlockView({dict(self)!r})"
+
+
+class BuildingBlockViews(Sequence):
+    """
+    Sequence of BuildingBlockView over a list of blocks, so the blocks can be
+    passed through the graph state as dicts without converting each of them.
+    """
+
+    __slots__ = ("blocks",)
+
+    def __init__(self, blocks: Sequence):
+        self.blocks = blocks
+
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            return BuildingBlockViews(self.blocks[index])
+        return self.blocks[index].as_dict_view()
+
+    def __len__(self) -> int:
+        return len(self.blocks)
+
+    def __repr__(self) -> str:
+        return f"BuildingBlockViews({len(self.blocks)} blocks)"
@@ -0,0 +1,61 @@
+from collections import deque
+from typing import Dict, Iterable, Iterator, List
+
+
+class AhoCorasick:
+    """
+    Multi-pattern substring matcher. Built once from all patterns, it finds
+    every pattern occurring in a text in a single pass over that text.
+    """
+
+    def __init__(self, patterns: Iterable[str]):
+        self._goto: List[Dict[str, int]] = [{}]
+        self._fail: List[int] = [0]
+        self._output: List[List[int]] = [[]]
+
+        for pattern_id, pattern in enumerate(patterns):
+            self._add(pattern, pattern_id)
+        self._link()
+
+    def matches(self, text: str) -> Iterator[int]:
+        """Yields the index of every pattern found in text, once per occurrence."""
+        goto, fail, output = self._goto, self._fail, self._output
+
+        yield from output[0]  # Empty patterns occur in every text
+        state = 0
+        for char in text:
+            while state and char not in goto[state]:
+                state = fail[state]
+            state = goto[state].get(char, 0)
+            yield from output[state]
+
+    def _add(self, pattern: str, pattern_id: int) -> None:
+        state = 0
+        for char in pattern:
+            next_state = self._goto[state].get(char)
+            if next_state is None:
+                next_state = len(self._goto)
+                self._goto[state][char] = next_state
+                self._goto.append({})
+                self._fail.append(0)
+                self._output.append([])
+            state = next_state
+        self._output[state].append(pattern_id)
+
+    def _link(self) -> None:
+        # Breadth-first, so every fail target is complete before it is used
+        queue = deque(self._goto[0].values())
+        while queue:
+            state = queue.popleft()
+            for char, next_state in self._goto[state].items():
+                queue.append(next_state)
+
+                fallback = self._fail[state]
+                while fallback and char not in self._goto[fallback]:
+                    fallback = self._fail[fallback]
+                target = self._goto[fallback].get(char, 0)
+                self._fail[next_state] = target
+
+                # A state also matches everything its longest proper suffix matches
+                if target:
+                    self._output[next_state] = self._output[next_state] + self._output[target]
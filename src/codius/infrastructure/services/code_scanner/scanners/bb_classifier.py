@@ -0,0 +1,257 @@
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import ByteString, Dict, List, Optional, Tuple
+
+from codius.infrastructure.services import csharp_queries
+from codius.infrastructure.services.code_scanner.model.building_block import BuildingBlock
+from codius.infrastructure.services.code_scanner.model.building_block_type import BuildingBlockType
+from codius.infrastructure.services.tree_sitter_service import TreeSitterService
+
+CLASS_KINDS = {"class_declaration", "struct_declaration", "record_declaration"}
+
+# A file can only hold a building block of a layer if it contains one of these.
+# Keep in sync with the rules in BuildingBlockClassifier.
+LAYER_MARKERS = {
+    "domain": (
+        b"AggregateRootBase", b"EntityBase", b"IValueObject", b"IDomainEvent",
+        b"Repository", b"IDomainService", b"IPort",
+    ),
+    "application": (
+        b"IAction", b"ICommand", b"EventListenerBase",
+    ),
+    "infrastructure": (
+        b"IInfrastructureService", b"Port", b"ControllerBase",
+    ),
+}
+
+
+@dataclass
+class TypeDeclaration:
+    kind: str
+    name: str
+    namespace: Optional[str]
+    bases: Dict[str, bool] = field(default_factory=dict)  # base name -> is generic
+    properties: List[str] = field(default_factory=list)
+    methods: List[str] = field(default_factory=list)
+
+    @property
+    def is_class(self) -> bool:
+        return self.kind in CLASS_KINDS
+
+    @property
+    def is_interface(self) -> bool:
+        return self.kind == "interface_declaration"
+
+    def has_base(self, name: str, generic: bool = False) -> bool:
+        return name in self.bases and (self.bases[name] or not generic)
+
+    def has_base_matching(self, prefix: str, suffix: str) -> bool:
+        return any(
+            base.startswith(prefix) and base.endswith(suffix) and len(base) > len(prefix) + len(suffix)
+            for base in self.bases
+        )
+
+
+class BuildingBlockClassifier:
+    """
+    Classifies a C# source file into a building block from a single tree-sitter
+    parse. Base types, namespaces and public members are read from the captures
+    of one precompiled query instead of regexes over the file text.
+    """
+
+    def __init__(self, tree_sitter_service: TreeSitterService):
+        self.tree_sitter_service = tree_sitter_service
+
+    def has_markers(self, layer: str, source: ByteString) -> bool:
+        """Cheap byte-level check that rules out files before they are parsed."""
+        return any(source.find(marker) != -1 for marker in LAYER_MARKERS.get(layer, ()))
+
+    def classify(
+        self, file_path: Path, layer: str, source: bytes, project: Optional[str] = None
+    ) -> Optional[BuildingBlock]:
+        class_name = file_path.stem
+        types = self._collect_types(source)
+
+        primary = next((t for t in types if t.name == class_name and t.is_class), None)
+
+        if layer == "domain":
+            block_type, declaration = self._classify_domain(file_path, primary, types)
+        elif layer == "application":
+            block_type, declaration = self._classify_application(class_name, primary, types)
+        elif layer == "infrastructure":
+            block_type, declaration = self._classify_infrastructure(file_path, primary, types)
+        else:
+            block_type, declaration = None, None
+
+        if block_type is None:
+            return None
+
+        return BuildingBlock(
+            type=block_type,
+            name=class_name,
+            file_path=file_path,
+            namespace=declaration.namespace,
+            properties=sorted(set(declaration.properties)),
+            methods=sorted(set(declaration.methods)),
+            project=project,
+        )
+
+    def _classify_domain(
+        self, file_path: Path, primary: Optional[TypeDeclaration], types: List[TypeDeclaration]
+    ) -> Tuple[Optional[BuildingBlockType], Optional[TypeDeclaration]]:
+        if primary:
+            if primary.has_base("AggregateRootBase", generic=True):
+                return BuildingBlockType.AGGREGATE_ROOT, primary
+            if primary.has_base("EntityBase", generic=True):
+                return BuildingBlockType.ENTITY, primary
+            if primary.has_base("IValueObject"):
+                return BuildingBlockType.VALUE_OBJECT, primary
+            if primary.has_base("IDomainEvent"):
+                return BuildingBlockType.DOMAIN_EVENT, primary
+
+        for t in types:
+            if t.is_interface and t.name.startswith("I") and t.name.endswith("Repository") and len(t.name) > len("IRepository"):
+                return BuildingBlockType.REPOSITORY, t
+
+        for t in types:
+            if t.has_base("IDomainService"):
+                return BuildingBlockType.DOMAIN_SERVICE, t
+
+        if "Ports" in str(file_path):
+            for t in types:
+                if t.is_interface and t.has_base("IPort"):
+                    return BuildingBlockType.PORT, t
+
+        return None, None
+
+    def _classify_application(
+        self, class_name: str, primary: Optional[TypeDeclaration], types: List[TypeDeclaration]
+    ) -> Tuple[Optional[BuildingBlockType], Optional[TypeDeclaration]]:
+        if primary:
+            if primary.has_base("IAction", generic=True):
+                return BuildingBlockType.ACTION, primary
+            if primary.has_base("ICommand"):
+                return BuildingBlockType.COMMAND, primary
+
+        for t in types:
+            if any(base.endswith("EventListenerBase") for base in t.bases):
+                if class_name.endswith("IntegrationEventListener"):
+                    return BuildingBlockType.INTEGRATION_EVENT_LISTENER, t
+                return BuildingBlockType.DOMAIN_EVENT_LISTENER, t
+
+        return None, None
+
+    def _classify_infrastructure(
+        self, file_path: Path, primary: Optional[TypeDeclaration], types: List[TypeDeclaration]
+    ) -> Tuple[Optional[BuildingBlockType], Optional[TypeDeclaration]]:
+        for t in types:
+            if t.has_base("IInfrastructureService"):
+                return BuildingBlockType.INFRASTRUCTURE_SERVICE, t
+
+        if primary and "Adapters" in str(file_path) and primary.has_base_matching("I", "Port"):
+            return BuildingBlockType.ADAPTER, primary
+
+        for t in types:
+            if t.has_base("ControllerBase"):
+                return BuildingBlockType.ADAPTER, t
+
+        return None, None
+
+    def _collect_types(self, source: bytes) -> List[TypeDeclaration]:
+        # Every file is parsed once per scan, so caching trees would only evict useful ones
+        tree = self.tree_sitter_service.parse_bytes(source, cache=False)
+
+        types: Dict[int, TypeDeclaration] = {}
+        type_nodes = []
+        namespaces: Dict[int, str] = {}
+        first_namespace = None
+        members = []
+
+        for captures in self.tree_sitter_service.matches(csharp_queries.DECLARATIONS, tree.root_node):
+            name = _text(captures["name"])
+
+            if "type" in captures:
+                node = captures["type"]
+                types[node.id] = TypeDeclaration(
+                    kind=node.type,
+                    name=name,
+                    namespace=None,
+                    bases=_base_names(node),
+                )
+                type_nodes.append(node)
+            elif "namespace" in captures:
+                node = captures["namespace"]
+                namespaces[node.id] = name
+                if first_namespace is None:
+                    first_namespace = name
+            elif "property" in captures:
+                members.append(("property", captures["property"], name))
+            elif "method" in captures:
+                members.append(("method", captures["method"], name))
+
+        for node in type_nodes:
+            types[node.id].namespace = _enclosing_namespace(node, namespaces) or first_namespace
+
+        for kind, node, name in members:
+            owner = _owner(node, types)
+            if owner is None or not (owner.is_interface or _is_public(node)):
+                continue
+            if kind == "property":
+                owner.properties.append(name)
+            else:
+                owner.methods.append(name)
+
+        return list(types.values())
+
+
+def _text(node) -> str:
+    return node.text.decode("utf-8", errors="ignore")
+
+
+def _base_names(type_node) -> Dict[str, bool]:
+    bases = {}
+    for child in type_node.children:
+        if child.type != "base_list":
+            continue
+        for base in child.named_children:
+            name, generic = _simple_type_name(base)
+            if name:
+                bases[name] = generic
+    return bases
+
+
+def _simple_type_name(node) -> Tuple[Optional[str], bool]:
+    """Reduces `Ns.Base<T>` or `global::Base` to its simple name and whether it is generic."""
+    if node.type == "identifier":
+        return _text(node), False
+    if node.type == "generic_name":
+        identifier = next((c for c in node.named_children if c.type == "identifier"), None)
+        return (_text(identifier) if identifier else None), True
+    if node.type in ("qualified_name", "alias_qualified_name"):
+        return _simple_type_name(node.named_children[-1]) if node.named_children else (None, False)
+    if node.type == "primary_constructor_base_type" and node.named_children:
+        return _simple_type_name(node.named_children[0])
+    return None, False
+
+
+def _enclosing_namespace(node, namespaces: Dict[int, str]) -> Optional[str]:
+    parent = node.parent
+    while parent is not None:
+        if parent.id in namespaces:
+            return namespaces[parent.id]
+        parent = parent.parent
+    return None
+
+
+def _owner(member_node, types: Dict[int, TypeDeclaration]) -> Optional[TypeDeclaration]:
+    body = member_node.parent
+    if body is None or body.parent is None:
+        return None
+    return types.get(body.parent.id)
+
+
+def _is_public(member_node) -> bool:
+    return any(
+        child.type == "modifier" and child.text == b"public"
+        for child in member_node.children
+    )
@@ -1,92 +1,311 @@
-import re
+import logging
+import math
+import mmap
+import os
+from concurrent.futures import ProcessPoolExecutor
+from contextlib import contextmanager, nullcontext
+from itertools import repeat
+from dataclasses import dataclass
 from pathlib import Path
-from typing import List, Dict
+from typing import Iterable, Iterator, List, Dict, NamedTuple, Optional, Tuple, Union
 
+from codius.infrastructure.services.code_scanner.index.building_block_index import \
+    BuildingBlockIndex
 from codius.infrastructure.services.code_scanner.model.building_block import BuildingBlock
-from codius.infrastructure.services.code_scanner.model.building_block_type import BuildingBlockType
+from codius.infrastructure.services.code_scanner.scanners.bb_classifier import \
+    BuildingBlockClassifier
+from codius.infrastructure.services.directory_walker import DirectoryWalker
+from codius.infrastructure.services.source_file_cache import SourceFileCache
+from codius.infrastructure.services.tree_sitter_service import TreeSitterService
+
+logger = logging.getLogger(__name__)
+
+# (file path, layer, content hash known from the index or None, current hash known from git or None)
+ScanItem = Tuple[str, str, Optional[str], Optional[str]]
+
+
+class ScanResult(NamedTuple):
+    content_hash: str
+    block: Optional[BuildingBlock]
+    changed: bool
+    prefiltered: bool = False
+
+
+@dataclass
+class ScanStats:
+    files: int = 0
+    cached: int = 0
+    tracked: int = 0
+    unchanged: int = 0
+    prefiltered: int = 0
+    classified: int = 0
 
 
 class BuildingBlockScanner:
+    LAYERS = (
+        ("domain", "domain_path"),
+        ("application", "application_path"),
+        ("infrastructure", "infrastructure_path"),
+    )
+
+    # Below this many files to classify, spawning processes costs more than it saves
+    MIN_FILES_PER_WORKER = 32
+
+    # Chunks per worker, so a few slow files don't leave the other workers idle
+    CHUNKS_PER_WORKER = 4
+
+    # Smaller files are cheaper to read() than to memory-map
+    MMAP_MIN_SIZE = 16 * 1024
+
+    def __init__(
+        self,
+        index: Optional[BuildingBlockIndex] = None,
+        workers: int = 1,
+        classifier: Optional[BuildingBlockClassifier] = None,
+        git_hashes: Optional[Dict[str, str]] = None,
+        file_cache: Optional[SourceFileCache] = None,
+        project: Optional[str] = None
+    ):
+        self.index = index
+        self.project = project
+        # Blob hashes of clean tracked files (see GitChangeDetector), shared by the scanners of one scan
+        self.git_hashes = git_hashes
+        self.file_cache = file_cache
+        self.workers = max(1, workers)
+        self.classifier = classifier or BuildingBlockClassifier(TreeSitterService())
+        self.stats = ScanStats()
+
     def scan(self, project_metadata: Dict) -> List[BuildingBlock]:
-        return sorted(
-            self._scan_domain_layer(project_metadata),
-            key=lambda bb: (bb.type.value, bb.name)
-        ) + sorted(
-            self._scan_application_layer(project_metadata),
-            key=lambda bb: (bb.type.value, bb.name)
-        ) + sorted(
-            self._scan_infrastructure_layer(project_metadata),
-            key=lambda bb: (bb.type.value, bb.name)
+        by_layer: Dict[str, List[BuildingBlock]] = {layer: [] for layer, _ in self.LAYERS}
+        for layer, block in self._scan_layers(project_metadata):
+            by_layer[layer].append(block)
+
+        result = []
+        for blocks in by_layer.values():
+            result += sorted(blocks, key=lambda bb: (bb.type.value, bb.name))
+        return result
+
+    def scan_iter(self, project_metadata: Dict) -> Iterator[BuildingBlock]:
+        """
+        Yields building blocks as soon as they are found: cached ones first, then
+        the rest as they are classified. Unlike scan(), the order is not sorted.
+        """
+        for _, block in self._scan_layers(project_metadata):
+            yield block
+
+    def _scan_layers(self, project_metadata: Dict) -> Iterator[Tuple[str, BuildingBlock]]:
+        self.stats = ScanStats()
+        # The file watcher may refresh the index while a streamed scan is paused
+        generation = self.index.generation if self.index is not None else None
+        walker = DirectoryWalker(project_metadata.get("project_root"))
+        files = [
+            (file_path, layer)
+            for layer, path_key in self.LAYERS
+            if project_metadata.get(path_key)
+            for file_path in walker.walk(Path(project_metadata[path_key]), ".cs")
+        ]
+
+        completed = False
+        try:
+            for i, block in self._iter_scan_files(files):
+                if block:
+                    yield files[i][1], block
+            completed = True
+        finally:
+            # An abandoned scan still keeps what it classified, but must not prune
+            if self.index is not None:
+                if completed:
+                    removed = self.index.prune((str(file_path) for file_path, _ in files), since=generation)
+                    if removed:
+                        logger.debug("Removed %d deleted file(s) from building block index", removed)
+                self.index.save()
+
+        logger.debug(
+            "Scanned %d file(s): %d cached (%d by git hash), %d unchanged, %d skipped by prefilter, %d classified",
+            self.stats.files, self.stats.cached, self.stats.tracked, self.stats.unchanged,
+            self.stats.prefiltered, self.stats.classified
         )
 
-    def _scan_domain_layer(self, project_metadata: Dict) -> List[BuildingBlock]:
-        domain_path = Path(project_metadata["domain_path"])
-        return self._scan_files(domain_path, "domain")
-
-    def _scan_application_layer(self, project_metadata: Dict) -> List[BuildingBlock]:
-        application_path = Path(project_metadata["application_path"])
-        return self._scan_files(application_path, "application")
-
-    def _scan_infrastructure_layer(self, project_metadata: Dict) -> List[BuildingBlock]:
-        infrastructure_path = Path(project_metadata["infrastructure_path"])
-        return self._scan_files(infrastructure_path, "infrastructure")
-
-    def _scan_files(self, base_path: Path, layer: str) -> List[BuildingBlock]:
-        blocks = []
-
-        for file_path in base_path.rglob("*.cs"):
-            content = file_path.read_text(encoding="utf-8", errors="ignore")
-            class_name = file_path.stem
-
-            if layer == "domain":
-                if re.search(rf'\bclass\s+{class_name}\s*:\s*AggregateRootBase<', content):
-                    blocks.append(self._create_block(BuildingBlockType.AGGREGATE_ROOT, class_name, file_path, content))
-                elif re.search(rf'\bclass\s+{class_name}\s*:\s*EntityBase<', content):
-                    blocks.append(self._create_block(BuildingBlockType.ENTITY, class_name, file_path, content))
-                elif re.search(rf'\bclass\s+{class_name}\s*:\s*.*\bIValueObject\b', content):
-                    blocks.append(self._create_block(BuildingBlockType.VALUE_OBJECT, class_name, file_path, content))
-                elif re.search(rf'\bclass\s+{class_name}\s*:\s*.*\bIDomainEvent\b', content):
-                    blocks.append(self._create_block(BuildingBlockType.DOMAIN_EVENT, class_name, file_path, content))
-                elif re.search(r'\binterface\s+I\w+Repository\b', content):
-                    blocks.append(self._create_block(BuildingBlockType.REPOSITORY, class_name, file_path, content))
-                elif "IDomainService" in content:
-                    blocks.append(self._create_block(BuildingBlockType.DOMAIN_SERVICE, class_name, file_path, content))
-                elif "Ports" in str(file_path) and re.search(r'\binterface\s+I\w+\s*:\s*.*\bIPort\b', content):
-                    blocks.append(self._create_block(BuildingBlockType.PORT, class_name, file_path, content))
-
-            elif layer == "application":
-                if re.search(rf'\bclass\s+{class_name}\s*:\s*.*\bIAction<', content):
-                    blocks.append(self._create_block(BuildingBlockType.ACTION, class_name, file_path, content))
-                elif re.search(rf'\bclass\s+{class_name}\s*:\s*.*\bICommand\b', content):
-                    blocks.append(self._create_block(BuildingBlockType.COMMAND, class_name, file_path, content))
-                elif "EventListenerBase" in content:
-                    if class_name.endswith("IntegrationEventListener"):
-                        blocks.append(self._create_block(BuildingBlockType.INTEGRATION_EVENT_LISTENER, class_name, file_path, content))
-                    else:
-                        blocks.append(self._create_block(BuildingBlockType.DOMAIN_EVENT_LISTENER, class_name, file_path, content))
-
-            elif layer == "infrastructure":
-                if "IInfrastructureService" in content:
-                    blocks.append(self._create_block(BuildingBlockType.INFRASTRUCTURE_SERVICE, class_name, file_path, content))
-                elif "Adapters" in str(file_path) and re.search(rf'\bclass\s+{class_name}\s*:\s*I\w+Port\b', content):
-                    blocks.append(self._create_block(BuildingBlockType.ADAPTER, class_name, file_path, content))
-                elif "ControllerBase" in content:
-                    blocks.append(self._create_block(BuildingBlockType.ADAPTER, class_name, file_path, content))
-
-        return blocks
-
-    def _create_block(self, block_type: BuildingBlockType, name: str, file_path: Path, content: str) -> BuildingBlock:
-        namespace_match = re.search(r'namespace\s+([\w\.]+)', content)
-        namespace = namespace_match.group(1) if namespace_match else None
-
-        properties = re.findall(r'public\s+\w+\s+(\w+)\s*\{', content)
-        methods = re.findall(r'public\s+\w+\s+(\w+)\s*\([^)]*\)\s*\{', content)
-
-        return BuildingBlock(
-            type=block_type,
-            name=name,
-            file_path=file_path,
-            namespace=namespace,
-            properties=sorted(set(properties)),
-            methods=sorted(set(methods)),
+    def refresh(self, project_metadata: Dict, changed_paths: Iterable[Path]) -> List[BuildingBlock]:
+        """
+        Re-scans only the given files or directories and returns every indexed
+        building block. Paths that no longer exist are dropped from the index.
+        Requires an index that is already populated by a full scan.
+        """
+        if self.index is None:
+            raise ValueError("Refreshing building blocks requires an index")
+
+        self.stats = ScanStats()
+        walker = DirectoryWalker(project_metadata.get("project_root"))
+        files: Dict[Path, str] = {}
+
+        for path in changed_paths:
+            path = Path(path)
+            layer = self._layer_of(project_metadata, path)
+            if layer is None:
+                continue
+
+            if path.is_dir():
+                # A directory moved or copied into a layer brings its files along
+                files.update((file_path, layer) for file_path in walker.walk(path, ".cs"))
+            elif path.suffix == ".cs" and path.is_file() and not walker.is_ignored(path):
+                files[path] = layer
+            else:
+                self.index.remove_tree(path)
+
+        for _ in self._iter_scan_files(list(files.items()), use_git=False):
+            pass
+        self.index.save()
+
+        logger.debug(
+            "Refreshed %d file(s): %d unchanged, %d skipped by prefilter, %d classified",
+            self.stats.files, self.stats.unchanged, self.stats.prefiltered, self.stats.classified
         )
+
+        return self.index.blocks(layer for layer, _ in self.LAYERS)
+
+    def _layer_of(self, project_metadata: Dict, path: Path) -> Optional[str]:
+        for layer, path_key in self.LAYERS:
+            if not project_metadata.get(path_key):
+                continue
+            layer_path = Path(project_metadata[path_key])
+            if path == layer_path or layer_path in path.parents:
+                return layer
+        return None
+
+    def _iter_scan_files(
+        self, files: List[Tuple[Path, str]], use_git: bool = True
+    ) -> Iterator[Tuple[int, Optional[BuildingBlock]]]:
+        """Yields (position in files, block or None) for every file, cached files first."""
+        pending: List[int] = []
+        stats = {}
+        items: List[ScanItem] = []
+        self.stats.files += len(files)
+
+        git_hashes = self.git_hashes if use_git and self.index is not None and self.git_hashes else {}
+
+        for i, (file_path, layer) in enumerate(files):
+            cached_hash = None
+            git_hash = git_hashes.get(str(file_path))
+            if self.index is not None:
+                # Git already knows the content hash of clean tracked files
+                if git_hash:
+                    entry = self.index.get(file_path, layer)
+                    if entry and entry.content_hash == git_hash:
+                        self.stats.cached += 1
+                        self.stats.tracked += 1
+                        yield i, entry.block
+                        continue
+
+                stat = file_path.stat()
+                entry = self.index.lookup(file_path, stat, layer)
+                if entry:
+                    self.stats.cached += 1
+                    yield i, entry.block
+                    continue
+                stats[i] = stat
+                entry = self.index.get(file_path, layer)
+                cached_hash = entry.content_hash if entry else None
+
+            pending.append(i)
+            items.append((str(file_path), layer, cached_hash, git_hash))
+
+        if not items:
+            return
+
+        logger.debug("Classifying %d of %d file(s)", len(items), len(files))
+
+        for i, result in zip(pending, self._classify_items(items)):
+            file_path, layer = files[i]
+            block = result.block
+
+            if not result.changed:
+                self.stats.unchanged += 1
+                block = self.index.get(file_path, layer).block
+            elif result.prefiltered:
+                self.stats.prefiltered += 1
+            else:
+                self.stats.classified += 1
+
+            if self.index is not None:
+                self.index.store(file_path, stats[i], result.content_hash, layer, block)
+            yield i, block
+
+    def _classify_items(self, items: List[ScanItem]) -> Iterator[ScanResult]:
+        workers = min(self.workers, len(items) // self.MIN_FILES_PER_WORKER)
+        if workers <= 1:
+            for item in items:
+                yield self._scan_item(item)
+            return
+
+        # Contiguous chunks merged back with map() keep the original file order,
+        # so the result is identical to a serial scan.
+        chunk_size = math.ceil(len(items) / (workers * self.CHUNKS_PER_WORKER))
+        chunks = [items[i:i + chunk_size] for i in range(0, len(items), chunk_size)]
+
+        logger.debug("Scanning %d file(s) in %d chunk(s) using %d worker(s)", len(items), len(chunks), workers)
+
+        with ProcessPoolExecutor(max_workers=workers) as executor:
+            for chunk in executor.map(_scan_chunk, chunks, repeat(self.project)):
+                yield from chunk
+
+    def _scan_item(self, item: ScanItem) -> ScanResult:
+        path, layer, cached_hash, git_hash = item
+        file_path = Path(path)
+
+        # Read through the shared cache only on a hit: a miss is memory-mapped
+        # like in worker processes, and cached only once it passes the prefilter
+        cached, stat = None, None
+        if self.file_cache is not None:
+            cached = self.file_cache.peek_bytes(file_path)
+            if cached is None:
+                stat = file_path.stat()
+        reader = nullcontext(cached) if cached is not None else _read_file(file_path, self.MMAP_MIN_SIZE)
+
+        with reader as data:
+            content_hash = git_hash or BuildingBlockIndex.hash_content(data)
+            if content_hash == cached_hash:
+                return ScanResult(content_hash, None, changed=False)
+
+            # Most files (DTOs, migrations, helpers) can never be building blocks,
+            # so don't copy, parse or cache them unless they contain a marker token.
+            if not self.classifier.has_markers(layer, data):
+                return ScanResult(content_hash, None, changed=True, prefiltered=True)
+
+            source = data[:]
+            if stat is not None:
+                self.file_cache.put_bytes(file_path, source, stat)
+            block = self.classifier.classify(file_path, layer, source, project=self.project)
+            return ScanResult(content_hash, block, changed=True)
+
+
+@contextmanager
+def _read_file(file_path: Path, mmap_min_size: int) -> Iterator[Union[bytes, mmap.mmap]]:
+    with open(file_path, "rb") as f:
+        mapped = None
+        if os.fstat(f.fileno()).st_size >= mmap_min_size:
+            try:
+                mapped = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+            except (OSError, ValueError):
+                mapped = None
+
+        if mapped is None:
+            yield f.read()
+            return
+
+        try:
+            yield mapped
+        finally:
+            mapped.close()
+
+
+_worker_scanner: Optional[BuildingBlockScanner] = None
+
+
+def _scan_chunk(items: List[ScanItem], project: Optional[str]) -> List[ScanResult]:
+    # Reuse one scanner per worker process so the classifier query is compiled once
+    global _worker_scanner
+    if _worker_scanner is None:
+        _worker_scanner = BuildingBlockScanner()
+    _worker_scanner.project = project
+    return [_worker_scanner._scan_item(item) for item in items]
@@ -1,8 +1,13 @@
 import re
-from typing import List, Optional, Set
+from collections import defaultdict
+from pathlib import Path
+from typing import Dict, FrozenSet, List, Optional, Set, Tuple
 
 from codius.infrastructure.services.code_scanner.model.building_block import BuildingBlock
 from codius.infrastructure.services.code_scanner.model.building_block_type import BuildingBlockType
+from codius.infrastructure.services.code_scanner.scanners.aho_corasick import AhoCorasick
+from codius.infrastructure.services.code_scanner.scanners.identifier_index import IdentifierIndex
+from codius.infrastructure.services.source_file_cache import SourceFileCache
 
 
 class FlowScanner:
@@ -33,35 +38,61 @@ class FlowScanner:
 
             return " ➝ ".join(parts)
 
+    def __init__(self, file_cache: Optional[SourceFileCache] = None):
+        self.file_cache = file_cache
+        # Block name matchers per set of valid types, built once per scan
+        self._matchers: Dict[FrozenSet[BuildingBlockType], Tuple[AhoCorasick, List[BuildingBlock]]] = {}
+
     def scan(self, building_blocks: List[BuildingBlock]) -> List["FlowScanner.Flow"]:
+        self._matchers = {}
         adapters = [b for b in building_blocks if b.type == BuildingBlockType.ADAPTER and "Controller" in b.name]
         listeners = [b for b in building_blocks if "LISTENER" in b.type.name]
         actions = [b for b in building_blocks if b.type == BuildingBlockType.ACTION]
 
         flows: List[FlowScanner.Flow] = []
 
+        # Read and tokenize each controller once, then resolve actions by name lookups
+        adapter_index = self._index_files(adapters)
+        actions_by_name: Dict[str, List[int]] = defaultdict(list)
+        for position, action in enumerate(actions):
+            actions_by_name[action.name.lower()].append(position)
+
         for adapter in adapters:
-            flows += self._scan_adapter_flows(adapter, actions, building_blocks)
+            flows += self._scan_adapter_flows(adapter, actions, building_blocks, adapter_index, actions_by_name)
 
         for listener in listeners:
             flows += self._scan_listener_flows(listener, actions, building_blocks)
 
         return flows
 
+    def _index_files(self, blocks: List[BuildingBlock]) -> IdentifierIndex:
+        index = IdentifierIndex()
+        for block in blocks:
+            try:
+                index.add_file(str(block.file_path), self._read_text(block.file_path))
+            except Exception:
+                continue
+        return index
+
     def _scan_adapter_flows(
-        self, adapter: BuildingBlock, actions: List[BuildingBlock], blocks: List[BuildingBlock]
+        self, adapter: BuildingBlock, actions: List[BuildingBlock], blocks: List[BuildingBlock],
+        index: IdentifierIndex, actions_by_name: Dict[str, List[int]]
     ) -> List["FlowScanner.Flow"]:
         flows = []
-        try:
-            content = adapter.file_path.read_text(encoding="utf-8", errors="ignore")
-        except Exception:
-            return flows
 
-        for action in actions:
-            if re.search(rf'\b\w*{re.escape(action.name)}\b\s*\.\s*ExecuteAsync\(', content, re.IGNORECASE):
-                domain_logic = self._find_called_block(action, blocks, {BuildingBlockType.AGGREGATE_ROOT, BuildingBlockType.DOMAIN_SERVICE})
-                events = self._extract_published_events(domain_logic) if domain_logic else []
-                flows.append(self.Flow(f"(webapi adapter) {adapter.name}", action, domain_logic, events))
+        # An action is executed through any identifier ending with its name,
+        # e.g. `_createBookAction.ExecuteAsync(` for CreateBookAction.
+        executed: Set[int] = set()
+        for _, receiver in index.member_calls("ExecuteAsync", str(adapter.file_path)):
+            receiver = receiver.lower()
+            for start in range(len(receiver)):
+                executed.update(actions_by_name.get(receiver[start:], ()))
+
+        for position in sorted(executed):
+            action = actions[position]
+            domain_logic = self._find_called_block(action, blocks, {BuildingBlockType.AGGREGATE_ROOT, BuildingBlockType.DOMAIN_SERVICE})
+            events = self._extract_published_events(domain_logic) if domain_logic else []
+            flows.append(self.Flow(f"(webapi adapter) {adapter.name}", action, domain_logic, events))
         return flows
 
     def _scan_listener_flows(
@@ -71,7 +102,7 @@ class FlowScanner:
         flows = []
 
         try:
-            content = listener.file_path.read_text(encoding="utf-8", errors="ignore")
+            content = self._read_text(listener.file_path)
         except Exception:
             return flows
 
@@ -102,18 +133,35 @@ class FlowScanner:
     def _find_called_block(
         self, action: BuildingBlock, blocks: List[BuildingBlock], valid_types: Set[BuildingBlockType]
     ) -> Optional[BuildingBlock]:
-        for bb in blocks:
-            if bb.type in valid_types:
-                for method in action.methods:
-                    if bb.name.lower() in method.lower():
-                        return bb
-        return None
+        """Returns the first valid block whose name occurs in any of the action's method names."""
+        matcher, candidates = self._get_matcher(blocks, valid_types)
+
+        first = None
+        for method in action.methods:
+            for position in matcher.matches(method.lower()):
+                if first is None or position < first:
+                    first = position
+        return candidates[first] if first is not None else None
+
+    def _get_matcher(
+        self, blocks: List[BuildingBlock], valid_types: Set[BuildingBlockType]
+    ) -> Tuple[AhoCorasick, List[BuildingBlock]]:
+        key = frozenset(valid_types)
+        if key not in self._matchers:
+            candidates = [bb for bb in blocks if bb.type in valid_types]
+            self._matchers[key] = AhoCorasick(bb.name.lower() for bb in candidates), candidates
+        return self._matchers[key]
 
     def _extract_published_events(self, domain_logic_block: BuildingBlock) -> List[str]:
         try:
-            content = domain_logic_block.file_path.read_text(encoding="utf-8", errors="ignore")
+            content = self._read_text(domain_logic_block.file_path)
             # Heuristic: Look for `new EventName(...` in context of PublishAsync
             matches = re.findall(r'PublishAsync\s*\(\s*new\s+(\w+)\s*\(', content)
             return sorted(set(matches))
         except Exception:
             return []
+
+    def _read_text(self, path: Path) -> str:
+        if self.file_cache is None:
+            return path.read_text(encoding="utf-8", errors="ignore")
+        return self.file_cache.read_text(path, errors="ignore")
@@ -0,0 +1,40 @@
+import re
+from collections import defaultdict
+from typing import Dict, Iterator, List, Optional, Tuple
+
+IDENTIFIER = re.compile(r"\w+")
+CALL_OPEN = re.compile(r"\s*\(")
+
+
+class IdentifierIndex:
+    """
+    Inverted index from identifiers to the files and token positions where they
+    occur, built with a single tokenizer pass per file. Lookups are
+    case-insensitive, like the regexes they replace.
+    """
+
+    def __init__(self):
+        self._occurrences: Dict[str, Dict[str, List[int]]] = defaultdict(lambda: defaultdict(list))
+        self._files: Dict[str, Tuple[str, List[Tuple[str, int, int]]]] = {}
+
+    def add_file(self, key: str, content: str) -> None:
+        tokens = [(m.group(), m.start(), m.end()) for m in IDENTIFIER.finditer(content)]
+        self._files[key] = (content, tokens)
+        for position, (token, _, _) in enumerate(tokens):
+            self._occurrences[token.lower()][key].append(position)
+
+    def member_calls(self, member: str, key: Optional[str] = None) -> Iterator[Tuple[str, str]]:
+        """Yields (file key, receiver) for every `receiver.member(` call, optionally in one file only."""
+        by_file = self._occurrences.get(member.lower(), {})
+        keys = [key] if key is not None else list(by_file)
+
+        for file_key in keys:
+            content, tokens = self._files.get(file_key, ("", []))
+            for position in by_file.get(file_key, ()):
+                if position == 0:
+                    continue
+
+                _, start, end = tokens[position]
+                receiver, _, receiver_end = tokens[position - 1]
+                if content[receiver_end:start].strip() == "." and CALL_OPEN.match(content, end):
+                    yield file_key, receiver
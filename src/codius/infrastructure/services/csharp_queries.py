@@ -0,0 +1,43 @@
+# C# tree-sitter queries, compiled once by TreeSitterService. Looking nodes up
+# with a query runs in tree-sitter itself instead of a recursive walk over the
+# tree in Python.
+
+# Type, namespace and member declarations, for classifying building blocks
+DECLARATIONS = """
+[
+  (class_declaration name: (identifier) @name)
+  (struct_declaration name: (identifier) @name)
+  (record_declaration name: (identifier) @name)
+  (interface_declaration name: (identifier) @name)
+] @type
+
+[
+  (namespace_declaration name: (_) @name)
+  (file_scoped_namespace_declaration name: (_) @name)
+] @namespace
+
+(property_declaration name: (identifier) @name) @property
+
+(method_declaration name: (identifier) @name) @method
+"""
+
+# Classes with a body, outermost first
+CLASS_DECLARATIONS = """
+(class_declaration body: (declaration_list) @body) @class
+"""
+
+# Type declarations with a body, outer types first
+TYPE_DECLARATIONS = """
+[
+  (class_declaration body: (declaration_list))
+  (struct_declaration body: (declaration_list))
+  (record_declaration body: (declaration_list))
+  (interface_declaration body: (declaration_list))
+] @type
+"""
+
+METHOD_NAMES = """
+(method_declaration name: (identifier) @name) @method
+"""
+
+ALL = (DECLARATIONS, CLASS_DECLARATIONS, TYPE_DECLARATIONS, METHOD_NAMES)
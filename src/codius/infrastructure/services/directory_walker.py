@@ -0,0 +1,228 @@
+import logging
+import os
+import re
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Iterator, List, Optional, Pattern, Tuple, Union
+
+logger = logging.getLogger(__name__)
+
+# Build output, tooling and VCS folders that never contain project sources
+DEFAULT_IGNORED_DIRS = frozenset({
+    ".git", ".hg", ".svn", ".vs", ".idea", ".vscode", ".codius",
+    "bin", "obj", "node_modules", "packages", "TestResults",
+})
+
+
+@dataclass(frozen=True)
+class IgnoreRule:
+    base: str  # Directory of the .gitignore, relative to the walk root ("" for the root)
+    regex: Pattern
+    negated: bool
+    directory_only: bool
+    anchored: bool
+
+    def matches(self, rel_path: str, name: str, is_dir: bool) -> bool:
+        if self.directory_only and not is_dir:
+            return False
+
+        if self.base:
+            if not rel_path.startswith(self.base + "/"):
+                return False
+            rel_path = rel_path[len(self.base) + 1:]
+
+        target = rel_path if self.anchored else name
+        return self.regex.fullmatch(target) is not None
+
+
+def parse_gitignore(text: str, base: str = "") -> List[IgnoreRule]:
+    """Parses the subset of .gitignore syntax that matters for pruning a source walk."""
+    rules = []
+
+    for raw_line in text.splitlines():
+        line = raw_line.rstrip()
+        if not line or line.startswith("#"):
+            continue
+
+        negated = line.startswith("!")
+        if negated:
+            line = line[1:]
+        elif line.startswith("\\"):
+            line = line[1:]
+
+        directory_only = line.endswith("/")
+        line = line.rstrip("/")
+        if not line:
+            continue
+
+        # A slash anywhere but at the end anchors the pattern to the .gitignore directory
+        anchored = "/" in line
+        line = line.lstrip("/")
+
+        rules.append(IgnoreRule(
+            base=base,
+            regex=re.compile(_translate(line)),
+            negated=negated,
+            directory_only=directory_only,
+            anchored=anchored,
+        ))
+
+    return rules
+
+
+def _translate(pattern: str) -> str:
+    out = []
+    i = 0
+    n = len(pattern)
+
+    while i < n:
+        c = pattern[i]
+        if pattern.startswith("**/", i):
+            out.append("(?:.*/)?")
+            i += 3
+        elif pattern.startswith("/**", i) and i + 3 == n:
+            out.append("/.*")
+            i += 3
+        elif pattern.startswith("**", i):
+            out.append(".*")
+            i += 2
+        elif c == "*":
+            out.append("[^/]*")
+            i += 1
+        elif c == "?":
+            out.append("[^/]")
+            i += 1
+        elif c == "[":
+            end = pattern.find("]", i + 1)
+            if end == -1:
+                out.append(re.escape(c))
+                i += 1
+            else:
+                body = pattern[i + 1:end]
+                if body.startswith("!"):
+                    body = "^" + body[1:]
+                out.append("[" + body.replace("\\", "\\\\") + "]")
+                i = end + 1
+        else:
+            out.append(re.escape(c))
+            i += 1
+
+    return "".join(out)
+
+
+class DirectoryWalker:
+    """
+    Walks a directory tree with os.scandir and prunes ignored directories before
+    descending into them. Ignored are the built-in build output folders plus
+    everything excluded by .gitignore files from the walk root downwards.
+    Without a root, only .gitignore files below the walked path are honored.
+    """
+
+    def __init__(self, root: Optional[Path] = None, ignored_dirs: frozenset = DEFAULT_IGNORED_DIRS):
+        self.root = Path(root) if root else None
+        self.ignored_dirs = ignored_dirs
+
+    def walk(self, base_path: Path, suffix: Union[str, Tuple[str, ...]]) -> Iterator[Path]:
+        """Yields files under base_path ending with suffix (or one of several), in sorted order."""
+        base_path = Path(base_path)
+        if not base_path.is_dir():
+            return
+
+        rel_base, rules = self._rules_for(base_path)
+        for path, is_dir in self._walk(str(base_path), rel_base, rules, suffix):
+            if not is_dir:
+                yield path
+
+    def walk_directories(self, base_path: Path) -> Iterator[Path]:
+        """Yields base_path and every directory below it that is not ignored."""
+        base_path = Path(base_path)
+        if not base_path.is_dir():
+            return
+
+        yield base_path
+        rel_base, rules = self._rules_for(base_path)
+        for path, _ in self._walk(str(base_path), rel_base, rules, None):
+            yield path
+
+    def is_ignored(self, path: Path) -> bool:
+        """Checks a single path, and every directory above it, against the ignore rules."""
+        path = Path(path)
+        base = self.root if self.root and self.root in path.parents else path.parent
+        parts = path.relative_to(base).parts
+
+        rules: List[IgnoreRule] = []
+        rel_dir = ""
+        directory = base
+        for i, part in enumerate(parts):
+            rules = rules + self._load_gitignore(directory / ".gitignore", rel_dir)
+            rel_path = f"{rel_dir}/{part}" if rel_dir else part
+            is_dir = i < len(parts) - 1 or path.is_dir()
+            if (is_dir and part in self.ignored_dirs) or self._is_ignored(rel_path, part, is_dir, rules):
+                return True
+            directory = directory / part
+            rel_dir = rel_path
+
+        return False
+
+    def _walk(
+        self, directory: str, rel_dir: str, rules: List[IgnoreRule], suffix: Optional[Union[str, Tuple[str, ...]]]
+    ) -> Iterator[Tuple[Path, bool]]:
+        """Yields (path, is_dir) pairs; files only when they end with suffix."""
+        try:
+            with os.scandir(directory) as it:
+                entries = sorted(it, key=lambda e: e.name)
+        except OSError as e:
+            logger.debug("Skipping unreadable directory %s: %s", directory, e)
+            return
+
+        if any(entry.name == ".gitignore" and entry.is_file() for entry in entries):
+            rules = rules + self._load_gitignore(Path(directory) / ".gitignore", rel_dir)
+
+        subdirs = []
+        for entry in entries:
+            rel_path = f"{rel_dir}/{entry.name}" if rel_dir else entry.name
+
+            if entry.is_dir(follow_symlinks=False):
+                if entry.name in self.ignored_dirs or self._is_ignored(rel_path, entry.name, True, rules):
+                    continue
+                subdirs.append((entry.path, rel_path))
+            elif suffix is not None and entry.name.endswith(suffix) \
+                    and not self._is_ignored(rel_path, entry.name, False, rules):
+                yield Path(entry.path), False
+
+        for path, rel_path in subdirs:
+            yield Path(path), True
+            yield from self._walk(path, rel_path, rules, suffix)
+
+    def _rules_for(self, base_path: Path) -> Tuple[str, List[IgnoreRule]]:
+        """Collects the .gitignore rules of the walk root and every directory above base_path."""
+        if self.root is None:
+            return "", []
+
+        try:
+            rel_parts = base_path.relative_to(self.root).parts
+        except ValueError:
+            return "", []
+
+        rules = []
+        rel_dir = ""
+        directory = self.root
+        for part in rel_parts:
+            rules += self._load_gitignore(directory / ".gitignore", rel_dir)
+            directory = directory / part
+            rel_dir = f"{rel_dir}/{part}" if rel_dir else part
+
+        return rel_dir, rules
+
+    def _load_gitignore(self, path: Path, rel_dir: str) -> List[IgnoreRule]:
+        try:
+            return parse_gitignore(path.read_text(encoding="utf-8", errors="ignore"), rel_dir)
+        except OSError:
+            return []
+
+    def _is_ignored(self, rel_path: str, name: str, is_dir: bool, rules: List[IgnoreRule]) -> bool:
+        ignored = False
+        for rule in rules:
+            if rule.negated == ignored and rule.matches(rel_path, name, is_dir):
+                ignored = not rule.negated
+        return ignored
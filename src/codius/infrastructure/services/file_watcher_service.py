@@ -0,0 +1,335 @@
+import ctypes
+import ctypes.util
+import errno
+import logging
+import os
+import select
+import struct
+import sys
+import threading
+import time
+from pathlib import Path
+from typing import Dict, List, Optional, Set, Tuple
+
+from codius.infrastructure.services.code_scanner.code_scanner_service import CodeScannerService
+from codius.infrastructure.services.code_scanner.model.building_block import BuildingBlock
+from codius.infrastructure.services.directory_walker import DirectoryWalker
+from codius.infrastructure.services.project_scanner_service import ProjectScannerService
+
+logger = logging.getLogger(__name__)
+
+# Files whose changes can affect the project metadata or the building blocks
+WATCHED_SUFFIXES = (".cs", ".csproj", ".sln", ".json")
+
+# Changes to these invalidate the project metadata, not just single building blocks
+METADATA_SUFFIXES = (".sln", ".csproj")
+
+# Returned by a backend when it lost track of changes and everything must be rescanned
+RESCAN = None
+
+
+class _InotifyBackend:
+    """Watches every non-ignored directory below the source path with Linux inotify."""
+
+    IN_MODIFY = 0x00000002
+    IN_CLOSE_WRITE = 0x00000008
+    IN_MOVED_FROM = 0x00000040
+    IN_MOVED_TO = 0x00000080
+    IN_CREATE = 0x00000100
+    IN_DELETE = 0x00000200
+    IN_DELETE_SELF = 0x00000400
+    IN_MOVE_SELF = 0x00000800
+    IN_Q_OVERFLOW = 0x00004000
+    IN_IGNORED = 0x00008000
+    IN_ISDIR = 0x40000000
+
+    MASK = (
+        IN_MODIFY | IN_CLOSE_WRITE | IN_MOVED_FROM | IN_MOVED_TO |
+        IN_CREATE | IN_DELETE | IN_DELETE_SELF | IN_MOVE_SELF
+    )
+
+    EVENT = struct.Struct("iIII")
+
+    def __init__(self, walker: DirectoryWalker, source_path: Path):
+        if not sys.platform.startswith("linux"):
+            raise OSError(errno.ENOSYS, "inotify is only available on Linux")
+
+        self.walker = walker
+        self._libc = ctypes.CDLL(ctypes.util.find_library("c") or "libc.so.6", use_errno=True)
+        self._fd = self._libc.inotify_init1(os.O_NONBLOCK | os.O_CLOEXEC)
+        if self._fd < 0:
+            err = ctypes.get_errno()
+            raise OSError(err, os.strerror(err))
+
+        self._watches: Dict[int, Path] = {}
+        try:
+            self._watch_tree(source_path)
+        except OSError:
+            self.close()
+            raise
+
+    def poll(self, timeout: float) -> Optional[Set[Path]]:
+        readable, _, _ = select.select([self._fd], [], [], timeout)
+        if not readable:
+            return set()
+
+        try:
+            data = os.read(self._fd, 64 * 1024)
+        except BlockingIOError:
+            return set()
+
+        changed: Set[Path] = set()
+        offset = 0
+        while offset + self.EVENT.size <= len(data):
+            wd, mask, _, length = self.EVENT.unpack_from(data, offset)
+            offset += self.EVENT.size
+            name = data[offset:offset + length].rstrip(b"\0").decode("utf-8", errors="surrogateescape")
+            offset += length
+
+            if mask & self.IN_Q_OVERFLOW:
+                logger.debug("inotify queue overflowed, requesting a full rescan")
+                return RESCAN
+
+            if mask & self.IN_IGNORED:
+                self._watches.pop(wd, None)
+                continue
+
+            directory = self._watches.get(wd)
+            if directory is None:
+                continue
+
+            path = directory / name if name else directory
+            changed.add(path)
+
+            if mask & self.IN_ISDIR and mask & (self.IN_CREATE | self.IN_MOVED_TO):
+                try:
+                    self._watch_tree(path)
+                except OSError as e:
+                    logger.debug("Could not watch new directory %s: %s", path, e)
+                    return RESCAN
+
+        return changed
+
+    def close(self) -> None:
+        if self._fd >= 0:
+            os.close(self._fd)
+            self._fd = -1
+
+    def _watch_tree(self, path: Path) -> None:
+        for directory in self.walker.walk_directories(path):
+            wd = self._libc.inotify_add_watch(self._fd, os.fsencode(str(directory)), self.MASK)
+            if wd < 0:
+                err = ctypes.get_errno()
+                if err == errno.ENOENT:
+                    continue  # Removed while walking; its parent reports the deletion
+                raise OSError(err, f"{os.strerror(err)}: {directory}")
+            self._watches[wd] = directory
+
+
+class _PollingBackend:
+    """Detects changes by comparing (mtime, size) snapshots of the watched files."""
+
+    def __init__(self, walker: DirectoryWalker, source_path: Path, interval: float):
+        self.walker = walker
+        self.source_path = source_path
+        self.interval = interval
+        self._snapshot = self._take_snapshot()
+        self._next_poll = time.monotonic() + interval
+
+    def poll(self, timeout: float) -> Optional[Set[Path]]:
+        remaining = self._next_poll - time.monotonic()
+        if remaining > timeout:
+            time.sleep(timeout)
+            return set()
+        if remaining > 0:
+            time.sleep(remaining)
+
+        snapshot = self._take_snapshot()
+        changed = {
+            path for path in snapshot.keys() | self._snapshot.keys()
+            if snapshot.get(path) != self._snapshot.get(path)
+        }
+        self._snapshot = snapshot
+        self._next_poll = time.monotonic() + self.interval
+        return changed
+
+    def close(self) -> None:
+        pass
+
+    def _take_snapshot(self) -> Dict[Path, Tuple[int, int]]:
+        snapshot = {}
+        for path in self.walker.walk(self.source_path, WATCHED_SUFFIXES):
+            try:
+                stat = path.stat()
+            except OSError:
+                continue
+            snapshot[path] = (stat.st_mtime_ns, stat.st_size)
+        return snapshot
+
+
+class FileWatcherService:
+    """
+    Keeps the project metadata and building blocks up to date in memory while
+    the assistant runs. A background thread watches the source tree (inotify
+    where available, polling otherwise) and feeds changed files into the
+    incremental building block index, so the graph can read the live model
+    instead of scanning the project on every prompt.
+    """
+
+    # Seconds to wait for more events before applying a burst of changes
+    DEBOUNCE = 0.2
+
+    # Seconds between snapshots when inotify is not available
+    POLL_INTERVAL = 2.0
+
+    # Seconds a reader waits for pending changes to be applied before giving up
+    SETTLE_TIMEOUT = 2.0
+
+    def __init__(self, project_scanner_service: ProjectScannerService, code_scanner_service: CodeScannerService):
+        self.project_scanner_service = project_scanner_service
+        self.code_scanner_service = code_scanner_service
+        self.use_inotify = True
+
+        self._lock = threading.Lock()
+        self._stop_event = threading.Event()
+        self._settled = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+        self._metadata: Optional[dict] = None
+        self._building_blocks: Optional[List[BuildingBlock]] = None
+
+    @property
+    def is_running(self) -> bool:
+        return self._thread is not None and self._thread.is_alive()
+
+    def start(self) -> None:
+        if self.is_running:
+            return
+
+        self._stop_event.clear()
+        self._settled.clear()
+        self._thread = threading.Thread(target=self._run, name="codius-file-watcher", daemon=True)
+        self._thread.start()
+
+    def stop(self) -> None:
+        self._stop_event.set()
+        if self._thread is not None:
+            self._thread.join(timeout=5)
+            self._thread = None
+
+        with self._lock:
+            self._metadata = None
+            self._building_blocks = None
+
+    def get_project_metadata(self) -> Optional[dict]:
+        """Returns the live project metadata, or None if it is not available."""
+        if not self._wait_until_settled():
+            return None
+        with self._lock:
+            return dict(self._metadata) if self._metadata is not None else None
+
+    def get_building_blocks(self, project_metadata: dict) -> Optional[List[BuildingBlock]]:
+        """Returns the live building blocks, or None if they were scanned for other metadata."""
+        if not self._wait_until_settled():
+            return None
+        with self._lock:
+            if self._building_blocks is None or self._metadata != project_metadata:
+                return None
+            return list(self._building_blocks)
+
+    def _wait_until_settled(self) -> bool:
+        return self.is_running and self._settled.wait(self.SETTLE_TIMEOUT)
+
+    def _run(self) -> None:
+        # Start watching before the initial scan so no change slips in between
+        walker = DirectoryWalker(self.project_scanner_service.project_root)
+        backend = self._create_backend(walker)
+
+        try:
+            self._rescan()
+
+            while not self._stop_event.is_set():
+                changed = backend.poll(timeout=0.5)
+                if changed == set():
+                    continue
+
+                # Collect the rest of the burst, e.g. an editor's save or a git checkout
+                self._settled.clear()
+                while changed is not RESCAN and not self._stop_event.is_set():
+                    more = backend.poll(timeout=self.DEBOUNCE)
+                    if more == set():
+                        break
+                    changed = RESCAN if more is RESCAN else changed | more
+
+                self._apply(changed)
+        except Exception as e:
+            logger.warning("File watcher stopped: %s", e)
+        finally:
+            backend.close()
+            with self._lock:
+                self._metadata = None
+                self._building_blocks = None
+            self._settled.set()
+
+    def _create_backend(self, walker: DirectoryWalker):
+        source_path = self.project_scanner_service.source_path
+
+        if self.use_inotify:
+            try:
+                backend = _InotifyBackend(walker, source_path)
+                logger.debug("Watching %s with inotify", source_path)
+                return backend
+            except (OSError, AttributeError) as e:
+                logger.debug("inotify not available (%s), falling back to polling", e)
+
+        logger.debug("Polling %s for changes every %.1fs", source_path, self.POLL_INTERVAL)
+        return _PollingBackend(walker, source_path, self.POLL_INTERVAL)
+
+    def _apply(self, changed: Optional[Set[Path]]) -> None:
+        with self._lock:
+            metadata = self._metadata
+
+        if changed is RESCAN or metadata is None or any(self._affects_metadata(p, metadata) for p in changed):
+            self._rescan()
+            return
+
+        logger.debug("Refreshing building blocks for %d changed path(s)", len(changed))
+        try:
+            blocks = self.code_scanner_service.refresh_building_blocks(metadata, changed)
+        except Exception as e:
+            logger.warning("Failed to refresh building blocks: %s", e)
+            blocks = None
+
+        with self._lock:
+            self._building_blocks = blocks
+        self._settled.set()
+
+    def _rescan(self) -> None:
+        logger.debug("Scanning project metadata and building blocks")
+        try:
+            metadata = self.project_scanner_service.extract_project_metadata()
+            blocks = self.code_scanner_service.scan_building_blocks(metadata)
+        except Exception as e:
+            # Readers fall back to scanning themselves, which surfaces the error
+            logger.warning("File watcher could not scan the project: %s", e)
+            metadata, blocks = None, None
+
+        with self._lock:
+            self._metadata = metadata
+            self._building_blocks = blocks
+        self._settled.set()
+
+    def _affects_metadata(self, path: Path, metadata: dict) -> bool:
+        if path.suffix in METADATA_SUFFIXES:
+            return True
+        if path.name.startswith("appsettings") and path.suffix == ".json":
+            return True
+
+        # Creating, moving or deleting a layer folder (or a parent of one) changes the layer paths
+        for layers in [metadata, *metadata.get("contexts", [])]:
+            for key in ("domain_path", "application_path", "infrastructure_path", "interchange_path"):
+                if not layers.get(key):
+                    continue
+                layer_path = Path(layers[key])
+                if path == layer_path or path in layer_path.parents:
+                    return True
+        return False
@@ -17,6 +17,7 @@ from codius.graph.nodes.distill_intent import distill_intent
 from codius.graph.nodes.preview import preview
 from codius.graph.routers.intent_router import route_by_intent
 from codius.domain.model.session.session import Session
+from codius.infrastructure.services.code_scanner.model.building_block import BuildingBlockViews
 from codius.infrastructure.repository.session_repository import SessionRepository
 from codius.infrastructure.services.project_metadata_service import ProjectMetadataService
 
@@ -48,7 +49,7 @@ class GraphService:
             "history": [m.__dict__ for m in session.history.recent()],
             "summary": session.state.summary,
             "project_metadata": session.state.project_metadata,
-            "building_blocks": [bb.__dict__ for bb in session.state.building_blocks],
+            "building_blocks": BuildingBlockViews(session.state.building_blocks),
         }
 
         # Run LangGraph
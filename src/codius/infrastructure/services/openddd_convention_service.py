@@ -1,8 +1,24 @@
-import re
 from pathlib import Path
+from typing import FrozenSet, List, Optional, Tuple
 
+from codius.infrastructure.services import csharp_queries
 from codius.infrastructure.services.tree_sitter_service import TreeSitterService
 
+BOM = "\ufeff".encode("utf-8")
+
+# Replaces source[start:end] with the bytes
+Edit = Tuple[int, int, bytes]
+# A [start, end) byte range
+Range = Tuple[int, int]
+
+# Formatted as a unit, one blank line apart
+MEMBER_KINDS = frozenset({
+    "field_declaration", "property_declaration", "method_declaration", "constructor_declaration",
+    "record_declaration", "enum_declaration",
+})
+# Formatted member by member, when they have a body
+TYPE_KINDS = frozenset({"class_declaration", "struct_declaration", "record_declaration", "interface_declaration"})
+
 
 class OpenDddConventionService:
 
@@ -33,183 +49,285 @@ class OpenDddConventionService:
     def get_namespace_for(self, layer: str, name: str, base: str) -> str:
         return f"{base}.{layer}.{name}"
 
-    def format_class_code(self, code: str) -> str:
-        source = self._strip_bom_if_present(code)
-        source = self._normalize_line_endings(source)
-
-        tree = self.tree_sitter_service.parse_code(source)
-        root = tree.root_node
-
-        # Find the class declaration and its members
-        class_node = self._find_class_node(root)
-        members = self._collect_class_members(class_node)
-
-        # Compute base indent level for formatting
-        class_indent_spaces = self._get_class_indent(class_node, source)
-
-        # Apply individual formatting plan
-        source = self._enforce_member_spacing(source, members)
-
-        # Re-parse after modifying spacing to get fresh offsets
-        tree = self.tree_sitter_service.parse_code(source)
-        root = tree.root_node
-        class_node = self._find_class_node(root)
-        members = self._collect_class_members(class_node)
-
-        source = self._reindent_members(source, members, class_indent_spaces)
-        source = self._enforce_line_breaks_between_sections(source, members)
-        source = self._trim_empty_lines(source, class_node, members)
-        source = self._final_cleanup(source)
+    def normalize_source(self, source: bytes) -> bytes:
+        """Strips the BOM and normalizes line endings, as format_class_source does first."""
+        source = self._strip_bom_if_present(bytes(source))
+        return self._normalize_line_endings(source)
 
+    def format_class_code(self, code: str) -> str:
+        return self.format_class_source(code.encode("utf-8")).decode("utf-8")
+
+    def format_class_source(self, source: bytes, tree=None, ranges: Optional[List[Range]] = None) -> bytes:
+        """
+        Formats the class in UTF-8 source. Tree-sitter offsets are byte offsets,
+        so the source is edited as bytes throughout. Every change is planned from
+        a single parse as a list of edits and applied in one pass. A tree already
+        parsed from source, e.g. kept up to date while it was being modified,
+        saves parsing it at all.
+
+        Given the byte ranges that were changed in source, only the members they
+        touch and the space around those members are formatted; all other bytes
+        are left as they are.
+        """
+        normalized = self.normalize_source(source)
+
+        if tree is None or normalized != source:
+            tree = self.tree_sitter_service.parse_bytes(normalized)
+            # The ranges were taken before normalizing
+            ranges = None if normalized != source else ranges
+        source = normalized
+
+        edits = self._plan_edits(source, tree.root_node, ranges)
+        return self._apply_edits(source, edits)
+
+    def _strip_bom_if_present(self, source: bytes) -> bytes:
+        while source.startswith(BOM):
+            source = source[len(BOM):]
         return source
 
-    def _strip_bom_if_present(self, code: str) -> str:
-        return code.lstrip('\ufeff')
-
-    def _normalize_line_endings(self, code: str) -> str:
-        return code.replace("\r\n", "\n").replace("\r", "\n").rstrip() + "\n"
-
-    def _find_class_node(self, root) -> object:
-        def walk(node):
-            if node.type == "class_declaration":
-                return node
-            for child in node.children:
-                result = walk(child)
-                if result:
-                    return result
-            return None
-
-        return walk(root)
-
-    def _collect_class_members(self, class_node) -> list:
-        members = []
+    def _normalize_line_endings(self, source: bytes) -> bytes:
+        return source.replace(b"\r\n", b"\n").replace(b"\r", b"\n").rstrip() + b"\n"
 
-        def walk(node):
-            if node.type in ("field_declaration", "property_declaration",
-                             "method_declaration", "constructor_declaration"):
-                members.append(node)
-            for child in node.children:
-                walk(child)
+    def _find_type_nodes(self, root) -> list:
+        """Type declarations with a body that are not nested in another, in document order."""
+        types = []
+        for node in self.tree_sitter_service.captures(csharp_queries.TYPE_DECLARATIONS, root).get("type", []):
+            if not types or node.start_byte >= types[-1].end_byte:
+                types.append(node)
+        return types
 
-        walk(class_node)
-        members.sort(key=lambda n: n.start_byte)
-        return members
-
-    def _get_class_indent(self, class_node, source: str) -> int:
-        line_start = source.rfind("\n", 0, class_node.start_byte) + 1
+    def _get_class_indent(self, class_node, source: bytes) -> int:
+        line_start = source.rfind(b"\n", 0, class_node.start_byte) + 1
         return class_node.start_byte - line_start
 
-    def _enforce_member_spacing(self, source: str, members: list) -> str:
-        chunks = []
-        last_end = 0
-
-        for member in members:
-            pre = source[last_end:member.start_byte]
-            pre = re.sub(r'\n{3,}', '\n\n', pre)
-            chunks.append(pre.rstrip() + "\n\n")
-
-            chunks.append(source[member.start_byte:member.end_byte].rstrip())
-            last_end = member.end_byte
-
-        remainder = source[last_end:]
-        remainder = re.sub(r'\n{3,}', '\n\n', remainder)
-        chunks.append(remainder)
-
-        return ''.join(chunks)
-
-    def _enforce_line_breaks_between_sections(self, source: str, members: list) -> str:
-        # TODO: Add logic to detect switch from properties to methods and insert 2 blank lines between sections
-        return source
+    def _plan_edits(self, source: bytes, root, ranges: Optional[List[Range]] = None) -> List[Edit]:
+        """
+        Plans the edits that format every type in the file: one blank line
+        between members, members reindented relative to their type, no blank
+        lines just inside type braces, around the types or doubled anywhere, and
+        no trailing whitespace. The edits are in order and do not overlap.
+        """
+        types = [node for node in self._find_type_nodes(root) if _has_closed_body(source, node)]
+        if not types:
+            return self._clean_lines(source, 0, len(source)) if ranges is None else []
+
+        indents = [self._get_class_indent(type_node, source) for type_node in types]
+        type_lines = frozenset(type_node.start_byte - indent for type_node, indent in zip(types, indents))
+
+        edits = []
+        clean_from = 0
+        for type_node, indent in zip(types, indents):
+            body = type_node.child_by_field_name("body")
+            if ranges is None:
+                edits += self._clean_lines(source, clean_from, body.start_byte + 1, type_lines)
+            edits += self._type_edits(source, type_node, indent, ranges)
+            clean_from = body.end_byte - 1
+
+        if ranges is None:
+            edits += self._clean_lines(source, clean_from, len(source))
+        return edits
+
+    def _type_edits(self, source: bytes, type_node, indent: int, ranges: Optional[List[Range]], nested: bool = False) -> List[Edit]:
+        """Edits for the body of a type at the given indent, and recursively for the types nested in it."""
+        body = type_node.child_by_field_name("body")
+        open_end = body.start_byte + 1
+        close = body.end_byte - 1
+        member_indent = b" " * (indent + 4)
+
+        edits = []
+        if nested and ranges is None:
+            edits += self._reindent_header(source, type_node.start_byte, open_end, b" " * indent)
+
+        last_end = open_end
+        last_touched = False
+        for member in body.named_children:
+            is_type = member.type in TYPE_KINDS and _has_closed_body(source, member)
+            if not is_type and member.type not in MEMBER_KINDS:
+                continue
+
+            touched = ranges is None if is_type else _overlaps(ranges, member.start_byte, member.end_byte)
+            if touched or last_touched or _touches(ranges, last_end, member.start_byte):
+                edits += self._gap_edits(
+                    source, last_end, member.start_byte, member_indent, blank_line=True, after_brace=last_end == open_end
+                )
+            if is_type:
+                edits += self._type_edits(source, member, indent + 4, ranges, nested=True)
+            elif touched:
+                edits += self._reindent_member(source, member, indent)
+            last_end, last_touched = member.end_byte, touched
+
+        # Line the closing brace up with the type, unless the body is just "{}"
+        if last_end != open_end or b"\n" in source[last_end:close]:
+            if last_touched or _touches(ranges, last_end, close):
+                type_indent = b" " * indent if nested else source[type_node.start_byte - indent:type_node.start_byte]
+                edits += self._gap_edits(source, last_end, close, type_indent, after_brace=last_end == open_end)
+        return edits
+
+    def _reindent_header(self, source: bytes, start: int, end: int, indent: bytes) -> List[Edit]:
+        # The lines of a nested type's declaration after its first, down to the opening brace
+        edits = []
+        newline = source.find(b"\n", start, end)
+        while newline != -1:
+            pos = newline + 1
+            content_start = pos + len(source[pos:end]) - len(source[pos:end].lstrip(b" \t"))
+            if source[pos:content_start] != indent:
+                edits.append((pos, content_start, indent))
+            newline = source.find(b"\n", pos, end)
+        return edits
+
+    def _gap_edits(
+        self, source: bytes, start: int, end: int, indent: bytes, blank_line: bool = False, after_brace: bool = False
+    ) -> List[Edit]:
+        """
+        Cleans up what lies between two members, or between a member and a brace
+        of the class, e.g. comments: trailing whitespace and blank lines go, and
+        what follows starts on a new line at the given indent, after a blank
+        line if asked for.
+        """
+        lines = source[start:end].rstrip().split(b"\n")
+        cleaned = [lines[0].rstrip()]
+        # Nothing but comments may follow the opening brace directly
+        previous_blank = after_brace
+        for line in lines[1:]:
+            line = line.rstrip()
+            if line or not previous_blank:
+                cleaned.append(line)
+            previous_blank = not line
+
+        # No blank line between the opening brace and what follows it
+        if after_brace and len(cleaned) == 1:
+            blank_line = False
+
+        replacement = b"\n".join(cleaned) + (b"\n\n" if blank_line else b"\n") + indent
+        if replacement == source[start:end]:
+            return []
+        return [(start, end, replacement)]
+
+    def _reindent_member(self, source: bytes, member, class_indent: int) -> List[Edit]:
+        """
+        Indents the lines of a member one level deeper than the class, and the
+        lines between braces on their own lines one more. The indentation of
+        the first line belongs to the gap before the member.
+        """
+        member_indent = b" " * (class_indent + 4)
+        block_indent = b" " * (class_indent + 8)
+
+        edits = []
+        inside_block = False
+        previous_blank = False
+        pos = member.start_byte
+        end = member.end_byte
+
+        while True:
+            newline = source.find(b"\n", pos, end)
+            line_end = end if newline == -1 else newline
+            line = source[pos:line_end]
+            stripped = line.strip()
 
-    def _reindent_members(self, source: str, members: list, class_indent: int) -> str:
-        out = []
-        last_end = 0
-        for member in members:
-            out.append(source[last_end:member.start_byte])
-            block = source[member.start_byte:member.end_byte]
-            reindented = self._reindent_block(block, class_indent)
-            out.append(reindented)
-            last_end = member.end_byte
-        out.append(source[last_end:])
-        return ''.join(out)
-
-    def _trim_empty_lines(self, source: str, class_node, members: list) -> str:
-        lines = source.splitlines()
-        start_line = class_node.start_point[0]
-        end_line = class_node.end_point[0]
-
-        # Remove blank lines before class declaration
-        while start_line > 0 and lines[start_line - 1].strip() == "":
-            lines.pop(start_line - 1)
-            start_line -= 1
-            end_line -= 1
-
-        # Remove blank lines immediately after opening brace {
-        for i in range(start_line, end_line):
-            if lines[i].strip() == "{":
-                next_line = i + 1
-                while next_line < len(lines) and lines[next_line].strip() == "":
-                    lines.pop(next_line)
-                    end_line -= 1
-                break
+            if not stripped:
+                if previous_blank:
+                    edits.append((pos, line_end + 1, b""))
+                elif line:
+                    edits.append((pos, line_end, b""))
+                previous_blank = True
+            else:
+                if stripped == b"{":
+                    indent = member_indent
+                    inside_block = True
+                elif stripped == b"}":
+                    indent = member_indent
+                    inside_block = False
+                elif inside_block:
+                    indent = block_indent
+                else:
+                    indent = member_indent
+
+                content_start = line_end - len(line.lstrip())
+                content_end = pos + len(line.rstrip())
+                if pos != member.start_byte and source[pos:content_start] != indent:
+                    edits.append((pos, content_start, indent))
+                if content_end != line_end:
+                    edits.append((content_end, line_end, b""))
+                previous_blank = False
+
+            if newline == -1:
+                return edits
+            pos = newline + 1
+
+    def _clean_lines(self, source: bytes, start: int, end: int, type_lines: FrozenSet[int] = frozenset()) -> List[Edit]:
+        """
+        Cleans up the lines outside the type bodies: trailing whitespace goes,
+        blank lines are collapsed and removed inside braces, and exactly one
+        separates the using directives from the namespace and a type from
+        the declaration before it.
+        """
+        edits = []
+        blank_start = None
+        previous = None
+        pos = start
+
+        while pos < end:
+            newline = source.find(b"\n", pos, end)
+            line_end = end if newline == -1 else newline
+            line = source[pos:line_end].rstrip()
+
+            if not line and newline != -1:
+                if blank_start is None:
+                    blank_start = pos
+                pos = newline + 1
+                continue
+
+            if previous is None or previous.endswith(b"{") or line.lstrip().startswith(b"}"):
+                blank_lines = 0
+            elif _is_using(previous) and line.lstrip().startswith(b"namespace"):
+                blank_lines = 1
+            elif pos in type_lines and previous.endswith((b"}", b";")):
+                blank_lines = 1
+            else:
+                blank_lines = 0 if blank_start is None else 1
 
-        # Remove blank lines before closing brace }
-        for i in range(end_line, start_line, -1):
-            if lines[i].strip() == "}":
-                prev_line = i - 1
-                while prev_line > start_line and lines[prev_line].strip() == "":
-                    lines.pop(prev_line)
-                    prev_line -= 1
-                    end_line -= 1
-                break
+            gap_start = pos if blank_start is None else blank_start
+            if source[gap_start:pos] != b"\n" * blank_lines:
+                edits.append((gap_start, pos, b"\n" * blank_lines))
+            if pos + len(line) != line_end:
+                edits.append((pos + len(line), line_end, b""))
 
-        # Remove blank lines after class closing brace
-        for i in range(end_line, len(lines), 1):
-            if lines[i].strip() == "}":
-                next_line = i + 1
-                while next_line < len(lines) and lines[next_line].strip() == "":
-                    lines.pop(next_line)
+            blank_start = None
+            previous = line
+            if newline == -1:
                 break
+            pos = newline + 1
 
-        return "\n".join(lines) + "\n"
+        if blank_start is not None:
+            edits.append((blank_start, end, b""))
+        return edits
 
-    def _reindent_block(self, code: str, class_indent: int) -> str:
-        lines = code.splitlines()
+    def _apply_edits(self, source: bytes, edits: List[Edit]) -> bytes:
+        view = memoryview(source)
+        chunks = []
+        last_end = 0
+        for start, end, replacement in edits:
+            chunks.append(view[last_end:start])
+            chunks.append(replacement)
+            last_end = end
+        chunks.append(view[last_end:])
+        return b"".join(chunks)
 
-        member_indent_str = " " * (class_indent + 4)
-        block_indent_str = " " * (class_indent + 8)
 
-        result = []
-        inside_block = False
+def _has_closed_body(source: bytes, type_node) -> bool:
+    body = type_node.child_by_field_name("body")
+    return body is not None and source[body.end_byte - 1:body.end_byte] == b"}"
 
-        for line in lines:
-            stripped = line.strip()
 
-            if not stripped:
-                result.append("")
-            elif stripped == "{":
-                result.append(member_indent_str + "{")
-                inside_block = True
-            elif stripped == "}":
-                result.append(member_indent_str + "}")
-                inside_block = False
-            elif inside_block:
-                result.append(block_indent_str + stripped)
-            else:
-                result.append(member_indent_str + stripped)
+def _overlaps(ranges: Optional[List[Range]], start: int, end: int) -> bool:
+    return ranges is None or any(range_start < end and start < range_end for range_start, range_end in ranges)
 
-        return "\n".join(result)
 
-    def _final_cleanup(self, source: str) -> str:
-        source = re.sub(r'[ \t]+\n', '\n', source)  # Strip trailing whitespace
-        source = re.sub(r'\n{3,}', '\n\n', source)  # Collapse multiple blank lines
+def _touches(ranges: Optional[List[Range]], start: int, end: int) -> bool:
+    # Also true for ranges that only border on [start, end), e.g. an insertion
+    return ranges is None or any(range_start <= end and start <= range_end for range_start, range_end in ranges)
 
-        # Ensure exactly one blank line between using directives and namespace
-        source = re.sub(
-            r'((?:using [^\n]+;\n)+)\s*(namespace\b)',
-            r'\1\n\2',
-            source,
-            flags=re.MULTILINE
-        )
 
-        return source.rstrip() + "\n"  # Ensure exactly one newline at EOF
+def _is_using(line: bytes) -> bool:
+    line = line.lstrip()
+    return line.startswith(b"using ") and line.endswith(b";")
@@ -18,6 +18,10 @@ class ProjectMetadataService:
         """Returns the full path to the global config.yaml."""
         return self.metadata_root / "config.yaml"
 
+    def get_cache_path(self) -> Path:
+        """Returns the path to the cache directory (.codius/cache)."""
+        return self.metadata_root / "cache"
+
     def get_sessions_path(self) -> Path:
         """Returns the path to the sessions directory (.codius/sessions)."""
         return self.metadata_root / "sessions"
@@ -1,35 +1,99 @@
 import json
+import os
 from pathlib import Path
 import logging
+from typing import Dict, List, Optional, Set, Tuple
 
+from codius.infrastructure.services.directory_walker import DirectoryWalker
 from codius.infrastructure.services.project_metadata_service import ProjectMetadataService
+from codius.infrastructure.services.solution_parser import SolutionParser, SolutionProject
 
 logger = logging.getLogger(__name__)
 
 
 class ProjectScannerService:
+    """
+    Detects the project layout from the solution, project and appsettings files.
+
+    Project locations are read from the .sln file. Only solutions without
+    Project(...) entries fall back to looking for conventionally named folders.
+    Every project with its own domain layer is a bounded context, listed under
+    "contexts"; the top-level layer paths are those of the solution-named
+    context, or of the first one.
+
+    The metadata is cached in .codius/cache together with the mtime and size of
+    every file it was derived from and the listing of the folders those files
+    were found in, and only computed again when one of them changes.
+    """
+
+    CACHE_VERSION = 2
+    CACHE_FILE_NAME = "project_metadata.json"
+
+    CONTEXT_LAYERS = (
+        ("Domain", "domain_path"),
+        ("Application", "application_path"),
+        ("Infrastructure", "infrastructure_path"),
+    )
+
+    APPSETTINGS_PRIORITY = [
+        "appsettings.Development.json",
+        "appsettings.Production.json",
+        "appsettings.json"
+    ]
+
     def __init__(self, project_metadata_service: ProjectMetadataService):
         self.project_root = project_metadata_service.get_project_root().resolve()
         self.source_path = self.project_root / "src"
+        self.cache_path = project_metadata_service.get_cache_path() / self.CACHE_FILE_NAME
+        self._cached: Optional[dict] = None
 
     def extract_project_metadata(self) -> dict:
+        cached = self._cached or self._load_cache()
+        if cached and _is_fresh(cached["files"], cached["folders"]):
+            logger.debug("Project metadata cache hit: %s", self.cache_path)
+            self._cached = cached
+            return dict(cached["metadata"])
+
+        logger.debug("Project metadata cache miss: %s", self.cache_path)
         solution_path = self._find_solution_file()
+        projects = SolutionParser().parse(solution_path)
+        metadata = self._scan_project_metadata(solution_path, projects)
+        files, folders = self._metadata_inputs(solution_path, projects)
+        self._cached = {
+            "version": self.CACHE_VERSION,
+            "metadata": metadata,
+            "files": {str(path): _stat(path) for path in files},
+            "folders": {str(path): _listing(path) for path in folders}
+        }
+        self._save_cache(self._cached)
+        return dict(metadata)
+
+    def _scan_project_metadata(self, solution_path: Path, projects: List[SolutionProject]) -> dict:
         project_name = solution_path.stem
-        root_namespace = project_name
+        contexts = self._detect_contexts(projects)
+
+        context_names = [context["name"] for context in contexts]
+        primary = project_name if project_name in context_names or not contexts else context_names[0]
+        root_namespace = primary
 
         metadata = {
             "project_name": project_name,
             "root_namespace": root_namespace,
             "project_root": str(self.project_root),
             "source_path": str(self.source_path),
-            "domain_path": self._detect_layer_path("Domain"),
-            "application_path": self._detect_layer_path("Application"),
-            "infrastructure_path": self._detect_layer_path("Infrastructure"),
-            "interchange_path": self._detect_layer_path("Interchange"),
-            "tests_path": self._detect_tests_path(project_name),
+            "domain_path": self._detect_layer_path("Domain", primary, projects),
+            "application_path": self._detect_layer_path("Application", primary, projects),
+            "infrastructure_path": self._detect_layer_path("Infrastructure", primary, projects),
+            "interchange_path": self._detect_layer_path("Interchange", primary, projects),
+            "tests_path": self._detect_tests_path(project_name, projects),
         }
 
-        provider_settings = self._detect_provider_settings()
+        metadata["contexts"] = contexts or [{
+            "name": project_name,
+            **{path_key: metadata[path_key] for _, path_key in self.CONTEXT_LAYERS}
+        }]
+
+        provider_settings = self._detect_provider_settings(project_name, projects)
         metadata.update(provider_settings)
 
         return metadata
@@ -40,21 +104,41 @@ class ProjectScannerService:
             raise FileNotFoundError("No .sln file found in src/")
         return slns[0]
 
-    def _detect_tests_path(self, project_name: str) -> str:
+    def _parse_solution(self) -> Tuple[str, List[SolutionProject]]:
+        solution_path = self._find_solution_file()
+        return solution_path.stem, SolutionParser().parse(solution_path)
+
+    def _detect_tests_path(self, project_name: str, projects: Optional[List[SolutionProject]] = None) -> str:
+        if projects:
+            test_projects = [p for p in projects if p.is_test]
+            preferred = [p for p in test_projects if p.name.lower() == f"{project_name}.tests".lower()]
+            if preferred or test_projects:
+                return str((preferred or test_projects)[0].directory)
+
         test_folder = self.source_path / f"{project_name}.Tests"
         if test_folder.exists():
             return str(test_folder)
 
-        # Fallback: look for *.csproj with "test" in name
-        for csproj in self.source_path.rglob("*.csproj"):
-            if "test" in csproj.stem.lower():
-                return str(csproj.parent)
+        if not projects:
+            # Fallback: look for *.csproj with "test" in name
+            for csproj in DirectoryWalker(self.project_root).walk(self.source_path, ".csproj"):
+                if "test" in csproj.stem.lower():
+                    return str(csproj.parent)
 
         return "src/Tests"
 
-    def _detect_layer_path(self, layer: str) -> str:
-        project_name = self._find_solution_file().stem
-        candidate = self.source_path / project_name / layer
+    def _detect_layer_path(
+        self, layer: str, project_name: Optional[str] = None, projects: Optional[List[SolutionProject]] = None
+    ) -> str:
+        if project_name is None:
+            project_name, projects = self._parse_solution()
+
+        # A separate project for the layer, e.g. Orientera.Domain
+        for project in projects or []:
+            if project.name.lower() == f"{project_name}.{layer}".lower() and not project.is_test:
+                return str(project.directory)
+
+        candidate = self._main_project_directory(project_name, projects) / layer
 
         if candidate.is_dir() and not self._is_under_tests(candidate):
             return str(candidate)
@@ -62,32 +146,74 @@ class ProjectScannerService:
         raise FileNotFoundError(
             f"No valid `{layer}` folder found under src/{project_name}/")
 
+    def _detect_contexts(self, projects: List[SolutionProject]) -> List[dict]:
+        """
+        Every project of the solution that has a domain layer, either as a folder
+        (Ordering/Domain) or as a project of its own (Ordering.Domain).
+        """
+        suffixes = tuple(f".{layer}".lower() for layer, _ in self.CONTEXT_LAYERS)
+        candidates = []
+        for project in projects:
+            if project.is_test:
+                continue
+            name = project.name
+            if name.lower().endswith(suffixes):
+                name = name.rsplit(".", 1)[0]
+            if name not in candidates:
+                candidates.append(name)
+
+        contexts = []
+        for name in candidates:
+            paths = {}
+            for layer, path_key in self.CONTEXT_LAYERS:
+                try:
+                    paths[path_key] = self._detect_layer_path(layer, name, projects)
+                except FileNotFoundError:
+                    paths[path_key] = None
+            if paths["domain_path"] is not None:
+                contexts.append({"name": name, **paths})
+
+        return contexts
+
+    def _main_project_directory(self, project_name: str, projects: Optional[List[SolutionProject]]) -> Path:
+        for project in projects or []:
+            if project.name.lower() == project_name.lower():
+                return project.directory
+        return self.source_path / project_name
+
     def _is_under_tests(self, path: Path) -> bool:
         return any(part.lower() in ["tests", "test"] for part in path.parts)
 
-    def _load_appsettings(self) -> dict:
+    def _appsettings_dirs(self, project_name: str, projects: Optional[List[SolutionProject]] = None) -> List[Path]:
+        """Project folders that start with the solution name, excluding test folders."""
+        prefix = project_name.lower()
+        if projects:
+            return [
+                project.directory
+                for project in projects
+                if project.name.lower().startswith(prefix) and not project.is_test and project.directory.is_dir()
+            ]
+
+        return [
+            candidate_dir
+            for candidate_dir in self.source_path.iterdir()
+            if candidate_dir.is_dir()
+            and candidate_dir.name.lower().startswith(prefix)
+            and "test" not in candidate_dir.name.lower()
+        ]
+
+    def _load_appsettings(self, project_name: Optional[str] = None, projects: Optional[List[SolutionProject]] = None) -> dict:
         """
-        Searches all project folders under /src that start with the solution name
+        Searches all projects of the solution that start with the solution name
         (e.g., Orientera, Orientera.API) for appsettings files.
         Excludes test folders.
         """
-        project_name = self._find_solution_file().stem.lower()
-        priority_names = [
-            "appsettings.Development.json",
-            "appsettings.Production.json",
-            "appsettings.json"
-        ]
-
-        for name in priority_names:
-            for candidate_dir in self.source_path.iterdir():
-                dir_name = candidate_dir.name.lower()
-                if not candidate_dir.is_dir():
-                    continue
-                if not dir_name.startswith(project_name):
-                    continue
-                if "test" in dir_name:
-                    continue
+        if project_name is None:
+            project_name, projects = self._parse_solution()
+        candidate_dirs = self._appsettings_dirs(project_name, projects)
 
+        for name in self.APPSETTINGS_PRIORITY:
+            for candidate_dir in candidate_dirs:
                 config_file = candidate_dir / name
                 if config_file.exists():
                     try:
@@ -98,8 +224,10 @@ class ProjectScannerService:
 
         return {}
 
-    def _detect_provider_settings(self) -> dict:
-        config = self._load_appsettings()
+    def _detect_provider_settings(
+        self, project_name: Optional[str] = None, projects: Optional[List[SolutionProject]] = None
+    ) -> dict:
+        config = self._load_appsettings(project_name, projects)
 
         open_ddd_config = config.get("OpenDDD", {})
         persistence = open_ddd_config.get("PersistenceProvider", "OpenDdd")
@@ -109,3 +237,79 @@ class ProjectScannerService:
             "persistence_provider": persistence,
             "database_provider": database
         }
+
+    def _metadata_inputs(self, solution_path: Path, projects: List[SolutionProject]) -> Tuple[List[Path], Set[Path]]:
+        """
+        Every file the metadata is derived from, plus the folders whose listing
+        decides which files those are, so added and removed files are noticed too.
+        """
+        project_name = solution_path.stem
+        files = list(self.source_path.glob("*.sln"))
+        folders = {self.source_path, self._main_project_directory(project_name, projects)}
+
+        for candidate_dir in self._appsettings_dirs(project_name, projects):
+            folders.add(candidate_dir)
+            files += candidate_dir.glob("appsettings*.json")
+
+        if projects:
+            # Projects missing from the solution don't affect the metadata, but
+            # new layer folders in listed projects can add a bounded context
+            files += [project.path for project in projects]
+            folders.update(project.directory for project in projects)
+        else:
+            for csproj in DirectoryWalker(self.project_root).walk(self.source_path, ".csproj"):
+                folders.add(csproj.parent)
+                files.append(csproj)
+
+        return files, folders
+
+    def _load_cache(self) -> Optional[dict]:
+        try:
+            data = json.loads(self.cache_path.read_text(encoding="utf-8"))
+        except FileNotFoundError:
+            return None
+        except (OSError, ValueError) as e:
+            logger.warning("Ignoring unreadable project metadata cache %s: %s", self.cache_path, e)
+            return None
+
+        if data.get("version") != self.CACHE_VERSION or data.get("metadata", {}).get("project_root") != str(self.project_root):
+            return None
+        return data
+
+    def _save_cache(self, data: dict) -> None:
+        try:
+            self.cache_path.parent.mkdir(parents=True, exist_ok=True)
+            tmp_path = self.cache_path.with_suffix(".tmp")
+            tmp_path.write_text(json.dumps(data), encoding="utf-8")
+            os.replace(tmp_path, self.cache_path)
+        except OSError as e:
+            logger.warning("Failed to write project metadata cache %s: %s", self.cache_path, e)
+
+
+def _stat(path: Path) -> Optional[List[int]]:
+    try:
+        stat = os.stat(path)
+    except OSError:
+        return None
+    return [stat.st_mtime_ns, stat.st_size]
+
+
+def _listing(path: Path) -> Optional[List[str]]:
+    """Names of the subfolders and project files in a folder; other source files don't matter."""
+    try:
+        with os.scandir(path) as entries:
+            return sorted(
+                entry.name for entry in entries
+                if entry.name.endswith((".sln", ".csproj"))
+                or entry.name.startswith("appsettings")
+                or entry.is_dir()
+            )
+    except OSError:
+        return None
+
+
+def _is_fresh(files: Dict[str, Optional[List[int]]], folders: Dict[str, Optional[List[str]]]) -> bool:
+    return (
+        all(_stat(Path(path)) == stat for path, stat in files.items())
+        and all(_listing(Path(path)) == listing for path, listing in folders.items())
+    )
@@ -0,0 +1,64 @@
+import logging
+import os
+import re
+from dataclasses import dataclass
+from pathlib import Path, PureWindowsPath
+from typing import List
+
+logger = logging.getLogger(__name__)
+
+# Solution folders are listed as projects too, with their name as path
+SOLUTION_FOLDER_TYPE = "2150E333-8FDC-42A3-9474-1A3956D46DE8"
+
+PROJECT_LINE = re.compile(
+    r'^\s*Project\("\{(?P<type>[^}]*)\}"\)\s*=\s*"(?P<name>[^"]*)"\s*,\s*"(?P<path>[^"]*)"',
+    re.MULTILINE
+)
+
+
+@dataclass(frozen=True)
+class SolutionProject:
+    name: str
+    path: Path
+    type_guid: str
+
+    @property
+    def directory(self) -> Path:
+        return self.path.parent
+
+    @property
+    def is_folder(self) -> bool:
+        return self.type_guid.upper() == SOLUTION_FOLDER_TYPE
+
+    @property
+    def is_test(self) -> bool:
+        return "test" in self.name.lower()
+
+
+class SolutionParser:
+    """
+    Reads the Project(...) entries of a Visual Studio .sln file in a single
+    pass, so project locations are known without walking the source tree.
+    """
+
+    def parse(self, solution_path: Path) -> List[SolutionProject]:
+        """Returns the projects of the solution, excluding solution folders, in file order."""
+        try:
+            content = solution_path.read_text(encoding="utf-8-sig", errors="replace")
+        except OSError as e:
+            logger.warning("Failed to read solution file %s: %s", solution_path, e)
+            return []
+
+        projects = []
+        for match in PROJECT_LINE.finditer(content):
+            project = SolutionProject(
+                name=match.group("name"),
+                # Solutions always use Windows separators, relative to the .sln
+                path=Path(os.path.normpath(solution_path.parent.joinpath(*PureWindowsPath(match.group("path")).parts))),
+                type_guid=match.group("type")
+            )
+            if not project.is_folder:
+                projects.append(project)
+
+        logger.debug("Found %d project(s) in %s", len(projects), solution_path)
+        return projects
@@ -0,0 +1,144 @@
+import logging
+import os
+import threading
+from collections import OrderedDict
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Optional, Union
+
+from codius.domain.model.config.config import Config
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass
+class _CachedFile:
+    mtime_ns: int
+    size: int
+    data: bytes
+    text: Optional[str] = None
+
+    @property
+    def cost(self) -> int:
+        return len(self.data) + (len(self.text) if self.text is not None else 0)
+
+
+class SourceFileCache:
+    """
+    Shared LRU cache of source file contents, so a file read by the scanner
+    is not read again by the flow scanner, the graph nodes or the code
+    generator in the same cycle. Entries are keyed by path and only served
+    while the file's mtime and size are unchanged. Text is decoded once, on
+    first use, and counts towards the byte cap.
+    """
+
+    DEFAULT_MAX_MB = 64
+
+    def __init__(self, config: Optional[Config] = None):
+        max_mb = config.source_cache_mb if config else self.DEFAULT_MAX_MB
+        self.max_bytes = max_mb * 1024 * 1024
+        self.hits = 0
+        self.misses = 0
+
+        self._entries: "OrderedDict[str, _CachedFile]" = OrderedDict()
+        self._size = 0
+        # The file watcher reads through the cache from its own thread
+        self._lock = threading.Lock()
+
+    def read_bytes(self, path: Union[Path, str]) -> bytes:
+        return self._get(path).data
+
+    def peek_bytes(self, path: Union[Path, str]) -> Optional[bytes]:
+        """Returns the contents if they are cached and still fresh, without reading or caching the file."""
+        key = _key(path)
+        entry = self._lookup(key, os.stat(key))
+        return entry.data if entry else None
+
+    def put_bytes(self, path: Union[Path, str], data: bytes, stat: os.stat_result) -> None:
+        """Caches contents read elsewhere, with the stat taken before they were read."""
+        self._insert(_key(path), _CachedFile(mtime_ns=stat.st_mtime_ns, size=stat.st_size, data=data))
+
+    def read_text(self, path: Union[Path, str], errors: str = "strict") -> str:
+        """Decodes as UTF-8 with universal newlines, like Path.read_text(encoding="utf-8")."""
+        entry = self._get(path)
+        if entry.text is not None:
+            return entry.text
+
+        try:
+            text = _decode(entry.data, "strict")
+        except UnicodeDecodeError:
+            if errors == "strict":
+                raise
+            return _decode(entry.data, errors)
+
+        with self._lock:
+            entry.text = text
+            if self._entries.get(_key(path)) is entry:
+                self._size += len(text)
+                self._evict()
+        return text
+
+    def invalidate(self, path: Union[Path, str]) -> None:
+        with self._lock:
+            self._remove(_key(path))
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+            self._size = 0
+
+    @property
+    def size(self) -> int:
+        return self._size
+
+    def _get(self, path: Union[Path, str]) -> _CachedFile:
+        key = _key(path)
+        stat = os.stat(key)
+        entry = self._lookup(key, stat)
+        if entry is not None:
+            return entry
+
+        with open(key, "rb") as f:
+            data = f.read()
+        entry = _CachedFile(mtime_ns=stat.st_mtime_ns, size=stat.st_size, data=data)
+        self._insert(key, entry)
+        return entry
+
+    def _lookup(self, key: str, stat: os.stat_result) -> Optional[_CachedFile]:
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry and entry.mtime_ns == stat.st_mtime_ns and entry.size == stat.st_size:
+                self._entries.move_to_end(key)
+                self.hits += 1
+                return entry
+        return None
+
+    def _insert(self, key: str, entry: _CachedFile) -> None:
+        with self._lock:
+            self.misses += 1
+            self._remove(key)
+            if entry.cost <= self.max_bytes:
+                self._entries[key] = entry
+                self._size += entry.cost
+                self._evict()
+
+    def _remove(self, key: str) -> None:
+        entry = self._entries.pop(key, None)
+        if entry is not None:
+            self._size -= entry.cost
+
+    def _evict(self) -> None:
+        while self._size > self.max_bytes and self._entries:
+            _, entry = self._entries.popitem(last=False)
+            self._size -= entry.cost
+
+
+def _key(path: Union[Path, str]) -> str:
+    return os.path.abspath(path)
+
+
+def _decode(data: bytes, errors: str) -> str:
+    text = data.decode("utf-8", errors=errors)
+    if "\r" in text:
+        text = text.replace("\r\n", "\n").replace("\r", "\n")
+    return text
@@ -1,21 +1,145 @@
+import hashlib
+import logging
+import threading
+from collections import OrderedDict
+from typing import Dict, List, NamedTuple, Optional, Tuple
+
 import tree_sitter_c_sharp as tscs
 
-from tree_sitter import Language, Parser, Tree
+from tree_sitter import Language, Node, Parser, Query, Tree
+
+from codius.domain.model.config.config import Config
+from codius.infrastructure.services import csharp_queries
+
+logger = logging.getLogger(__name__)
+
+
+class ParseCacheInfo(NamedTuple):
+    hits: int
+    misses: int
+    size: int
+    max_size: int
+
+    @property
+    def hit_rate(self) -> float:
+        requests = self.hits + self.misses
+        return self.hits / requests if requests else 0.0
 
 
 class TreeSitterService:
-    def __init__(self):
+    """
+    Parses source code with tree-sitter. Parsers are created once per thread
+    and language, since a Parser must not be shared between threads. Parsed
+    trees are kept in an LRU cache keyed by a hash of the source, so the same
+    code formatted or modified again is not parsed again. Cached trees are
+    shared and must not be edited.
+    """
+
+    DEFAULT_CACHE_SIZE = 64
+
+    def __init__(self, config: Optional[Config] = None):
         # Preload supported languages using their PyPI packages
         self._language_cache = {
             "c_sharp": Language(tscs.language()),
         }
+        self._query_cache: Dict[Tuple[str, str], Query] = {}
+        for query_source in csharp_queries.ALL:
+            self.get_query(query_source)
+
+        self._local = threading.local()
+        self._tree_cache: "OrderedDict[Tuple[str, bytes], Tree]" = OrderedDict()
+        self._tree_cache_size = config.parse_cache_size if config else self.DEFAULT_CACHE_SIZE
+        self._tree_cache_lock = threading.Lock()
+        self._hits = 0
+        self._misses = 0
 
     def parse_code(self, source_code: str, language_name: str = "c_sharp") -> Tree:
-        language = self._get_language(language_name)
-        parser = Parser(language)
-        return parser.parse(source_code.encode("utf-8"))
+        return self.parse_bytes(source_code.encode("utf-8"), language_name)
+
+    def parse_bytes(self, source: bytes, language_name: str = "c_sharp", cache: bool = True) -> Tree:
+        """
+        Returns the parsed tree, from the cache if the same source was parsed
+        before. Pass cache=False for one-off sources that would only evict
+        trees worth keeping.
+        """
+        if not cache or self._tree_cache_size <= 0:
+            return self._get_parser(language_name).parse(source)
+
+        key = (language_name, hashlib.blake2b(source, digest_size=16).digest())
+        with self._tree_cache_lock:
+            tree = self._tree_cache.get(key)
+            if tree is not None:
+                self._tree_cache.move_to_end(key)
+                self._hits += 1
+                return tree
+
+        tree = self._get_parser(language_name).parse(source)
+
+        with self._tree_cache_lock:
+            self._misses += 1
+            self._tree_cache[key] = tree
+            while len(self._tree_cache) > self._tree_cache_size:
+                self._tree_cache.popitem(last=False)
+        return tree
+
+    def reparse(self, tree: Tree, source: bytes, language_name: str = "c_sharp") -> Tree:
+        """
+        Parses the new source of an edited tree (see Tree.edit), reusing the
+        unchanged parts of the tree. The result is not cached.
+        """
+        return self._get_parser(language_name).parse(source, old_tree=tree)
+
+    def cache_info(self) -> ParseCacheInfo:
+        with self._tree_cache_lock:
+            return ParseCacheInfo(self._hits, self._misses, len(self._tree_cache), self._tree_cache_size)
+
+    def log_cache_info(self) -> None:
+        info = self.cache_info()
+        logger.debug(
+            "Parse cache: %d hit(s), %d miss(es), %.0f%% hit rate, %d/%d tree(s)",
+            info.hits, info.misses, info.hit_rate * 100, info.size, info.max_size
+        )
+
+    def get_query(self, query_source: str, language_name: str = "c_sharp") -> Query:
+        """Returns the compiled query, compiling it only the first time it is requested."""
+        key = (language_name, query_source)
+        if key not in self._query_cache:
+            self._query_cache[key] = self._get_language(language_name).query(query_source)
+        return self._query_cache[key]
+
+    def captures(self, query_source: str, node: Node, language_name: str = "c_sharp") -> Dict[str, List[Node]]:
+        """Nodes captured by the query within node, by capture name, in document order."""
+        captures = self.get_query(query_source, language_name).captures(node)
+        # Tree-sitter does not guarantee the order of captures across patterns
+        return {name: sorted(nodes, key=_start) for name, nodes in captures.items()}
+
+    def matches(self, query_source: str, node: Node, language_name: str = "c_sharp") -> List[Dict[str, Node]]:
+        """The captures of each match of the query within node, in document order."""
+        matches = [
+            {name: nodes[0] for name, nodes in captures.items()}
+            for _, captures in self.get_query(query_source, language_name).matches(node)
+        ]
+        return sorted(matches, key=lambda match: min(_start(n) for n in match.values()))
+
+    def find_first(self, query_source: str, node: Node, language_name: str = "c_sharp") -> Optional[Dict[str, Node]]:
+        """The captures of the first match of the query within node, or None."""
+        matches = self.matches(query_source, node, language_name)
+        return matches[0] if matches else None
+
+    def _get_parser(self, language_name: str) -> Parser:
+        parsers = getattr(self._local, "parsers", None)
+        if parsers is None:
+            parsers = self._local.parsers = {}
+        if language_name not in parsers:
+            parsers[language_name] = Parser(self._get_language(language_name))
+        return parsers[language_name]
 
     def _get_language(self, language_name: str) -> Language:
         if language_name not in self._language_cache:
             raise ValueError(f"Unsupported language: {language_name}")
         return self._language_cache[language_name]
+
+
+def _start(node: Node) -> Tuple[int, int]:
+    # Outer nodes first when two start at the same byte
+    return node.start_byte, -node.end_byte
@@ -8,6 +8,7 @@ from codius.di import container
 from codius.domain.model.config.config import Config
 from codius.domain.services.session_service import SessionService
 from codius.infrastructure.repository.session_repository import SessionRepository
+from codius.infrastructure.services.file_watcher_service import FileWatcherService
 from codius.infrastructure.services.graph_service import GraphService
 
 from codius.infrastructure.services.project_metadata_service import ProjectMetadataService
@@ -80,6 +81,18 @@ def run_assistant():
 
     prompt_session = PromptSession(completer=slash_completer, key_bindings=bindings)
 
+    # Keep the domain model up to date between prompts
+    file_watcher_service = container.resolve(FileWatcherService)
+    if container.resolve(Config).watch_files:
+        file_watcher_service.start()
+
+    try:
+        _repl_loop(prompt_session, session_service, session_repository, graph_service)
+    finally:
+        file_watcher_service.stop()
+
+
+def _repl_loop(prompt_session, session_service, session_repository, graph_service):
     console.print()
     while True:
         try:
@@ -1,8 +1,11 @@
 import os
+import time
 from getpass import getpass
 from pathlib import Path
+from typing import Callable, List
 
-from rich.console import Console, Group
+from rich.console import Console, Group, RenderableType
+from rich.live import Live
 from rich.markdown import Markdown
 from rich.panel import Panel
 from rich.prompt import Prompt
@@ -19,6 +22,9 @@ from codius.domain.services.config_service import ConfigService
 from codius.domain.services.session_service import SessionService
 from codius.infrastructure.repository.session_repository import SessionRepository
 from codius.infrastructure.services.code_scanner.code_scanner_service import CodeScannerService
+from codius.infrastructure.services.code_scanner.model.building_block import BuildingBlock
+from codius.infrastructure.services.code_scanner.model.building_block_type import \
+    BuildingBlockType
 from codius.infrastructure.services.project_scanner_service import ProjectScannerService
 from codius.ui.apps.sessions_app import show_sessions_app
 from codius.utils import format_timestamp
@@ -31,6 +37,12 @@ MODEL_CHOICES = {
 
 console = Console()
 
+# Group building blocks by layer, in the order the types are declared
+BUILDING_BLOCK_TYPE_ORDER = {bb_type: idx for idx, bb_type in enumerate(BuildingBlockType)}
+
+# Seconds between re-renders while building blocks are streamed in
+LIVE_REFRESH_INTERVAL = 0.1
+
 # Slash command definitions
 SLASH_COMMANDS = {
     "/clear": "Clear conversation history and free up context",
@@ -208,16 +220,9 @@ def handle_slash_command(command: str):
 
     elif command == "/building-blocks":
         project_scanner_service = container.resolve(ProjectScannerService)
-        code_scanner_service = container.resolve(CodeScannerService)
 
-        # Extract metadata and building blocks
+        # Extract metadata
         project_metadata = project_scanner_service.extract_project_metadata()
-        building_blocks = code_scanner_service.scan_building_blocks(project_metadata)
-
-        # Group building blocks
-        grouped = {}
-        for bb in building_blocks:
-            grouped.setdefault(bb.type, []).append(bb)
 
         # Render project metadata
         console.print(Panel.fit(
@@ -229,18 +234,12 @@ def handle_slash_command(command: str):
             padding=(1, 2),
         ))
 
-        # Render building blocks
-        for bb_type, bbs in grouped.items():
-            bb_list = "\n".join([f"- [cyan]{bb.name}[/cyan] ({bb.namespace})" for bb in bbs])
-            console.print(Panel.fit(
-                bb_list or "[dim]No items found.[/dim]",
-                title=f"[bold magenta]{bb_type.value}s[/bold magenta]",
-                border_style="magenta"
-            ))
+        # Render building blocks, filling in the groups while the scan runs
+        _scan_building_blocks_live(project_metadata, _render_building_block_groups)
 
     elif command == "/flows":
         project_scanner_service = container.resolve(ProjectScannerService)
-        code_scanner = CodeScannerService()
+        code_scanner = container.resolve(CodeScannerService)
 
         # Step 1: Extract metadata and building blocks
         project_metadata = project_scanner_service.extract_project_metadata()
@@ -261,10 +260,9 @@ def handle_slash_command(command: str):
 
     elif command == "/show":
         project_scanner_service = container.resolve(ProjectScannerService)
-        code_scanner_service = container.resolve(CodeScannerService)
 
         metadata = project_scanner_service.extract_project_metadata()
-        building_blocks = code_scanner_service.scan_building_blocks(metadata)
+        building_blocks = _scan_building_blocks_live(metadata, _render_scan_progress, transient=True)
 
         if not building_blocks:
             console.print("[yellow]⚠️ No building blocks found.[/yellow]")
@@ -299,6 +297,54 @@ def handle_slash_command(command: str):
         ))
 
 
+def _scan_building_blocks_live(
+    project_metadata: dict,
+    render: Callable[..., RenderableType],
+    transient: bool = False
+) -> List[BuildingBlock]:
+    """Streams the scan into a Rich Live display and returns the blocks in display order."""
+    code_scanner_service = container.resolve(CodeScannerService)
+    building_blocks = []
+    last_render = 0.0
+
+    with Live(render(building_blocks), console=console, transient=transient) as live:
+        for bb in code_scanner_service.scan_iter(project_metadata):
+            building_blocks.append(bb)
+            now = time.monotonic()
+            if now - last_render >= LIVE_REFRESH_INTERVAL:
+                live.update(render(building_blocks))
+                last_render = now
+
+        building_blocks.sort(key=lambda bb: (BUILDING_BLOCK_TYPE_ORDER[bb.type], bb.name))
+        live.update(render(building_blocks, done=True))
+
+    return building_blocks
+
+
+def _render_building_block_groups(building_blocks: List[BuildingBlock], done: bool = False) -> RenderableType:
+    grouped = {}
+    for bb in sorted(building_blocks, key=lambda bb: (BUILDING_BLOCK_TYPE_ORDER[bb.type], bb.name)):
+        grouped.setdefault(bb.type, []).append(bb)
+
+    panels = []
+    for bb_type, bbs in grouped.items():
+        bb_list = "\n".join([f"- [cyan]{bb.name}[/cyan] ({bb.namespace})" for bb in bbs])
+        panels.append(Panel.fit(
+            bb_list or "[dim]No items found.[/dim]",
+            title=f"[bold magenta]{bb_type.value}s[/bold magenta]",
+            border_style="magenta"
+        ))
+
+    if not done:
+        panels.append(_render_scan_progress(building_blocks))
+
+    return Group(*panels)
+
+
+def _render_scan_progress(building_blocks: List[BuildingBlock], done: bool = False) -> RenderableType:
+    return f"[dim]Scanning building blocks… {len(building_blocks)} found[/dim]"
+
+
 def _find_related_block(name: str, blocks, type_name: str):
     # Try exact match or similar suffix match (e.g., RegisterPersonCommand → RegisterPersonAction)
     for bb in blocks:
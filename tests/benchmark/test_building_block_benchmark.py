@@ -0,0 +1,91 @@
+import gc
+import time
+import tracemalloc
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import List, Optional
+
+from codius.domain.model.session.state import State
+from codius.infrastructure.services.code_scanner.model.building_block import BuildingBlock, \
+    BuildingBlockViews
+from codius.infrastructure.services.code_scanner.model.building_block_type import BuildingBlockType
+
+BLOCKS = 10_000
+NAMESPACES = 50
+
+
+@dataclass
+class LegacyBuildingBlock:
+    """The plain dataclass BuildingBlock used to be, for comparison."""
+    type: BuildingBlockType
+    name: str
+    file_path: Path
+    namespace: Optional[str] = None
+    properties: List[str] = field(default_factory=list)
+    methods: List[str] = field(default_factory=list)
+    project: Optional[str] = None
+
+    def to_dict(self) -> dict:
+        return {
+            "type": self.type.value,
+            "name": self.name,
+            "file_path": str(self.file_path),
+            "namespace": self.namespace,
+            "properties": self.properties or [],
+            "methods": self.methods or [],
+            "project": self.project
+        }
+
+
+def _fields(i: int) -> dict:
+    # Fresh strings, as they come out of the parser, not shared literals
+    return {
+        "type": BuildingBlockType.AGGREGATE_ROOT,
+        "name": f"Aggregate{i}",
+        "file_path": f"/project/src/Bookstore/Domain/Model/Context{i % NAMESPACES}/Aggregate{i}.cs",
+        "namespace": "".join(["Bookstore.Domain.Model.Context", str(i % NAMESPACES)]),
+        "properties": ["".join(["Id"]), "".join(["Name"]), "".join(["CreatedAt"])],
+        "methods": ["".join(["Create"]), "".join(["Rename"])],
+    }
+
+
+def _measure(build):
+    gc.collect()
+    tracemalloc.start()
+    start = time.perf_counter()
+    blocks = build()
+    seconds = time.perf_counter() - start
+    size, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return blocks, size, seconds
+
+
+def test_slotted_blocks_use_less_memory_and_skip_dict_conversion():
+    legacy, legacy_bytes, legacy_build = _measure(lambda: [
+        LegacyBuildingBlock(**{**f, "file_path": Path(f["file_path"])})
+        for f in map(_fields, range(BLOCKS))
+    ])
+    slotted, slotted_bytes, slotted_build = _measure(lambda: [
+        BuildingBlock(**f) for f in map(_fields, range(BLOCKS))
+    ])
+
+    # One graph cycle: blocks go into the graph state and come back out into the session state
+    start = time.perf_counter()
+    State().update_with_graph_result({"building_blocks": [bb.to_dict() for bb in slotted]})
+    dict_cycle = time.perf_counter() - start
+
+    state = State()
+    start = time.perf_counter()
+    state.update_with_graph_result({"building_blocks": BuildingBlockViews(slotted)})
+    view_cycle = time.perf_counter() - start
+
+    print(
+        f"\n{BLOCKS} blocks: dataclass {legacy_bytes / 1024 / 1024:.1f} MiB in {legacy_build * 1000:.0f} ms, "
+        f"slotted {slotted_bytes / 1024 / 1024:.1f} MiB in {slotted_build * 1000:.0f} ms "
+        f"({legacy_bytes / slotted_bytes:.1f}x less memory)\n"
+        f"state round trip: dicts {dict_cycle * 1000:.1f} ms, views {view_cycle * 1000:.2f} ms"
+    )
+
+    assert [bb.to_dict() for bb in slotted] == [bb.to_dict() for bb in legacy]
+    assert state.building_blocks == slotted
+    assert slotted_bytes < legacy_bytes
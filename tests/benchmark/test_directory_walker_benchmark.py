@@ -0,0 +1,47 @@
+import time
+from pathlib import Path
+
+from codius.infrastructure.services.directory_walker import DirectoryWalker
+
+PROJECTS = 10
+SOURCE_FILES = 20
+GENERATED_FILES = 300
+
+
+def _build_tree(root: Path) -> None:
+    for p in range(PROJECTS):
+        project = root / "src" / f"Context{p}"
+        for layer in ("Domain", "Application", "Infrastructure"):
+            layer_dir = project / layer
+            layer_dir.mkdir(parents=True)
+            for i in range(SOURCE_FILES):
+                (layer_dir / f"Type{i}.cs").write_text("public class T {}")
+
+        for output in ("obj/Debug/net8.0/generated", "bin/Debug/net8.0/refs"):
+            output_dir = project / output
+            output_dir.mkdir(parents=True)
+            for i in range(GENERATED_FILES):
+                (output_dir / f"Generated{i}.g.cs").write_text("// <auto-generated/>")
+
+
+def test_walker_prunes_populated_obj_folders_faster_than_rglob(tmp_path):
+    _build_tree(tmp_path)
+    source_path = tmp_path / "src"
+
+    start = time.perf_counter()
+    rglob_files = [p for p in source_path.rglob("*.cs") if not {"bin", "obj"} & set(p.parts)]
+    rglob_seconds = time.perf_counter() - start
+
+    start = time.perf_counter()
+    walker_files = list(DirectoryWalker(tmp_path).walk(source_path, ".cs"))
+    walker_seconds = time.perf_counter() - start
+
+    print(
+        f"\nrglob + filter: {rglob_seconds * 1000:.1f} ms, "
+        f"pruning walker: {walker_seconds * 1000:.1f} ms "
+        f"({rglob_seconds / walker_seconds:.1f}x) for {len(walker_files)} of "
+        f"{len(walker_files) + PROJECTS * 2 * GENERATED_FILES} files"
+    )
+
+    assert sorted(walker_files) == sorted(rglob_files)
+    assert len(walker_files) == PROJECTS * 3 * SOURCE_FILES
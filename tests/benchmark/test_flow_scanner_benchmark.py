@@ -0,0 +1,89 @@
+import re
+import time
+
+from codius.infrastructure.services.code_scanner.model.building_block import BuildingBlock
+from codius.infrastructure.services.code_scanner.model.building_block_type import BuildingBlockType
+from codius.infrastructure.services.code_scanner.scanners.flow_scanner import FlowScanner
+
+CONTROLLERS = 30
+ACTIONS = 300
+ACTIONS_PER_CONTROLLER = 5
+
+
+def _regex_flows(adapters, actions):
+    """The per-action regex loop FlowScanner used before, for comparison."""
+    flows = []
+    for adapter in adapters:
+        content = adapter.file_path.read_text(encoding="utf-8", errors="ignore")
+        for action in actions:
+            if re.search(rf'\b\w*{re.escape(action.name)}\b\s*\.\s*ExecuteAsync\(', content, re.IGNORECASE):
+                flows.append((adapter.name, action.name))
+    return flows
+
+
+def test_identifier_index_finds_same_flows_as_regex_loop(tmp_path):
+    actions = [
+        BuildingBlock(BuildingBlockType.ACTION, f"Operation{i}Action", tmp_path / f"Operation{i}Action.cs")
+        for i in range(ACTIONS)
+    ]
+    adapters = []
+    for c in range(CONTROLLERS):
+        calls = "\n".join(
+            f"    public Task Op{i}() => _operation{i}Action.ExecuteAsync(new Command{i}(), ct);"
+            for i in range(c * ACTIONS_PER_CONTROLLER, (c + 1) * ACTIONS_PER_CONTROLLER)
+        )
+        path = tmp_path / f"Resource{c}Controller.cs"
+        path.write_text(f"public class Resource{c}Controller : ControllerBase\n{{\n{calls}\n}}\n")
+        adapters.append(BuildingBlock(BuildingBlockType.ADAPTER, f"Resource{c}Controller", path))
+
+    start = time.perf_counter()
+    expected = _regex_flows(adapters, actions)
+    regex_seconds = time.perf_counter() - start
+
+    start = time.perf_counter()
+    flows = FlowScanner().scan(adapters + actions)
+    index_seconds = time.perf_counter() - start
+
+    print(
+        f"\n{CONTROLLERS} controllers x {ACTIONS} actions: regex loop {regex_seconds * 1000:.0f} ms, "
+        f"identifier index {index_seconds * 1000:.1f} ms ({regex_seconds / index_seconds:.0f}x)"
+    )
+
+    assert [(flow.source.split(" ")[-1], flow.action.name) for flow in flows] == expected
+    assert len(flows) == CONTROLLERS * ACTIONS_PER_CONTROLLER
+
+
+def test_automaton_finds_same_called_blocks_as_nested_loop(tmp_path):
+    aggregates = [
+        BuildingBlock(BuildingBlockType.AGGREGATE_ROOT, f"Resource{i:04d}Root", tmp_path / f"Resource{i:04d}Root.cs")
+        for i in range(ACTIONS)
+    ]
+    actions = [
+        BuildingBlock(
+            BuildingBlockType.ACTION, f"Operation{i}Action", tmp_path / f"Operation{i}Action.cs",
+            methods=["ExecuteAsync", "Validate", f"LoadResource{i:04d}Root", "Map"]
+        )
+        for i in range(ACTIONS)
+    ]
+    blocks = aggregates + actions
+    valid_types = {BuildingBlockType.AGGREGATE_ROOT, BuildingBlockType.DOMAIN_SERVICE}
+
+    start = time.perf_counter()
+    expected = [
+        next((bb for bb in blocks if bb.type in valid_types
+              and any(bb.name.lower() in m.lower() for m in action.methods)), None)
+        for action in actions
+    ]
+    loop_seconds = time.perf_counter() - start
+
+    scanner = FlowScanner()
+    start = time.perf_counter()
+    found = [scanner._find_called_block(action, blocks, valid_types) for action in actions]
+    automaton_seconds = time.perf_counter() - start
+
+    print(
+        f"\n{ACTIONS} actions x {ACTIONS} aggregates: nested loop {loop_seconds * 1000:.0f} ms, "
+        f"automaton {automaton_seconds * 1000:.1f} ms ({loop_seconds / automaton_seconds:.0f}x)"
+    )
+
+    assert found == expected
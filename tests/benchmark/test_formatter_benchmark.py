@@ -0,0 +1,55 @@
+import gc
+import time
+
+from codius.infrastructure.services.openddd_convention_service import OpenDddConventionService
+from codius.infrastructure.services.tree_sitter_service import TreeSitterService
+
+# Every member spans 8 lines, badly spaced and indented
+LINES_PER_MEMBER = 8
+
+
+def _messy_class(lines: int) -> bytes:
+    members = []
+    for i in range(lines // LINES_PER_MEMBER):
+        members.append(
+            f"   public string Name{i} {{ get; set; }}   \n"
+            f"\n\n\n"
+            f"            public int Count{i}(int value)\n"
+            f"  {{\n"
+            f"      return value + {i};\n"
+            f"        }}"
+        )
+    body = "\n".join(members)
+    return f"using System;\nnamespace Bookstore.Domain\n{{\n    public class Book\n    {{\n\n{body}\n\n    }}\n}}\n".encode()
+
+
+SIZES = (100, 1_000, 5_000, 20_000)
+REPEATS = 3
+
+
+def test_formatting_time_grows_linearly_with_class_size():
+    service = OpenDddConventionService(TreeSitterService())
+    per_line = {}
+
+    for lines in SIZES:
+        source = _messy_class(lines)
+        tree = service.tree_sitter_service.parse_bytes(source, cache=False)
+
+        seconds = []
+        for _ in range(REPEATS):
+            gc.collect()
+            start = time.perf_counter()
+            formatted = service.format_class_source(source, tree=tree)
+            seconds.append(time.perf_counter() - start)
+        per_line[lines] = min(seconds) / lines
+
+        print(f"\nFormatting a {lines}-line class: {min(seconds) * 1000:.1f} ms ({per_line[lines] * 1e6:.2f} µs/line)")
+
+        members = lines // LINES_PER_MEMBER
+        assert formatted.count(b"\n\n        public int Count") == members
+        assert formatted.count(b"\n            return value + ") == members
+        assert b"   \n" not in formatted and b"\n\n\n" not in formatted
+        assert service.format_class_source(formatted) == formatted
+
+    # Quadratic formatting would cost 200x more per line at 20k lines than at 100
+    assert per_line[SIZES[-1]] <= 3 * per_line[SIZES[0]]
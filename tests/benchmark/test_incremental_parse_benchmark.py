@@ -0,0 +1,46 @@
+import time
+
+from codius.infrastructure.services.code_generator.source_buffer import SourceBuffer
+from codius.infrastructure.services.tree_sitter_service import TreeSitterService
+
+METHODS = 2000
+SPLICES = 20
+
+
+def _large_class() -> str:
+    methods = "\n\n".join(
+        f"        public int Method{i}(int value)\n        {{\n            return value + {i};\n        }}"
+        for i in range(METHODS)
+    )
+    return f"namespace Bookstore.Domain\n{{\n    public class Book\n    {{\n{methods}\n    }}\n}}\n"
+
+
+def test_incremental_reparse_is_faster_than_full_reparse():
+    service = TreeSitterService()
+    source = _large_class()
+
+    buffer = SourceBuffer(service, source.encode("utf-8"))
+    data = bytes(buffer.data)
+    full_seconds = 0.0
+    incremental_seconds = 0.0
+
+    for i in range(SPLICES):
+        position = buffer.data.rindex(b"    }\n}")
+        method = f"\n        public int Added{i}() {{ return {i}; }}\n".encode()
+
+        start = time.perf_counter()
+        buffer.splice_all([(position, position, method)])
+        incremental_seconds += time.perf_counter() - start
+
+        data = data[:position] + method + data[position:]
+        start = time.perf_counter()
+        full = service.parse_bytes(data, cache=False)
+        full_seconds += time.perf_counter() - start
+
+    print(
+        f"\n{SPLICES} splices into a {len(data) // 1024} KiB class: full re-parse {full_seconds * 1000:.1f} ms, "
+        f"incremental {incremental_seconds * 1000:.1f} ms ({full_seconds / incremental_seconds:.1f}x)"
+    )
+
+    assert buffer.data == data
+    assert str(buffer.tree.root_node) == str(full.root_node)
@@ -0,0 +1,55 @@
+import time
+
+from codius.infrastructure.services.code_generator.code_generator_service import CodeGeneratorService
+from codius.infrastructure.services.openddd_convention_service import OpenDddConventionService
+from codius.infrastructure.services.tree_sitter_service import TreeSitterService
+
+METHODS = 2000
+STEPS = 20
+
+
+def _large_class() -> str:
+    methods = "\n\n".join(
+        f"        // Berechnet den Preis für Größe {i} – 价格 {i}\n"
+        f"        public decimal Preis{i}(decimal betrag)\n        {{\n            return betrag * {i};\n        }}"
+        for i in range(METHODS)
+    )
+    return f"namespace Bücher.Domain\n{{\n    public class Buch\n    {{\n{methods}\n    }}\n}}\n"
+
+
+def _steps():
+    steps = []
+    for i in range(STEPS):
+        steps.append({
+            "modification": "add_method",
+            "context": {
+                "method": {"name": f"Rabatt{i}", "parameters": [], "returns": "decimal", "body": "return 0m; // Ermäßigung"},
+                "placement": {"type": "after_method", "reference": f"Preis{i * 50}"}
+            }
+        })
+        steps.append({
+            "modification": "add_property",
+            "context": {"property": {"type": "string", "name": f"Schlagwort{i}"}}
+        })
+    return steps
+
+
+def test_modify_large_non_ascii_file(tmp_path):
+    tree_sitter_service = TreeSitterService()
+    generator = CodeGeneratorService(OpenDddConventionService(tree_sitter_service), tree_sitter_service)
+    source = _large_class()
+    (tmp_path / "Buch.cs").write_text(source, encoding="utf-8")
+
+    start = time.perf_counter()
+    result = generator.modify_file("Buch.cs", _steps(), tmp_path, tmp_path, {})
+    seconds = time.perf_counter() - start
+
+    print(f"\n{len(_steps())} steps into a {len(source.encode()) // 1024} KiB non-ASCII class: {seconds * 1000:.1f} ms")
+
+    content = result["content"]
+    assert content.count("– 价格") == METHODS
+    assert content.count("// Ermäßigung") == STEPS
+    for i in range(STEPS):
+        assert f"return betrag * {i * 50};\n        }}\n\n        public decimal Rabatt{i}()" in content
+        assert f"public string Schlagwort{i} {{ get; set; }}" in content
+    assert not tree_sitter_service.parse_code(content).root_node.has_error
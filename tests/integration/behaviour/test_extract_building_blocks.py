@@ -1,3 +1,4 @@
+from collections.abc import Mapping, Sequence
 from pathlib import Path
 
 from codius.graph.nodes.extract_building_blocks import extract_building_blocks
@@ -19,20 +20,20 @@ def test_adds_expected_building_blocks_to_state(bookstore_project_path: Path):
     # Act
     new_state = extract_building_blocks(state)
 
-    # Assert: building_blocks exists and is a list of dicts
+    # Assert: building_blocks exists and is a sequence of mappings
     assert "building_blocks" in new_state, "Expected building_blocks key in state"
     building_blocks = new_state["building_blocks"]
-    assert isinstance(building_blocks, list), "building_blocks should be a list"
+    assert isinstance(building_blocks, Sequence), "building_blocks should be a sequence"
 
     for bb in building_blocks:
-        assert isinstance(bb, dict), "Each building block should be a dict"
+        assert isinstance(bb, Mapping), "Each building block should be a mapping"
         assert set(bb.keys()).issuperset({"type", "name", "file_path", "namespace", "properties", "methods"}), \
             "Each building block must include required fields"
         assert isinstance(bb["type"], str), "type should be a string (enum value)"
         assert isinstance(bb["name"], str), "name should be a string"
         assert isinstance(bb["file_path"], str), "file_path should be a string"
-        assert isinstance(bb["properties"], list), "properties should be a list"
-        assert isinstance(bb["methods"], list), "methods should be a list"
+        assert isinstance(bb["properties"], tuple), "properties should be a tuple"
+        assert isinstance(bb["methods"], tuple), "methods should be a tuple"
 
     # Content checks
     block_types = {bb["type"] for bb in building_blocks}
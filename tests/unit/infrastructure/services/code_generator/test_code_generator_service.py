@@ -0,0 +1,128 @@
+import difflib
+
+from codius.infrastructure.services.code_generator.code_generator_service import CodeGeneratorService
+from codius.infrastructure.services.openddd_convention_service import OpenDddConventionService
+from codius.infrastructure.services.tree_sitter_service import TreeSitterService
+
+INVOICE = """\
+namespace Billing.Domain
+{
+    public class Invoice
+    {
+        public decimal Total { get; set; }
+
+        public void RegisterPayment() {}
+
+        public void Close() {}
+    }
+}
+"""
+
+
+def _add_method(name, reference=None):
+    context = {"method": {"name": name, "parameters": [], "returns": "void", "body": f"// {name}"}}
+    if reference:
+        context["placement"] = {"type": "after_method", "reference": reference}
+    return {"modification": "add_method", "context": context}
+
+
+def _add_property(name):
+    return {"modification": "add_property", "context": {"property": {"type": "string", "name": name}}}
+
+
+def test_modify_file_applies_all_steps_from_one_parse(tmp_path):
+    tree_sitter_service = TreeSitterService()
+    generator = CodeGeneratorService(OpenDddConventionService(tree_sitter_service), tree_sitter_service)
+    (tmp_path / "Invoice.cs").write_text(INVOICE, encoding="utf-8")
+    reparses = []
+    reparse = tree_sitter_service.reparse
+    tree_sitter_service.reparse = lambda tree, source: reparses.append(source) or reparse(tree, source)
+
+    steps = [
+        _add_property("Number"),
+        _add_method("Refund", reference="RegisterPayment"),
+        _add_property("Currency"),
+        _add_method("Remind", reference="RegisterPayment"),
+        _add_method("Cancel", reference="Refund"),
+        _add_method("Archive"),
+    ]
+    result = generator.modify_file("Invoice.cs", steps, tmp_path, tmp_path, {})
+
+    assert len(reparses) == 1
+    assert result["content"] == """\
+namespace Billing.Domain
+{
+    public class Invoice
+    {
+        public string Number { get; set; }
+
+        public string Currency { get; set; }
+
+        public decimal Total { get; set; }
+
+        public void RegisterPayment() {}
+
+        public void Refund()
+        {
+            // Refund
+        }
+
+        public void Cancel()
+        {
+            // Cancel
+        }
+
+        public void Remind()
+        {
+            // Remind
+        }
+
+        public void Close() {}
+
+        public void Archive()
+        {
+            // Archive
+        }
+    }
+}"""
+
+
+def test_modify_file_puts_properties_above_methods_in_a_class_without_methods(tmp_path):
+    tree_sitter_service = TreeSitterService()
+    generator = CodeGeneratorService(OpenDddConventionService(tree_sitter_service), tree_sitter_service)
+    (tmp_path / "Invoice.cs").write_text(
+        "namespace Billing.Domain\n{\n    public class Invoice\n    {\n    }\n}\n", encoding="utf-8"
+    )
+
+    result = generator.modify_file("Invoice.cs", [_add_method("Close"), _add_property("Number")], tmp_path, tmp_path, {})
+
+    assert result["content"] == """\
+namespace Billing.Domain
+{
+    public class Invoice
+    {
+        public string Number { get; set; }
+
+        public void Close()
+        {
+            // Close
+        }
+    }
+}"""
+
+
+def test_modify_file_keeps_the_bom_and_line_endings_of_the_file(tmp_path):
+    tree_sitter_service = TreeSitterService()
+    generator = CodeGeneratorService(OpenDddConventionService(tree_sitter_service), tree_sitter_service)
+    original = ("\ufeff" + INVOICE).replace("\n", "\r\n").encode("utf-8")
+    (tmp_path / "src").mkdir()
+    (tmp_path / "src" / "Invoice.cs").write_bytes(original)
+
+    generator.modify_file("Invoice.cs", [_add_property("Number")], tmp_path / "out", tmp_path / "src", {})
+
+    written = (tmp_path / "out" / "Invoice.cs").read_bytes()
+    diff = difflib.ndiff(original.decode("utf-8").splitlines(True), written.decode("utf-8").splitlines(True))
+    assert [line for line in diff if line[0] in "+-"] == [
+        "+         public string Number { get; set; }\r\n",
+        "+ \r\n",
+    ]
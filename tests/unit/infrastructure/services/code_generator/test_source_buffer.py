@@ -0,0 +1,81 @@
+from codius.infrastructure.services.code_generator.source_buffer import SourceBuffer
+from codius.infrastructure.services.tree_sitter_service import TreeSitterService
+
+SOURCE = """namespace Bookstore.Domain
+{
+    // Café, kept to check byte offsets
+    public class Book
+    {
+        public string Title { get; set; }
+    }
+}
+"""
+
+
+def test_splices_keep_the_tree_in_sync_with_the_source():
+    service = TreeSitterService()
+    buffer = SourceBuffer(service, SOURCE.encode("utf-8"))
+
+    body = buffer.data.index(b"{ get; set; }") + len(b"{ get; set; }")
+    buffer.splice_all([(body, body, b"\n\n        public void Rename(string title) { Title = title; }")])
+    class_start = buffer.data.index(b"public class Book")
+    buffer.splice_all([(class_start, class_start + len(b"public class Book"), b"public sealed class Novel")])
+
+    fresh = service.parse_bytes(buffer.data, cache=False)
+    assert str(buffer.tree.root_node) == str(fresh.root_node)
+    assert not buffer.tree.root_node.has_error
+    assert "Rename" in buffer.text and "Novel" in buffer.text
+
+
+def test_buffer_tree_is_not_shared_with_the_parse_cache():
+    service = TreeSitterService()
+    cached = service.parse_code(SOURCE)
+
+    buffer = SourceBuffer(service, SOURCE.encode("utf-8"))
+    buffer.splice_all([(0, 0, b"using System;\n")])
+
+    assert buffer.tree is not cached
+    assert service.parse_code(SOURCE) is cached
+    assert cached.root_node.start_point == (0, 0)
+    assert cached.root_node.children[0].type == "namespace_declaration"
+
+
+def test_changed_ranges_follow_later_splices():
+    buffer = SourceBuffer(TreeSitterService(), b"class A { int a; int b; int c; }")
+
+    c = buffer.data.index(b"int c;")
+    buffer.splice_all([(c, c, b"int x; ")])
+    a = buffer.data.index(b"int a;")
+    buffer.splice_all([(a, a + len(b"int a;"), b"long a;")])
+    x = buffer.data.index(b"int x;")
+    buffer.splice_all([(x + len(b"int x; "), x + len(b"int x; "), b"int y; ")])
+
+    assert [bytes(buffer.data[start:end]) for start, end in buffer.changed_ranges] == [b"long a;", b"int x; int y; "]
+
+
+def test_splice_all_applies_every_edit_with_one_reparse():
+    service = TreeSitterService()
+    buffer = SourceBuffer(service, SOURCE.encode("utf-8"))
+    reparses = []
+    reparse = service.reparse
+    service.reparse = lambda tree, source: reparses.append(source) or reparse(tree, source)
+
+    title = buffer.data.index(b"public string Title")
+    close = buffer.data.index(b"    }\n}")
+    buffer.splice_all([
+        (title, title, b"public int Pages { get; set; }\n\n        "),
+        (title + len(b"public string"), title + len(b"public string Title"), b" Name"),
+        (close, close, b"        public void Rename(string name) { Name = name; }\n"),
+    ])
+
+    fresh = service.parse_bytes(bytes(buffer.data), cache=False)
+    assert _points(buffer.tree.root_node) == _points(fresh.root_node)
+    assert len(reparses) == 1
+    assert b"public int Pages { get; set; }\n\n        public string Name { get; set; }" in buffer.data
+    assert [bytes(buffer.data[start:end]) for start, end in buffer.changed_ranges][1:] == [
+        b" Name", b"        public void Rename(string name) { Name = name; }\n"
+    ]
+
+
+def _points(node):
+    return [(node.type, node.start_point, node.end_point)] + [p for child in node.children for p in _points(child)]
@@ -0,0 +1,45 @@
+import json
+
+from codius.infrastructure.services.code_generator import template_environment
+from codius.infrastructure.services.code_generator.template_environment import (compile_templates,
+                                                                                get_environment)
+
+TEMPLATE = "domain/model/value_object/value_object.cs.j2"
+CONTEXT = {"namespace": "Bookstore.Domain", "value_object_name": "Money",
+           "properties": [{"type": "decimal", "name": "Amount"}]}
+
+
+def test_environment_is_shared_per_cache_path(tmp_path):
+    assert get_environment(tmp_path / "a") is get_environment(tmp_path / "a")
+    assert get_environment(tmp_path / "a") is not get_environment(tmp_path / "b")
+
+
+def test_compiled_templates_are_kept_in_the_cache_path(tmp_path):
+    cache_path = tmp_path / ".codius" / "cache" / "templates"
+
+    get_environment(cache_path).get_template(TEMPLATE).render(**CONTEXT)
+
+    assert len(list(cache_path.iterdir())) == 1
+
+
+def test_precompiled_templates_render_like_the_sources(tmp_path, monkeypatch):
+    monkeypatch.setattr(template_environment, "PRECOMPILED_PATH", tmp_path)
+    compile_templates(tmp_path)
+
+    environment = template_environment._create_environment(None)
+    template = environment.get_template(TEMPLATE)
+
+    assert template.filename.endswith(".py")
+    assert template.render(**CONTEXT) == get_environment().get_template(TEMPLATE).render(**CONTEXT)
+
+
+def test_out_of_date_precompiled_templates_are_not_used(tmp_path, monkeypatch):
+    monkeypatch.setattr(template_environment, "PRECOMPILED_PATH", tmp_path)
+    compile_templates(tmp_path)
+    stamp = json.loads((tmp_path / "stamp.json").read_text())
+    stamp["codius"] = "0.0.0"
+    (tmp_path / "stamp.json").write_text(json.dumps(stamp))
+
+    template = template_environment._create_environment(None).get_template(TEMPLATE)
+
+    assert template.filename.endswith("value_object.cs.j2")
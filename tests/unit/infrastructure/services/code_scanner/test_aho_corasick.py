@@ -0,0 +1,20 @@
+import random
+
+from codius.infrastructure.services.code_scanner.scanners.aho_corasick import AhoCorasick
+
+
+def test_finds_overlapping_and_nested_patterns():
+    matcher = AhoCorasick(["he", "she", "his", "hers"])
+
+    assert sorted(matcher.matches("ushers")) == [0, 1, 3]
+
+
+def test_matches_agree_with_substring_checks():
+    rng = random.Random(7)
+    for _ in range(500):
+        patterns = ["".join(rng.choice("ab") for _ in range(rng.randint(0, 4))) for _ in range(rng.randint(1, 6))]
+        text = "".join(rng.choice("abc") for _ in range(rng.randint(0, 12)))
+
+        found = set(AhoCorasick(patterns).matches(text))
+
+        assert found == {i for i, pattern in enumerate(patterns) if pattern in text}
@@ -0,0 +1,83 @@
+from pathlib import Path
+
+import pytest
+
+from codius.infrastructure.services.code_scanner.model.building_block_type import BuildingBlockType
+from codius.infrastructure.services.code_scanner.scanners.bb_classifier import BuildingBlockClassifier
+from codius.infrastructure.services.tree_sitter_service import TreeSitterService
+
+
+@pytest.fixture
+def classifier():
+    return BuildingBlockClassifier(TreeSitterService())
+
+
+def test_reads_namespace_and_public_members_of_aggregate(classifier):
+    source = b"""
+namespace Bookstore.Domain.Model
+{
+    public sealed class Book : OpenDDD.Domain.Model.Base.AggregateRootBase<Guid>
+    {
+        public List<string> Authors { get; private set; } = new();
+        public string Title { get; set; }
+        private int Stock { get; set; }
+
+        public static Book Create(string title) => new Book(title);
+
+        public void Rename(string title)
+        {
+            Title = title;
+        }
+
+        private void Restock() { }
+    }
+}
+"""
+    block = classifier.classify(Path("/src/Domain/Book.cs"), "domain", source)
+
+    assert block.type == BuildingBlockType.AGGREGATE_ROOT
+    assert block.name == "Book"
+    assert block.namespace == "Bookstore.Domain.Model"
+    assert block.properties == ("Authors", "Title")
+    assert block.methods == ("Create", "Rename")
+
+
+def test_class_name_must_match_file_name(classifier):
+    source = b"public class Other : AggregateRootBase<Guid> {}"
+
+    assert classifier.classify(Path("/src/Domain/Book.cs"), "domain", source) is None
+
+
+def test_record_value_object_with_file_scoped_namespace(classifier):
+    source = b"""
+namespace Bookstore.Domain.Model;
+
+public record Money(decimal Amount, string Currency) : IValueObject;
+"""
+    block = classifier.classify(Path("/src/Domain/Money.cs"), "domain", source)
+
+    assert block.type == BuildingBlockType.VALUE_OBJECT
+    assert block.namespace == "Bookstore.Domain.Model"
+
+
+def test_interface_members_are_implicitly_public(classifier):
+    source = b"""
+namespace Bookstore.Domain;
+
+public interface IBookRepository : IRepository<Book, Guid>
+{
+    Task<Book?> FindByTitleAsync(string title, CancellationToken ct);
+}
+"""
+    block = classifier.classify(Path("/src/Domain/IBookRepository.cs"), "domain", source)
+
+    assert block.type == BuildingBlockType.REPOSITORY
+    assert block.methods == ("FindByTitleAsync",)
+
+
+def test_text_in_comments_does_not_classify(classifier):
+    source = b"""
+// TODO: should this become an ControllerBase?
+public class Helper {}
+"""
+    assert classifier.classify(Path("/src/Infrastructure/Helper.cs"), "infrastructure", source) is None
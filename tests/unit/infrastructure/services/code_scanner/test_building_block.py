@@ -0,0 +1,61 @@
+import json
+import pickle
+from pathlib import Path
+
+import pytest
+
+from codius.infrastructure.services.code_scanner.model.building_block import BuildingBlock, \
+    BuildingBlockViews
+from codius.infrastructure.services.code_scanner.model.building_block_type import BuildingBlockType
+
+
+def _block(**overrides) -> BuildingBlock:
+    fields = {
+        "type": BuildingBlockType.AGGREGATE_ROOT,
+        "name": "Book",
+        "file_path": Path("/project/src/Bookstore/Domain/Book.cs"),
+        "namespace": "Bookstore.Domain",
+        "properties": ["Title"],
+        "methods": ["Create", "Rename"],
+    }
+    fields.update(overrides)
+    return BuildingBlock(**fields)
+
+
+def test_building_block_is_immutable():
+    block = _block()
+
+    with pytest.raises(AttributeError):
+        block.name = "Author"
+    with pytest.raises(AttributeError):
+        block.extra = 1
+
+    assert block.methods == ("Create", "Rename")
+    assert block.file_path == Path("/project/src/Bookstore/Domain/Book.cs")
+
+
+def test_namespaces_and_member_names_are_interned():
+    first = _block(namespace="".join(["Bookstore.", "Domain"]), methods=["".join(["Cre", "ate"])])
+    second = _block(namespace="".join(["Bookstore.", "Domain"]), methods=["".join(["Cre", "ate"])])
+
+    assert first.namespace is second.namespace
+    assert first.methods[0] is second.methods[0]
+
+
+def test_round_trips_through_dict_and_pickle():
+    block = _block()
+
+    assert BuildingBlock.from_dict(json.loads(json.dumps(block.to_dict()))) == block
+    assert pickle.loads(pickle.dumps(block)) == block
+
+
+def test_dict_views_serve_to_dict_without_copying():
+    blocks = [_block(), _block(type=BuildingBlockType.VALUE_OBJECT, name="Money", methods=None)]
+    views = BuildingBlockViews(blocks)
+
+    assert len(views) == 2
+    assert views[1]["name"] == "Money"
+    assert views[1].get("missing") is None
+    assert {key: (list(value) if isinstance(value, tuple) else value) for key, value in views[0].items()} \
+        == blocks[0].to_dict()
+    assert BuildingBlock.from_dict(views[0]) is blocks[0]
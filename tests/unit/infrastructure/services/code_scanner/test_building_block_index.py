@@ -0,0 +1,94 @@
+import os
+
+import pytest
+
+from codius.infrastructure.services.code_scanner.code_scanner_service import CodeScannerService
+from codius.infrastructure.services.code_scanner.model.building_block_type import BuildingBlockType
+from codius.infrastructure.services.code_scanner.scanners.bb_classifier import BuildingBlockClassifier
+
+METADATA = {
+    "project_name": "Bookstore",
+    "root_namespace": "Bookstore",
+    "project_root": "/project",
+    "source_path": "/project/src",
+    "domain_path": "/project/src/Bookstore/Domain",
+    "application_path": "/project/src/Bookstore/Application",
+    "infrastructure_path": "/project/src/Bookstore/Infrastructure",
+}
+
+
+@pytest.fixture
+def project(fs):
+    fs.create_dir("/project/src/Bookstore/Application")
+    fs.create_dir("/project/src/Bookstore/Infrastructure")
+    fs.create_file("/project/src/Bookstore/Domain/Book.cs", contents="""
+namespace Bookstore.Domain;
+public class Book : AggregateRootBase<Guid>
+{
+    public string Title { get; set; }
+}
+""")
+    fs.create_file("/project/src/Bookstore/Domain/CustomerRegistered.cs", contents="""
+namespace Bookstore.Domain;
+public class CustomerRegistered : IDomainEvent {}
+""")
+    return fs
+
+
+@pytest.fixture
+def classify_calls(monkeypatch):
+    calls = []
+    original = BuildingBlockClassifier.classify
+
+    def spy(self, file_path, layer, content, **kwargs):
+        calls.append(file_path.name)
+        return original(self, file_path, layer, content, **kwargs)
+
+    monkeypatch.setattr(BuildingBlockClassifier, "classify", spy)
+    return calls
+
+
+def test_index_is_persisted_under_codius_dir(project):
+    CodeScannerService().scan_building_blocks(METADATA)
+
+    assert os.path.exists("/project/.codius/index/building_blocks.json")
+
+
+def test_unchanged_files_are_not_classified_again(project, classify_calls):
+    first = CodeScannerService().scan_building_blocks(METADATA)
+    classify_calls.clear()
+
+    # A fresh service has to load the index from disk
+    second = CodeScannerService().scan_building_blocks(METADATA)
+
+    assert classify_calls == []
+    assert [bb.to_dict() for bb in second] == [bb.to_dict() for bb in first]
+
+
+def test_only_changed_and_added_files_are_classified(project, classify_calls):
+    service = CodeScannerService()
+    service.scan_building_blocks(METADATA)
+    classify_calls.clear()
+
+    with open("/project/src/Bookstore/Domain/Book.cs", "a") as f:
+        f.write("// touched\n")
+    project.create_file("/project/src/Bookstore/Domain/Money.cs", contents="""
+namespace Bookstore.Domain;
+public class Money : IValueObject {}
+""")
+
+    result = service.scan_building_blocks(METADATA)
+
+    assert sorted(classify_calls) == ["Book.cs", "Money.cs"]
+    assert {bb.name for bb in result if bb.type == BuildingBlockType.VALUE_OBJECT} == {"Money"}
+
+
+def test_deleted_files_are_removed_from_result(project):
+    service = CodeScannerService()
+    service.scan_building_blocks(METADATA)
+
+    os.remove("/project/src/Bookstore/Domain/CustomerRegistered.cs")
+
+    result = CodeScannerService().scan_building_blocks(METADATA)
+
+    assert {bb.name for bb in result} == {"Book"}
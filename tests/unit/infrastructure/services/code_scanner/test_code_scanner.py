@@ -1,9 +1,16 @@
+import threading
+
 import pytest
 
 from codius.infrastructure.services.code_scanner.code_scanner_service import CodeScannerService
+from codius.infrastructure.services.code_scanner.index.building_block_index import \
+    BuildingBlockIndex
 from codius.infrastructure.services.code_scanner.model.building_block import \
     BuildingBlock
 from codius.infrastructure.services.code_scanner.model.building_block_type import BuildingBlockType
+from codius.infrastructure.services.code_scanner.scanners.bb_scanner import BuildingBlockScanner
+from codius.infrastructure.services.source_file_cache import SourceFileCache
+from codius.infrastructure.services.tree_sitter_service import TreeSitterService
 
 
 @pytest.mark.usefixtures("fs")
@@ -146,3 +153,234 @@ def _assert_block_names(result: list[BuildingBlock], block_type: BuildingBlockTy
 
     assert not missing, f"Missing {block_type.value.lower()}s: {missing}"
     assert not extra, f"Unexpected {block_type.value.lower()}s: {extra}"
+
+
+def test_parallel_scan_returns_same_blocks_as_serial_scan(tmp_path):
+    # --- Arrange ---
+    domain = tmp_path / "src/Bookstore/Domain"
+    application = tmp_path / "src/Bookstore/Application"
+    infrastructure = tmp_path / "src/Bookstore/Infrastructure"
+    for path in (domain, application, infrastructure):
+        path.mkdir(parents=True)
+
+    for i in range(60):
+        (domain / f"Book{i}.cs").write_text(
+            f"namespace Bookstore.Domain;\npublic class Book{i} : AggregateRootBase<Guid>\n{{\n"
+            f"    public string Title {{ get; set; }}\n}}\n"
+        )
+        (application / f"RegisterBook{i}Action.cs").write_text(
+            f"namespace Bookstore.Application;\npublic class RegisterBook{i}Action : IAction<RegisterBook{i}Command, Unit> {{}}\n"
+        )
+        (application / f"Helper{i}.cs").write_text("namespace Bookstore.Application;\npublic static class Helper {}\n")
+
+    metadata = {
+        "domain_path": str(domain),
+        "application_path": str(application),
+        "infrastructure_path": str(infrastructure),
+    }
+
+    # --- Act ---
+    serial = BuildingBlockScanner().scan(metadata)
+    parallel = BuildingBlockScanner(workers=2).scan(metadata)
+
+    # --- Assert ---
+    assert len(serial) == 120
+    assert [bb.to_dict() for bb in parallel] == [bb.to_dict() for bb in serial]
+
+
+def test_prefilter_skips_files_without_marker_tokens(tmp_path):
+    # --- Arrange ---
+    domain = tmp_path / "Domain"
+    domain.mkdir()
+    (tmp_path / "Application").mkdir()
+    (tmp_path / "Infrastructure").mkdir()
+
+    (domain / "Book.cs").write_text("public class Book : AggregateRootBase<Guid> {}")
+    (domain / "BookDto.cs").write_text("public class BookDto { public string Title { get; set; } }")
+    (domain / "Large.cs").write_text("// padding\n" * 4096 + "public class Large : IValueObject {}")
+
+    metadata = {
+        "domain_path": str(domain),
+        "application_path": str(tmp_path / "Application"),
+        "infrastructure_path": str(tmp_path / "Infrastructure"),
+    }
+
+    scanner = BuildingBlockScanner()
+
+    # --- Act ---
+    result = scanner.scan(metadata)
+
+    # --- Assert ---
+    assert {bb.name for bb in result} == {"Book", "Large"}
+    assert scanner.stats.files == 3
+    assert scanner.stats.prefiltered == 1
+    assert scanner.stats.classified == 2
+
+
+def test_only_files_passing_the_prefilter_enter_the_file_cache(tmp_path):
+    # --- Arrange ---
+    domain = tmp_path / "Domain"
+    domain.mkdir()
+    (domain / "Book.cs").write_text("public class Book : AggregateRootBase<Guid> {}")
+    (domain / "BookDto.cs").write_text("public class BookDto { public string Title { get; set; } }")
+
+    file_cache = SourceFileCache()
+    scanner = BuildingBlockScanner(file_cache=file_cache)
+
+    # --- Act ---
+    result = scanner.scan({"domain_path": str(domain)})
+
+    # --- Assert ---
+    assert [bb.name for bb in result] == ["Book"]
+    assert file_cache.peek_bytes(domain / "Book.cs") == b"public class Book : AggregateRootBase<Guid> {}"
+    assert file_cache.peek_bytes(domain / "BookDto.cs") is None
+
+
+def test_scan_iter_yields_cached_blocks_before_classifying(tmp_path):
+    # --- Arrange ---
+    domain = tmp_path / "src" / "Domain"
+    domain.mkdir(parents=True)
+    (tmp_path / "src" / "Application").mkdir()
+    (tmp_path / "src" / "Infrastructure").mkdir()
+
+    (domain / "Book.cs").write_text("public class Book : AggregateRootBase<Guid> {}")
+    (domain / "Money.cs").write_text("public class Money : IValueObject {}")
+
+    metadata = {
+        "project_root": str(tmp_path),
+        "domain_path": str(domain),
+        "application_path": str(tmp_path / "src" / "Application"),
+        "infrastructure_path": str(tmp_path / "src" / "Infrastructure"),
+    }
+
+    service = CodeScannerService()
+    service.scan_building_blocks(metadata)
+    (domain / "Author.cs").write_text("public class Author : EntityBase<Guid> {}")
+
+    # --- Act ---
+    streamed = service.scan_iter(metadata)
+    first, second = next(streamed), next(streamed)
+
+    rest = list(streamed)
+
+    # --- Assert ---
+    assert {first.name, second.name} == {"Book", "Money"}
+    assert [bb.name for bb in rest] == ["Author"]
+    assert service.last_scan_stats.classified == 1
+    assert sorted(bb.name for bb in [first, second] + rest) == \
+        sorted(bb.name for bb in service.scan_building_blocks(metadata))
+
+
+def test_scan_iter_does_not_block_refresh_while_consumer_is_paused(tmp_path):
+    # --- Arrange ---
+    domain = tmp_path / "src" / "Domain"
+    domain.mkdir(parents=True)
+    (domain / "Book.cs").write_text("public class Book : AggregateRootBase<Guid> {}")
+    (domain / "Money.cs").write_text("public class Money : IValueObject {}")
+    metadata = {"project_root": str(tmp_path), "domain_path": str(domain)}
+
+    service = CodeScannerService()
+    service.scan_building_blocks(metadata)
+    streamed = service.scan_iter(metadata)
+    next(streamed)
+
+    # --- Act ---
+    (domain / "Author.cs").write_text("public class Author : EntityBase<Guid> {}")
+    refreshed = []
+    refresh = threading.Thread(
+        target=lambda: refreshed.extend(service.refresh_building_blocks(metadata, [domain / "Author.cs"]))
+    )
+    refresh.start()
+    refresh.join(timeout=10)
+
+    rest = list(streamed)
+
+    # --- Assert ---
+    assert not refresh.is_alive()
+    assert {bb.name for bb in refreshed} == {"Book", "Money", "Author"}
+    assert len(rest) == 1
+    # The finished scan must not prune what the refresh added after it walked the files
+    assert str(domain / "Author.cs") in BuildingBlockIndex(tmp_path / ".codius" / "index").entries
+
+
+def _bounded_contexts(root):
+    contexts = []
+    for name in ("Ordering", "Catalog", "Shipping"):
+        layers = {key: root / "src" / name / folder for key, folder in (
+            ("domain_path", "Domain"), ("application_path", "Application"), ("infrastructure_path", "Infrastructure")
+        )}
+        for path in layers.values():
+            path.mkdir(parents=True)
+        (layers["domain_path"] / f"{name}Root.cs").write_text(
+            f"namespace {name}.Domain;\npublic class {name}Root : AggregateRootBase<Guid> {{}}\n"
+        )
+        (layers["domain_path"] / "Money.cs").write_text(f"namespace {name}.Domain;\npublic class Money : IValueObject {{}}\n")
+        contexts.append({"name": name, **{key: str(path) for key, path in layers.items()}})
+
+    return {
+        "project_name": "Shop",
+        "project_root": str(root),
+        **{key: contexts[0][key] for key in ("domain_path", "application_path", "infrastructure_path")},
+        "contexts": contexts,
+    }
+
+
+@pytest.mark.parametrize("workers", [1, 3])
+def test_every_bounded_context_is_scanned_and_tagged(tmp_path, workers):
+    # --- Arrange ---
+    metadata = _bounded_contexts(tmp_path)
+    service = CodeScannerService()
+    service.workers = workers
+
+    # --- Act ---
+    blocks = service.scan_building_blocks(metadata)
+
+    # --- Assert ---
+    assert [(bb.project, bb.name) for bb in blocks] == [
+        ("Ordering", "OrderingRoot"), ("Ordering", "Money"),
+        ("Catalog", "CatalogRoot"), ("Catalog", "Money"),
+        ("Shipping", "ShippingRoot"), ("Shipping", "Money"),
+    ]
+    assert service.last_scan_stats.classified == 6
+    assert (tmp_path / ".codius/index/building_blocks.json").exists()
+    assert (tmp_path / ".codius/index/contexts/Catalog/building_blocks.json").exists()
+
+    rescanned = service.scan_building_blocks(metadata)
+    assert rescanned == blocks
+    assert service.last_scan_stats.cached == 6
+
+
+def test_scan_can_be_limited_to_one_bounded_context(tmp_path):
+    # --- Arrange ---
+    metadata = _bounded_contexts(tmp_path)
+    service = CodeScannerService()
+    service.scan_building_blocks(metadata)
+    (tmp_path / "src/Catalog/Domain/Product.cs").write_text("public class Product : EntityBase<Guid> {}")
+
+    # --- Act ---
+    blocks = service.scan_building_blocks(metadata, contexts=["Catalog"])
+    refreshed = service.refresh_building_blocks(metadata, [tmp_path / "src/Catalog/Domain/Product.cs"])
+
+    # --- Assert ---
+    assert {(bb.project, bb.name) for bb in blocks} == {("Catalog", "CatalogRoot"), ("Catalog", "Money"), ("Catalog", "Product")}
+    assert len(refreshed) == 7
+
+
+def test_scans_classify_with_the_injected_tree_sitter_service(tmp_path, monkeypatch):
+    # --- Arrange ---
+    domain = tmp_path / "src" / "Domain"
+    domain.mkdir(parents=True)
+    (domain / "Book.cs").write_text("public class Book : AggregateRootBase<Guid> {}")
+    metadata = {"project_root": str(tmp_path), "domain_path": str(domain)}
+
+    service = CodeScannerService(tree_sitter_service=TreeSitterService())
+    monkeypatch.setattr(TreeSitterService, "__init__", lambda *_: pytest.fail("TreeSitterService created per scan"))
+
+    # --- Act ---
+    first = service.scan_building_blocks(metadata)
+    (domain / "Money.cs").write_text("public class Money : IValueObject {}")
+    second = service.scan_building_blocks(metadata)
+
+    # --- Assert ---
+    assert [bb.name for bb in first] == ["Book"]
+    assert sorted(bb.name for bb in second) == ["Book", "Money"]
@@ -0,0 +1,84 @@
+from pathlib import Path
+
+from codius.infrastructure.services.code_scanner.model.building_block import BuildingBlock
+from codius.infrastructure.services.code_scanner.model.building_block_type import BuildingBlockType
+from codius.infrastructure.services.code_scanner.scanners.flow_scanner import FlowScanner
+from codius.infrastructure.services.code_scanner.scanners.identifier_index import IdentifierIndex
+
+
+def _block(bb_type: BuildingBlockType, name: str, path: str = "", methods=()) -> BuildingBlock:
+    return BuildingBlock(type=bb_type, name=name, file_path=Path(path or f"/src/{name}.cs"), methods=methods)
+
+
+def test_member_calls_yield_receivers_of_calls_only():
+    index = IdentifierIndex()
+    index.add_file("A.cs", "_createBook.ExecuteAsync(cmd); _other . executeasync (x); ExecuteAsync(y); a.ExecuteAsync;")
+
+    assert list(index.member_calls("ExecuteAsync")) == [("A.cs", "_createBook"), ("A.cs", "_other")]
+    assert list(index.member_calls("ExecuteAsync", "B.cs")) == []
+
+
+def test_adapter_flows_match_actions_executed_by_the_controller(fs):
+    fs.create_file("/src/BooksController.cs", contents="""
+public class BooksController : ControllerBase
+{
+    public async Task<IActionResult> Create(CreateBookCommand cmd)
+        => Ok(await _createBookAction.ExecuteAsync(cmd, ct));
+
+    public async Task<IActionResult> Rename(RenameBookCommand cmd)
+        => Ok(await _renameBookAction
+            .ExecuteAsync(cmd, ct));
+
+    // GetBookAction is only mentioned, never executed
+}
+""")
+    fs.create_file("/src/Book.cs", contents="await _domainPublisher.PublishAsync(new BookCreated(Id));")
+
+    blocks = [
+        _block(BuildingBlockType.ADAPTER, "BooksController"),
+        _block(BuildingBlockType.ACTION, "RenameBookAction"),
+        _block(BuildingBlockType.ACTION, "CreateBookAction", methods=["BookCreate"]),
+        _block(BuildingBlockType.ACTION, "GetBookAction"),
+        _block(BuildingBlockType.AGGREGATE_ROOT, "Book"),
+    ]
+
+    flows = FlowScanner().scan(blocks)
+
+    assert [flow.action.name for flow in flows] == ["RenameBookAction", "CreateBookAction"]
+    assert flows[1].domain_logic.name == "Book"
+    assert flows[1].events == ["BookCreated"]
+    assert all(flow.source == "(webapi adapter) BooksController" for flow in flows)
+
+
+def _nested_loop_called_block(action, blocks, valid_types):
+    for bb in blocks:
+        if bb.type in valid_types:
+            for method in action.methods:
+                if bb.name.lower() in method.lower():
+                    return bb
+    return None
+
+
+def test_find_called_block_keeps_first_match_semantics():
+    blocks = [
+        _block(BuildingBlockType.DOMAIN_SERVICE, "BookPricing"),
+        _block(BuildingBlockType.VALUE_OBJECT, "Book"),
+        _block(BuildingBlockType.AGGREGATE_ROOT, "Book"),
+        _block(BuildingBlockType.AGGREGATE_ROOT, "Author"),
+        _block(BuildingBlockType.AGGREGATE_ROOT, "Or"),
+    ]
+    valid_types = {BuildingBlockType.AGGREGATE_ROOT, BuildingBlockType.DOMAIN_SERVICE}
+    actions = [
+        _block(BuildingBlockType.ACTION, "A1", methods=["ExecuteAsync", "RenameAuthor"]),
+        _block(BuildingBlockType.ACTION, "A2", methods=["RenameAuthor", "UpdateBookPricing"]),
+        _block(BuildingBlockType.ACTION, "A3", methods=["CreateBOOK"]),
+        _block(BuildingBlockType.ACTION, "A4", methods=["Execute"]),
+        _block(BuildingBlockType.ACTION, "A5"),
+    ]
+
+    scanner = FlowScanner()
+    found = [scanner._find_called_block(action, blocks, valid_types) for action in actions]
+
+    assert found == [_nested_loop_called_block(action, blocks, valid_types) for action in actions]
+    assert [bb.name if bb else None for bb in found] == ["Author", "BookPricing", "Book", None, None]
+    assert found[2].type == BuildingBlockType.AGGREGATE_ROOT
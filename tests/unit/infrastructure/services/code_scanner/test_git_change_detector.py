@@ -0,0 +1,115 @@
+import os
+import shutil
+import subprocess
+
+import pytest
+
+from codius.infrastructure.services.code_scanner.code_scanner_service import CodeScannerService
+from codius.infrastructure.services.code_scanner.index.building_block_index import BuildingBlockIndex
+from codius.infrastructure.services.code_scanner.index.git_change_detector import GitChangeDetector
+
+pytestmark = pytest.mark.skipif(shutil.which("git") is None, reason="git is not installed")
+
+
+def _git(root, *args):
+    subprocess.run(["git", "-C", str(root), *args], check=True, capture_output=True)
+
+
+@pytest.fixture
+def repo(tmp_path):
+    domain = tmp_path / "src" / "Bookstore" / "Domain"
+    domain.mkdir(parents=True)
+    (tmp_path / "src" / "Bookstore" / "Application").mkdir()
+    (tmp_path / "src" / "Bookstore" / "Infrastructure").mkdir()
+    (domain / "Book.cs").write_text("namespace Bookstore.Domain;\npublic class Book : AggregateRootBase<Guid> {}\n")
+    (domain / "Money.cs").write_text("namespace Bookstore.Domain;\npublic class Money : IValueObject {}\n")
+    (tmp_path / ".gitignore").write_text(".codius/\n")
+
+    _git(tmp_path, "init", "-q")
+    _git(tmp_path, "add", ".")
+    _git(tmp_path, "-c", "user.name=test", "-c", "user.email=test@example.com", "commit", "-q", "-m", "init")
+    return tmp_path
+
+
+def _metadata(root):
+    return {
+        "project_root": str(root),
+        "domain_path": str(root / "src" / "Bookstore" / "Domain"),
+        "application_path": str(root / "src" / "Bookstore" / "Application"),
+        "infrastructure_path": str(root / "src" / "Bookstore" / "Infrastructure"),
+    }
+
+
+def test_index_hash_matches_git_blob_hash(repo):
+    book = repo / "src" / "Bookstore" / "Domain" / "Book.cs"
+    hashes = GitChangeDetector(repo).clean_blob_hashes()
+
+    assert hashes[str(book)] == BuildingBlockIndex.hash_content(book.read_bytes())
+
+
+def test_modified_files_are_not_reported_as_clean(repo):
+    book = repo / "src" / "Bookstore" / "Domain" / "Book.cs"
+    with open(book, "a") as f:
+        f.write("// touched\n")
+
+    hashes = GitChangeDetector(repo).clean_blob_hashes()
+
+    assert str(book) not in hashes
+    assert str(repo / "src" / "Bookstore" / "Domain" / "Money.cs") in hashes
+
+
+def test_missing_repo_returns_none(tmp_path):
+    assert GitChangeDetector(tmp_path).clean_blob_hashes() is None
+
+
+def test_scan_trusts_git_hashes_over_mtime(repo):
+    service = CodeScannerService()
+    first = service.scan_building_blocks(_metadata(repo))
+
+    # A checkout or build touching mtimes doesn't change the tracked content
+    for file_path in (repo / "src" / "Bookstore" / "Domain").iterdir():
+        os.utime(file_path, ns=(1, 1))
+
+    second = service.scan_building_blocks(_metadata(repo))
+
+    assert service.last_scan_stats.tracked == 2
+    assert service.last_scan_stats.classified == 0
+    assert [bb.to_dict() for bb in second] == [bb.to_dict() for bb in first]
+
+
+def test_scan_reclassifies_modified_tracked_files(repo):
+    service = CodeScannerService()
+    service.scan_building_blocks(_metadata(repo))
+
+    (repo / "src" / "Bookstore" / "Domain" / "Money.cs").write_text(
+        "namespace Bookstore.Domain;\npublic class Money : EntityBase<Guid> {}\n"
+    )
+    blocks = service.scan_building_blocks(_metadata(repo))
+
+    assert service.last_scan_stats.tracked == 1
+    assert service.last_scan_stats.classified == 1
+    assert {bb.name: bb.type.value for bb in blocks}["Money"] == "Entity"
+
+
+def test_git_is_asked_once_per_scan_of_several_contexts(repo, monkeypatch):
+    shipping = repo / "src" / "Shipping" / "Domain"
+    shipping.mkdir(parents=True)
+    (shipping / "Parcel.cs").write_text("namespace Shipping.Domain;\npublic class Parcel : AggregateRootBase<Guid> {}\n")
+    _git(repo, "add", ".")
+    _git(repo, "-c", "user.name=test", "-c", "user.email=test@example.com", "commit", "-q", "-m", "shipping")
+
+    metadata = _metadata(repo)
+    metadata["contexts"] = [
+        {"name": "Bookstore", **{key: metadata[key] for key in ("domain_path", "application_path", "infrastructure_path")}},
+        {"name": "Shipping", "domain_path": str(shipping), "application_path": None, "infrastructure_path": None},
+    ]
+    calls = []
+    clean_blob_hashes = GitChangeDetector.clean_blob_hashes
+    monkeypatch.setattr(GitChangeDetector, "clean_blob_hashes", lambda self: calls.append(self) or clean_blob_hashes(self))
+
+    service = CodeScannerService()
+    service.scan_building_blocks(metadata)
+    list(service.scan_iter(metadata))
+
+    assert len(calls) == 2
+    assert service.last_scan_stats.tracked == 3
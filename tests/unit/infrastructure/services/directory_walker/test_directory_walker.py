@@ -0,0 +1,78 @@
+from pathlib import Path
+
+from codius.infrastructure.services.directory_walker import DirectoryWalker
+
+
+def _walk(root: str, base: str, suffix: str = ".cs") -> list[str]:
+    return [str(p) for p in DirectoryWalker(Path(root)).walk(Path(base), suffix)]
+
+
+def test_prunes_build_output_folders(fs):
+    fs.create_file("/project/src/App/Domain/Book.cs")
+    fs.create_file("/project/src/App/Domain/bin/Debug/Book.cs")
+    fs.create_file("/project/src/App/Domain/obj/Debug/net8.0/App.AssemblyInfo.cs")
+    fs.create_file("/project/src/App/Domain/node_modules/pkg/index.cs")
+
+    assert _walk("/project", "/project/src/App") == ["/project/src/App/Domain/Book.cs"]
+
+
+def test_honors_gitignore_above_and_below_walked_path(fs):
+    fs.create_file("/project/.gitignore", contents="# generated\n*.g.cs\n/src/App/Legacy/\n")
+    fs.create_file("/project/src/App/.gitignore", contents="Migrations/\n!Keep.g.cs\n")
+    fs.create_file("/project/src/App/Domain/Book.cs")
+    fs.create_file("/project/src/App/Domain/Book.g.cs")
+    fs.create_file("/project/src/App/Domain/Keep.g.cs")
+    fs.create_file("/project/src/App/Legacy/Old.cs")
+    fs.create_file("/project/src/App/Infrastructure/Migrations/0001_Init.cs")
+
+    assert _walk("/project", "/project/src/App/Domain") == [
+        "/project/src/App/Domain/Book.cs",
+        "/project/src/App/Domain/Keep.g.cs",
+    ]
+    assert _walk("/project", "/project/src/App") == [
+        "/project/src/App/Domain/Book.cs",
+        "/project/src/App/Domain/Keep.g.cs",
+    ]
+
+
+def test_anchored_patterns_only_match_relative_to_their_gitignore(fs):
+    fs.create_file("/project/.gitignore", contents="/Generated\ndocs/**/*.cs\n")
+    fs.create_file("/project/Generated/A.cs")
+    fs.create_file("/project/src/Generated/B.cs")
+    fs.create_file("/project/docs/samples/deep/C.cs")
+
+    assert _walk("/project", "/project") == ["/project/src/Generated/B.cs"]
+
+
+def test_walk_without_root_uses_only_local_gitignore(fs):
+    fs.create_file("/project/.gitignore", contents="*.cs\n")
+    fs.create_file("/project/src/Book.cs")
+
+    assert [str(p) for p in DirectoryWalker().walk(Path("/project/src"), ".cs")] == ["/project/src/Book.cs"]
+
+
+def test_missing_base_path_yields_nothing(fs):
+    assert _walk("/project", "/project/src/Missing") == []
+
+
+def test_walk_directories_skips_ignored_folders(fs):
+    fs.create_file("/project/.gitignore", contents="Generated/\n")
+    fs.create_dir("/project/src/App/Domain")
+    fs.create_dir("/project/src/App/bin/Debug")
+    fs.create_dir("/project/src/App/Generated/Models")
+
+    assert [str(p) for p in DirectoryWalker(Path("/project")).walk_directories(Path("/project/src"))] == [
+        "/project/src",
+        "/project/src/App",
+        "/project/src/App/Domain",
+    ]
+
+
+def test_is_ignored_checks_parent_folders(fs):
+    fs.create_file("/project/.gitignore", contents="Generated/\n*.g.cs\n")
+    walker = DirectoryWalker(Path("/project"))
+
+    assert walker.is_ignored(Path("/project/src/App/Generated/Book.cs"))
+    assert walker.is_ignored(Path("/project/src/App/obj/Book.cs"))
+    assert walker.is_ignored(Path("/project/src/App/Book.g.cs"))
+    assert not walker.is_ignored(Path("/project/src/App/Book.cs"))
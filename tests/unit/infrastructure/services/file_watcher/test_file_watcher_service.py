@@ -0,0 +1,80 @@
+import json
+import time
+
+import pytest
+
+from codius.infrastructure.services.code_scanner.code_scanner_service import CodeScannerService
+from codius.infrastructure.services.file_watcher_service import FileWatcherService
+from codius.infrastructure.services.project_metadata_service import ProjectMetadataService
+from codius.infrastructure.services.project_scanner_service import ProjectScannerService
+
+
+@pytest.fixture
+def project(tmp_path):
+    src = tmp_path / "src"
+    (src / "Bookstore" / "Domain").mkdir(parents=True)
+    (src / "Bookstore" / "Application").mkdir()
+    (src / "Bookstore" / "Infrastructure").mkdir()
+    (src / "Bookstore" / "Interchange").mkdir()
+    (src / "Bookstore.sln").write_text("")
+    (src / "Bookstore" / "Domain" / "Book.cs").write_text(
+        "namespace Bookstore.Domain;\npublic class Book : AggregateRootBase<Guid> {}\n"
+    )
+    return tmp_path
+
+
+@pytest.fixture(params=["inotify", "polling"])
+def watcher(request, project):
+    project_scanner = ProjectScannerService(ProjectMetadataService(project))
+    service = FileWatcherService(project_scanner, CodeScannerService())
+    service.use_inotify = request.param == "inotify"
+    service.POLL_INTERVAL = 0.1
+    service.start()
+    yield service
+    service.stop()
+
+
+def _wait_for(condition, timeout: float = 10.0):
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        result = condition()
+        if result:
+            return result
+        time.sleep(0.05)
+    raise AssertionError("Condition not met in time")
+
+
+def _block_names(watcher):
+    metadata = watcher.get_project_metadata()
+    blocks = watcher.get_building_blocks(metadata) if metadata else None
+    return {bb.name for bb in blocks} if blocks is not None else None
+
+
+def test_live_model_follows_added_and_deleted_files(watcher, project):
+    domain = project / "src" / "Bookstore" / "Domain"
+    assert _wait_for(lambda: _block_names(watcher)) == {"Book"}
+
+    (domain / "Money.cs").write_text("namespace Bookstore.Domain;\npublic class Money : IValueObject {}\n")
+    _wait_for(lambda: _block_names(watcher) == {"Book", "Money"})
+
+    (domain / "Book.cs").unlink()
+    _wait_for(lambda: _block_names(watcher) == {"Money"})
+
+
+def test_appsettings_change_refreshes_metadata(watcher, project):
+    _wait_for(lambda: watcher.get_project_metadata())
+
+    (project / "src" / "Bookstore" / "appsettings.json").write_text(
+        json.dumps({"OpenDDD": {"PersistenceProvider": "EfCore"}})
+    )
+
+    _wait_for(lambda: watcher.get_project_metadata()["persistence_provider"] == "EfCore")
+
+
+def test_stopped_watcher_has_no_live_model(watcher):
+    _wait_for(lambda: watcher.get_project_metadata())
+
+    watcher.stop()
+
+    assert watcher.get_project_metadata() is None
+    assert watcher.get_building_blocks({}) is None
@@ -210,3 +210,159 @@ namespace MyApp.Domain.Model
 
     formatted = convention_service.format_class_code(source)
     assert formatted == expected
+
+
+def test_format_class_code_keeps_non_ascii_text_intact(convention_service):
+    source = """\
+namespace Bücher
+{
+    // Größe und Preis – für den Verkauf
+    public class Buch
+    {
+        // Titel, z. B. „Der Zauberberg“
+
+
+        public string Titel { get; set; }
+        public void Umbenennen(string titel) { Titel = titel; } // 改名
+    }
+}"""
+    expected = """\
+namespace Bücher
+{
+    // Größe und Preis – für den Verkauf
+    public class Buch
+    {
+        // Titel, z. B. „Der Zauberberg“
+
+        public string Titel { get; set; }
+
+        public void Umbenennen(string titel) { Titel = titel; } // 改名
+    }
+}
+"""
+    formatted = convention_service.format_class_code(source)
+    assert formatted == expected
+
+
+def test_format_class_code_parses_the_source_once():
+    tree_sitter_service = TreeSitterService()
+    convention_service = OpenDddConventionService(tree_sitter_service)
+
+    convention_service.format_class_code("public class Book\n{\n  public string Title { get; set; }\n}\n")
+
+    assert tree_sitter_service.cache_info().misses == 1
+
+
+def test_format_class_source_puts_members_of_a_one_line_class_on_their_own_lines(convention_service):
+    source = b"public class Book { public string Title { get; set; } public int Pages; }"
+
+    formatted = convention_service.format_class_source(source)
+
+    assert formatted == b"""\
+public class Book {
+    public string Title { get; set; }
+
+    public int Pages;
+}
+"""
+
+
+def test_format_class_source_only_formats_members_in_the_changed_ranges(convention_service):
+    source = b"""\
+public class Invoice
+{
+      public decimal Total { get; set; }
+    public void RegisterPayment()
+    {
+    Pay();
+    }
+    public string  Number { get; set; }
+}
+"""
+    start = source.index(b"public void")
+    end = source.index(b"    public string")
+
+    formatted = convention_service.format_class_source(source, ranges=[(start, end)])
+
+    assert formatted == b"""\
+public class Invoice
+{
+      public decimal Total { get; set; }
+
+    public void RegisterPayment()
+    {
+        Pay();
+    }
+
+    public string  Number { get; set; }
+}
+"""
+
+
+def test_format_class_code_formats_every_type_in_the_file(convention_service):
+    source = """\
+namespace Bookstore.Domain.Model
+{
+    public record Isbn(string Value);
+    public record Money(decimal Amount, string Currency)
+    {
+      public static Money Zero => new Money(0, "EUR");
+        public Money Add(Money other)
+        {
+        return this with { Amount = Amount + other.Amount };
+        }
+    }
+
+
+    public readonly struct Quantity
+    {
+            public int Value { get; }
+        public Quantity(int value) { Value = value; }
+    }
+    public class Book
+    {
+        public Isbn Isbn { get; set; }
+            public class Edition
+          {
+          public int Number { get; set; }
+          public record Printing(int Year);
+        }
+    }
+}"""
+    expected = """\
+namespace Bookstore.Domain.Model
+{
+    public record Isbn(string Value);
+
+    public record Money(decimal Amount, string Currency)
+    {
+        public static Money Zero => new Money(0, "EUR");
+
+        public Money Add(Money other)
+        {
+            return this with { Amount = Amount + other.Amount };
+        }
+    }
+
+    public readonly struct Quantity
+    {
+        public int Value { get; }
+
+        public Quantity(int value) { Value = value; }
+    }
+
+    public class Book
+    {
+        public Isbn Isbn { get; set; }
+
+        public class Edition
+        {
+            public int Number { get; set; }
+
+            public record Printing(int Year);
+        }
+    }
+}
+"""
+    formatted = convention_service.format_class_code(source)
+    assert formatted == expected
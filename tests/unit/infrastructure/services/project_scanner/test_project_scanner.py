@@ -1,3 +1,4 @@
+import logging
 import os
 from pathlib import Path
 
@@ -30,7 +31,8 @@ def test_extract_project_metadata_with_nested_layers(fs):
         'infrastructure_path': 'src/Orientera/Infrastructure',
         'interchange_path': 'src/Orientera/Interchange',
         'project_name': 'Orientera',
-        'root_namespace': 'Orientera'
+        'root_namespace': 'Orientera',
+        'contexts': [{'name': 'Orientera', ...}]
     }
     """
 
@@ -61,6 +63,12 @@ def test_extract_project_metadata_with_nested_layers(fs):
         'root_namespace': 'Orientera',
         'persistence_provider': 'OpenDdd',
         'database_provider': 'Postgres',
+        'contexts': [{
+            'name': 'Orientera',
+            'domain_path': '/project/src/Orientera/Domain',
+            'application_path': '/project/src/Orientera/Application',
+            'infrastructure_path': '/project/src/Orientera/Infrastructure',
+        }],
     }
 
 
@@ -197,3 +205,175 @@ def test_extracts_provider_settings_from_correct_config_file(fs):
 
     assert metadata["persistence_provider"] == "EfCore"
     assert metadata["database_provider"] == "Postgres"
+
+
+def _create_orientera(fs):
+    for layer in ("Domain", "Application", "Infrastructure", "Interchange"):
+        fs.create_dir(f'/project/src/Orientera/{layer}')
+    fs.create_file('/project/src/Orientera.sln')
+    fs.create_file('/project/src/Orientera/Orientera.csproj')
+    fs.create_file('/project/src/Orientera/appsettings.json', contents='{"OpenDDD": {"PersistenceProvider": "EfCore"}}')
+    os.chdir('/project')
+
+
+def _scanner():
+    return ProjectScannerService(ProjectMetadataService(project_path=Path("/project")))
+
+
+def test_metadata_is_cached_in_codius_dir_across_instances(fs, monkeypatch, caplog):
+    _create_orientera(fs)
+    first = _scanner().extract_project_metadata()
+    assert Path('/project/.codius/cache/project_metadata.json').exists()
+
+    scanner = _scanner()
+    monkeypatch.setattr(scanner, "_scan_project_metadata", lambda *_: pytest.fail("metadata was scanned again"))
+    with caplog.at_level(logging.DEBUG, logger="codius.infrastructure.services.project_scanner_service"):
+        assert scanner.extract_project_metadata() == first
+
+    assert "Project metadata cache hit" in caplog.text
+
+
+@pytest.mark.parametrize("change", [
+    lambda fs: fs.create_file('/project/src/Orientera.Api/Orientera.Api.csproj'),
+    lambda fs: Path('/project/src/Orientera/Orientera.csproj').write_text('<Project Sdk="Microsoft.NET.Sdk" />'),
+    lambda fs: Path('/project/src/Orientera/appsettings.json').write_text('{"OpenDDD": {"PersistenceProvider": "OpenDdd"}}'),
+    lambda fs: fs.create_file('/project/src/Orientera/appsettings.Development.json', contents='{}'),
+])
+def test_metadata_cache_is_invalidated_by_project_files(fs, change, caplog):
+    _create_orientera(fs)
+    scanner = _scanner()
+    scanner.extract_project_metadata()
+
+    change(fs)
+    with caplog.at_level(logging.DEBUG, logger="codius.infrastructure.services.project_scanner_service"):
+        scanner.extract_project_metadata()
+
+    assert "Project metadata cache miss" in caplog.text
+
+
+def test_metadata_cache_ignores_source_changes(fs, caplog):
+    _create_orientera(fs)
+    scanner = _scanner()
+    scanner.extract_project_metadata()
+
+    fs.create_file('/project/src/Orientera/Domain/Book.cs', contents='public class Book {}')
+    with caplog.at_level(logging.DEBUG, logger="codius.infrastructure.services.project_scanner_service"):
+        scanner.extract_project_metadata()
+
+    assert "Project metadata cache hit" in caplog.text
+
+
+MULTI_PROJECT_SLN = """﻿
+Microsoft Visual Studio Solution File, Format Version 12.00
+Project("{2150E333-8FDC-42A3-9474-1A3956D46DE8}") = "tests", "tests", "{11111111-1111-1111-1111-111111111111}"
+EndProject
+Project("{9A19103F-16F7-4668-BE54-9A1E7A4F7556}") = "Orientera.Domain", "Core\\Orientera.Domain\\Orientera.Domain.csproj", "{22222222-2222-2222-2222-222222222222}"
+EndProject
+Project("{9A19103F-16F7-4668-BE54-9A1E7A4F7556}") = "Orientera.Application", "Core\\Orientera.Application\\Orientera.Application.csproj", "{33333333-3333-3333-3333-333333333333}"
+EndProject
+Project("{9A19103F-16F7-4668-BE54-9A1E7A4F7556}") = "Orientera.Infrastructure", "Orientera.Infrastructure\\Orientera.Infrastructure.csproj", "{44444444-4444-4444-4444-444444444444}"
+EndProject
+Project("{9A19103F-16F7-4668-BE54-9A1E7A4F7556}") = "Orientera.Interchange", "Orientera.Interchange\\Orientera.Interchange.csproj", "{55555555-5555-5555-5555-555555555555}"
+EndProject
+Project("{9A19103F-16F7-4668-BE54-9A1E7A4F7556}") = "Orientera.Api", "Orientera.Api\\Orientera.Api.csproj", "{66666666-6666-6666-6666-666666666666}"
+EndProject
+Project("{9A19103F-16F7-4668-BE54-9A1E7A4F7556}") = "Orientera.UnitTests", "..\\tests\\Orientera.UnitTests\\Orientera.UnitTests.csproj", "{77777777-7777-7777-7777-777777777777}"
+EndProject
+Global
+EndGlobal
+"""
+
+
+def test_multi_project_solution_paths_come_from_the_sln(fs, monkeypatch):
+    """
+    GIVEN a solution with one project per layer, some of them nested in a Core
+    folder, and a test project outside src/
+
+    EXPECT every path to be the folder of the matching project in the .sln,
+    and appsettings to be read from the API project.
+    """
+    fs.create_file('/project/src/Orientera.sln', contents=MULTI_PROJECT_SLN)
+    for csproj in (
+        'Core/Orientera.Domain/Orientera.Domain.csproj',
+        'Core/Orientera.Application/Orientera.Application.csproj',
+        'Orientera.Infrastructure/Orientera.Infrastructure.csproj',
+        'Orientera.Interchange/Orientera.Interchange.csproj',
+        'Orientera.Api/Orientera.Api.csproj',
+    ):
+        fs.create_file(f'/project/src/{csproj}')
+    fs.create_file('/project/tests/Orientera.UnitTests/Orientera.UnitTests.csproj')
+    fs.create_file('/project/src/Orientera.Api/appsettings.json', contents='{"OpenDDD": {"DatabaseProvider": "SqlServer"}}')
+    os.chdir('/project')
+
+    monkeypatch.setattr(
+        "codius.infrastructure.services.project_scanner_service.DirectoryWalker.walk",
+        lambda *_: pytest.fail("the source tree was walked")
+    )
+    metadata = _scanner().extract_project_metadata()
+
+    assert metadata['domain_path'] == '/project/src/Core/Orientera.Domain'
+    assert metadata['application_path'] == '/project/src/Core/Orientera.Application'
+    assert metadata['infrastructure_path'] == '/project/src/Orientera.Infrastructure'
+    assert metadata['interchange_path'] == '/project/src/Orientera.Interchange'
+    assert metadata['tests_path'] == '/project/tests/Orientera.UnitTests'
+    assert metadata['database_provider'] == 'SqlServer'
+
+
+def test_single_project_solution_uses_layer_folders_of_the_project(fs):
+    fs.create_file('/project/src/Orientera.sln', contents=(
+        'Project("{9A19103F-16F7-4668-BE54-9A1E7A4F7556}") = "Orientera", '
+        '"Orientera\\\\Orientera.csproj", "{22222222-2222-2222-2222-222222222222}"\nEndProject\n'
+        'Project("{9A19103F-16F7-4668-BE54-9A1E7A4F7556}") = "Orientera.Tests", '
+        '"Orientera.Tests\\\\Orientera.Tests.csproj", "{33333333-3333-3333-3333-333333333333}"\nEndProject\n'
+    ))
+    fs.create_file('/project/src/Orientera/Orientera.csproj')
+    fs.create_dir('/project/src/Orientera/Domain')
+    os.chdir('/project')
+
+    scanner = _scanner()
+
+    assert scanner._detect_layer_path("Domain") == '/project/src/Orientera/Domain'
+    project_name, projects = scanner._parse_solution()
+    assert scanner._detect_tests_path(project_name, projects) == '/project/src/Orientera.Tests'
+
+
+def test_every_project_with_a_domain_layer_is_a_bounded_context(fs):
+    """
+    GIVEN a solution named Shop with two bounded contexts, one with layer
+    folders (Ordering) and one split into a project per layer (Catalog)
+
+    EXPECT both contexts, in solution order, and the first one for the
+    top-level paths since there is no Shop context.
+    """
+    fs.create_file('/project/src/Shop.sln', contents=(
+        'Project("{9A19103F-16F7-4668-BE54-9A1E7A4F7556}") = "Ordering", "Ordering\\\\Ordering.csproj", "{1}"\n'
+        'Project("{9A19103F-16F7-4668-BE54-9A1E7A4F7556}") = "Catalog.Domain", "Catalog.Domain\\\\Catalog.Domain.csproj", "{2}"\n'
+        'Project("{9A19103F-16F7-4668-BE54-9A1E7A4F7556}") = "Catalog.Infrastructure", "Catalog.Infrastructure\\\\Catalog.Infrastructure.csproj", "{3}"\n'
+        'Project("{9A19103F-16F7-4668-BE54-9A1E7A4F7556}") = "Shop.Api", "Shop.Api\\\\Shop.Api.csproj", "{4}"\n'
+    ))
+    for layer in ("Domain", "Application", "Infrastructure", "Interchange"):
+        fs.create_dir(f'/project/src/Ordering/{layer}')
+    fs.create_file('/project/src/Ordering/Ordering.csproj')
+    fs.create_file('/project/src/Catalog.Domain/Catalog.Domain.csproj')
+    fs.create_file('/project/src/Catalog.Infrastructure/Catalog.Infrastructure.csproj')
+    fs.create_file('/project/src/Shop.Api/Shop.Api.csproj')
+    os.chdir('/project')
+
+    metadata = _scanner().extract_project_metadata()
+
+    assert metadata['contexts'] == [
+        {
+            'name': 'Ordering',
+            'domain_path': '/project/src/Ordering/Domain',
+            'application_path': '/project/src/Ordering/Application',
+            'infrastructure_path': '/project/src/Ordering/Infrastructure',
+        },
+        {
+            'name': 'Catalog',
+            'domain_path': '/project/src/Catalog.Domain',
+            'application_path': None,
+            'infrastructure_path': '/project/src/Catalog.Infrastructure',
+        },
+    ]
+    assert metadata['domain_path'] == '/project/src/Ordering/Domain'
+    assert metadata['root_namespace'] == 'Ordering'
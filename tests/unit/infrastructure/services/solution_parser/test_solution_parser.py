@@ -0,0 +1,42 @@
+from pathlib import Path
+
+from codius.infrastructure.services.solution_parser import SolutionParser
+
+SLN = """﻿
+Microsoft Visual Studio Solution File, Format Version 12.00
+# Visual Studio Version 17
+Project("{2150E333-8FDC-42A3-9474-1A3956D46DE8}") = "Solution Items", "Solution Items", "{11111111-1111-1111-1111-111111111111}"
+	ProjectSection(SolutionItems) = preProject
+		README.md = README.md
+	EndProjectSection
+EndProject
+Project("{FAE04EC0-301F-11D3-BF4B-00C04F79EFBC}") = "Bookstore", "Bookstore\\Bookstore.csproj", "{22222222-2222-2222-2222-222222222222}"
+EndProject
+Project("{9A19103F-16F7-4668-BE54-9A1E7A4F7556}") = "Bookstore.Tests", "Bookstore.Tests\\Bookstore.Tests.csproj", "{33333333-3333-3333-3333-333333333333}"
+EndProject
+Global
+EndGlobal
+"""
+
+
+def test_parse_returns_projects_and_skips_solution_folders(tmp_path):
+    solution = tmp_path / "Bookstore.sln"
+    solution.write_text(SLN, encoding="utf-8")
+
+    projects = SolutionParser().parse(solution)
+
+    assert [p.name for p in projects] == ["Bookstore", "Bookstore.Tests"]
+    assert projects[0].path == tmp_path / "Bookstore" / "Bookstore.csproj"
+    assert projects[0].directory == tmp_path / "Bookstore"
+    assert [p.is_test for p in projects] == [False, True]
+
+
+def test_parse_handles_crlf_line_endings(tmp_path):
+    solution = tmp_path / "Bookstore.sln"
+    solution.write_bytes(SLN.replace("\n", "\r\n").encode("utf-8"))
+
+    assert len(SolutionParser().parse(solution)) == 2
+
+
+def test_parse_of_missing_solution_returns_no_projects(tmp_path):
+    assert SolutionParser().parse(Path(tmp_path / "Missing.sln")) == []
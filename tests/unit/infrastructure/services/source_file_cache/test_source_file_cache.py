@@ -0,0 +1,96 @@
+import os
+
+import pytest
+
+from codius.domain.model.config.config import Config
+from codius.infrastructure.adapter.llm.llm_config import LlmConfig
+from codius.domain.model.config.llm_provider import LlmProvider
+from codius.infrastructure.services.source_file_cache import SourceFileCache
+
+
+def _config(source_cache_mb):
+    return Config(llm=LlmConfig(provider=LlmProvider.OLLAMA), source_cache_mb=source_cache_mb)
+
+
+def _touch(path, mtime_ns):
+    os.utime(path, ns=(mtime_ns, mtime_ns))
+
+
+def test_read_text_is_served_from_cache_until_the_file_changes(tmp_path):
+    path = tmp_path / "Book.cs"
+    path.write_text("public class Book {}")
+    cache = SourceFileCache()
+
+    assert cache.read_text(path) == "public class Book {}"
+    assert cache.read_text(path) == "public class Book {}"
+    assert (cache.hits, cache.misses) == (1, 1)
+
+    path.write_text("public class Book { }")
+    assert cache.read_text(path) == "public class Book { }"
+    assert cache.misses == 2
+
+
+def test_same_size_rewrite_is_detected_by_mtime(tmp_path):
+    path = tmp_path / "Book.cs"
+    path.write_text("class A")
+    _touch(path, 1_000_000_000)
+    cache = SourceFileCache()
+    cache.read_text(path)
+
+    path.write_text("class B")
+    _touch(path, 2_000_000_000)
+
+    assert cache.read_text(path) == "class B"
+
+
+def test_least_recently_used_files_are_evicted_beyond_the_byte_cap(tmp_path):
+    cache = SourceFileCache(_config(1))
+    paths = []
+    for name in ("A", "B", "C"):
+        path = tmp_path / f"{name}.cs"
+        path.write_bytes(b"x" * 400 * 1024)
+        paths.append(path)
+
+    cache.read_bytes(paths[0])
+    cache.read_bytes(paths[1])
+    cache.read_bytes(paths[0])
+    cache.read_bytes(paths[2])
+
+    assert cache.size <= cache.max_bytes
+    cache.read_bytes(paths[0])
+    assert cache.hits == 2
+    cache.read_bytes(paths[1])
+    assert cache.misses == 4
+
+
+def test_zero_cap_disables_caching(tmp_path):
+    path = tmp_path / "Book.cs"
+    path.write_text("public class Book {}")
+    cache = SourceFileCache(_config(0))
+
+    cache.read_text(path)
+    cache.read_text(path)
+
+    assert (cache.hits, cache.size) == (0, 0)
+
+
+def test_read_text_uses_utf8_and_universal_newlines(tmp_path):
+    path = tmp_path / "Café.cs"
+    path.write_bytes("// café\r\nclass Café {}\r".encode("utf-8"))
+
+    assert SourceFileCache().read_text(path) == "// café\nclass Café {}\n"
+
+
+def test_invalid_utf8_raises_unless_errors_are_ignored(tmp_path):
+    path = tmp_path / "Legacy.cs"
+    path.write_bytes(b"class Legacy {} // \xff")
+    cache = SourceFileCache()
+
+    with pytest.raises(UnicodeDecodeError):
+        cache.read_text(path)
+    assert cache.read_text(path, errors="ignore") == "class Legacy {} // "
+
+
+def test_missing_file_raises_file_not_found(tmp_path):
+    with pytest.raises(FileNotFoundError):
+        SourceFileCache().read_text(tmp_path / "Missing.cs")
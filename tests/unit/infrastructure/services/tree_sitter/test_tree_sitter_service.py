@@ -0,0 +1,88 @@
+import threading
+
+from codius.domain.model.config.config import Config
+from codius.domain.model.config.llm_provider import LlmProvider
+from codius.infrastructure.adapter.llm.llm_config import LlmConfig
+from codius.infrastructure.services import csharp_queries
+from codius.infrastructure.services.tree_sitter_service import TreeSitterService
+
+BOOK = "public class Book { public string Title { get; set; } }"
+
+
+def _service(parse_cache_size):
+    return TreeSitterService(Config(llm=LlmConfig(provider=LlmProvider.OLLAMA), parse_cache_size=parse_cache_size))
+
+
+def test_unchanged_source_is_not_parsed_again():
+    service = TreeSitterService()
+
+    first = service.parse_code(BOOK)
+    second = service.parse_code(BOOK)
+    service.parse_code(BOOK + "\n")
+
+    assert second is first
+    info = service.cache_info()
+    assert (info.hits, info.misses) == (1, 2)
+    assert info.hit_rate == 1 / 3
+
+
+def test_least_recently_used_trees_are_evicted():
+    service = _service(2)
+    a = service.parse_code("class A {}")
+    service.parse_code("class B {}")
+    service.parse_code("class A {}")
+    service.parse_code("class C {}")
+
+    assert service.parse_code("class A {}") is a
+    assert service.cache_info().size == 2
+    service.parse_code("class B {}")
+    assert service.cache_info().misses == 4
+
+
+def test_zero_size_and_uncached_parses_skip_the_cache():
+    disabled = _service(0)
+    assert disabled.parse_code(BOOK) is not disabled.parse_code(BOOK)
+    assert disabled.cache_info().hits == 0
+
+    service = TreeSitterService()
+    service.parse_bytes(BOOK.encode(), cache=False)
+    assert service.cache_info() == (0, 0, 0, TreeSitterService.DEFAULT_CACHE_SIZE)
+
+
+def test_parsers_are_reused_per_thread():
+    service = TreeSitterService()
+    parsers = []
+
+    def parse_twice():
+        service.parse_bytes(b"class A {}", cache=False)
+        parsers.append(service._get_parser("c_sharp"))
+        assert service._get_parser("c_sharp") is parsers[-1]
+
+    threads = [threading.Thread(target=parse_twice) for _ in range(2)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert len(parsers) == 2 and parsers[0] is not parsers[1]
+
+
+def test_queries_find_the_outer_class_and_nested_types_in_document_order():
+    service = TreeSitterService()
+    source = b"public class Order { public Money Total() { return null; } class Line { int Qty; } public Order() {} }"
+    root = service.parse_bytes(source).root_node
+
+    match = service.find_first(csharp_queries.CLASS_DECLARATIONS, root)
+    types = service.captures(csharp_queries.TYPE_DECLARATIONS, root)["type"]
+    names = service.captures(csharp_queries.METHOD_NAMES, match["body"])["name"]
+
+    assert source[match["class"].start_byte:].startswith(b"public class Order")
+    assert [source[node.start_byte:node.start_byte + 12] for node in types] == [b"public class", b"class Line {"]
+    assert [source[name.start_byte:name.end_byte] for name in names] == [b"Total"]
+
+
+def test_find_first_returns_none_without_a_match():
+    service = TreeSitterService()
+    root = service.parse_code("public interface IOrder {}").root_node
+
+    assert service.find_first(csharp_queries.CLASS_DECLARATIONS, root) is None
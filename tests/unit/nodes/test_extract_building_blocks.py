@@ -0,0 +1,46 @@
+from codius.graph.nodes.extract_building_blocks import _changed_context, extract_building_blocks
+from codius.infrastructure.services.code_scanner.model.building_block import BuildingBlock
+from codius.infrastructure.services.code_scanner.model.building_block_type import BuildingBlockType
+
+LAYERS = ("Domain", "Application", "Infrastructure")
+
+METADATA = {
+    "contexts": [
+        {"name": name, **{f"{layer.lower()}_path": f"/src/{name}/{layer}" for layer in LAYERS}}
+        for name in ("Ordering", "Catalog")
+    ]
+}
+
+BLOCKS = [
+    BuildingBlock(BuildingBlockType.AGGREGATE_ROOT, "Order", "/src/Ordering/Domain/Order.cs", project="Ordering"),
+    BuildingBlock(BuildingBlockType.AGGREGATE_ROOT, "Product", "/src/Catalog/Domain/Product.cs", project="Catalog"),
+]
+
+
+def test_context_of_the_targeted_block_is_selected():
+    intents = [{"building_block_type": BuildingBlockType.AGGREGATE_ROOT.value, "target": "Product"}]
+
+    assert _changed_context(intents, METADATA, BLOCKS)["name"] == "Catalog"
+
+
+def test_no_context_is_selected_when_intents_span_contexts():
+    intents = [
+        {"building_block_type": BuildingBlockType.AGGREGATE_ROOT.value, "target": "Order"},
+        {"building_block_type": BuildingBlockType.AGGREGATE_ROOT.value, "target": "Product"},
+    ]
+
+    assert _changed_context(intents, METADATA, BLOCKS) is None
+
+
+def test_narrowed_metadata_is_kept_apart_from_project_metadata(monkeypatch):
+    from codius.di import container
+
+    watcher = type("Watcher", (), {"get_building_blocks": lambda self, _: BLOCKS})()
+    monkeypatch.setattr(container, "resolve", lambda _: watcher)
+    intents = [{"building_block_type": BuildingBlockType.AGGREGATE_ROOT.value, "target": "Product"}]
+
+    state = extract_building_blocks({"intent": intents, "project_metadata": METADATA})
+
+    assert state["project_metadata"] is METADATA
+    assert state["context_metadata"]["domain_path"] == "/src/Catalog/Domain"
+    assert [bb["name"] for bb in state["building_blocks"]] == ["Product"]
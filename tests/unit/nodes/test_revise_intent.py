@@ -0,0 +1,27 @@
+import json
+
+from codius.graph.nodes.revise_intent import revise_intent
+
+
+class _Llm:
+    def call_prompt(self, prompt):
+        return '[{"intent": "add_method", "building_block_type": "AggregateRoot", "target": "Order"}]'
+
+    def try_extract_json(self, response):
+        return json.loads(response)
+
+
+def test_revised_intents_are_no_longer_narrowed_to_the_previous_context(monkeypatch):
+    from codius.di import container
+
+    monkeypatch.setattr(container, "resolve", lambda _: _Llm())
+    state = {
+        "intent": [{"intent": "add_method", "building_block_type": "AggregateRoot", "target": "Product"}],
+        "project_metadata": {"domain_path": "/src/Domain"},
+        "context_metadata": {"context": "Catalog", "domain_path": "/src/Catalog/Domain"},
+    }
+
+    state = revise_intent(state)
+
+    assert state["intent"][0]["target"] == "Order"
+    assert state["context_metadata"] is None